@@ -3,6 +3,7 @@ package handlers
 import (
     "encoding/json"
     "net/http"
+    "strconv"
 
     "kube-manager/src"
 )
@@ -21,12 +22,32 @@ func ListHandler(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
-	resources, err := k8s.ListResources(resource, namespace)
+	opts := k8s.ListOptions{
+		Continue: r.URL.Query().Get("continue"),
+		Prefix:   r.URL.Query().Get("prefix"),
+	}
+	if limit := r.URL.Query().Get("limit"); limit != "" {
+		parsed, err := strconv.ParseInt(limit, 10, 64)
+		if err != nil || parsed < 0 {
+			http.Error(w, "Invalid 'limit' parameter", http.StatusBadRequest)
+			return
+		}
+		opts.Limit = parsed
+	}
+
+	page, err := k8s.ListResourcesPage(resource, namespace, opts)
 	if err != nil {
 		http.Error(w, err.Error(), http.StatusInternalServerError)
 		return
 	}
 
+	// The body stays a plain array; paging state travels in headers.
+	if page.Continue != "" {
+		w.Header().Set("X-Continue", page.Continue)
+	}
+	if page.Remaining != nil {
+		w.Header().Set("X-Remaining-Item-Count", strconv.FormatInt(*page.Remaining, 10))
+	}
 	w.Header().Set("Content-Type", "application/json")
-	json.NewEncoder(w).Encode(resources)
+	json.NewEncoder(w).Encode(page.Items)
 }
@@ -4,6 +4,7 @@ import (
     "context"
     "errors"
     "fmt"
+    "strings"
 
     metav1 "k8s.io/apimachinery/pkg/apis/meta/v1"
     "k8s.io/apimachinery/pkg/runtime/schema"
@@ -16,20 +17,42 @@ type NamedResource struct {
 	Namespace string `json:"namespace"`
 }
 
+// ListOptions narrows a listing to one page of names.
+type ListOptions struct {
+    Limit    int64  // Maximum names per page; 0 lists everything
+    Continue string // Token returned with the previous page
+    Prefix   string // Only names starting with this prefix
+}
+
+// ListPage is one page of a listing.
+type ListPage struct {
+    Items     []NamedResource
+    Continue  string // Empty on the last page
+    Remaining *int64 // Names left after this page, when the API server knows
+}
+
 func ListResources(kind string, namespace string) ([]NamedResource, error) {
+    page, err := ListResourcesPage(kind, namespace, ListOptions{})
+    if err != nil {
+        return nil, err
+    }
+    return page.Items, nil
+}
+
+func ListResourcesPage(kind string, namespace string, opts ListOptions) (ListPage, error) {
     config, err := rest.InClusterConfig()
     if err != nil {
-        return nil, fmt.Errorf("error loading cluster configuration: %w", err)
+        return ListPage{}, fmt.Errorf("error loading cluster configuration: %w", err)
     }
 
     client, err := dynamic.NewForConfig(config)
     if err != nil {
-        return nil, fmt.Errorf("error creating dynamic client: %w", err)
+        return ListPage{}, fmt.Errorf("error creating dynamic client: %w", err)
     }
 
     gvr, err := resolveGVRStatic(kind)
     if err != nil {
-        return nil, fmt.Errorf("error resolving static GVR: %w", err)
+        return ListPage{}, fmt.Errorf("error resolving static GVR: %w", err)
     }
 
     var ri dynamic.ResourceInterface
@@ -39,25 +62,42 @@ func ListResources(kind string, namespace string) ([]NamedResource, error) {
         ri = client.Resource(gvr).Namespace(namespace)
     }
 
-    list, err := ri.List(context.Background(), metav1.ListOptions{})
-    if err != nil {
-        return nil, fmt.Errorf("error listing resources: %w", err)
-    }
+    listOptions := metav1.ListOptions{Limit: opts.Limit, Continue: opts.Continue}
+    var page ListPage
+    for {
+        list, err := ri.List(context.Background(), listOptions)
+        if err != nil {
+            return ListPage{}, fmt.Errorf("error listing resources: %w", err)
+        }
 
+        for _, item := range list.Items {
+            if opts.Prefix != "" && !strings.HasPrefix(item.GetName(), opts.Prefix) {
+                continue
+            }
+            ns := item.GetNamespace()
+            if ns == "" {
+                ns = "default"
+            }
+            page.Items = append(page.Items, NamedResource{
+                Name:      item.GetName(),
+                Namespace: ns,
+            })
+        }
+        page.Continue = list.GetContinue()
+        if opts.Prefix == "" {
+            page.Remaining = list.GetRemainingItemCount()
+        }
 
-    var result []NamedResource
-    for _, item := range list.Items {
-        ns := item.GetNamespace()
-        if ns == "" {
-            ns = "default"
+        // The API server cannot filter names by prefix, so keep reading
+        // chunks until the page is full or the collection ends.
+        if opts.Prefix == "" || opts.Limit == 0 || page.Continue == "" ||
+            int64(len(page.Items)) >= opts.Limit {
+            break
         }
-        result = append(result, NamedResource{
-            Name:      item.GetName(),
-            Namespace: ns,
-        })
+        listOptions.Continue = page.Continue
     }
 
-    return result, nil
+    return page, nil
 }
 
 func resolveGVRStatic(kind string) (schema.GroupVersionResource, error) {
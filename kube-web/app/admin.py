@@ -1,3 +1,78 @@
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-# Register your models here.
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Lists the request profiles and serves each one as a .prof file."""
+
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "user",
+        "download_link",
+    )
+    list_filter = ("method", "view_name")
+    search_fields = ("path", "view_name")
+    date_hierarchy = "created_at"
+    list_select_related = ("user",)
+    fields = (
+        "created_at",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "user",
+        "download_link",
+        "summary_report",
+    )
+    readonly_fields = fields
+
+    def get_queryset(self, request):
+        # The stats blob is only read by the download view
+        return super().get_queryset(request).defer("data", "summary")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        download = path(
+            "<int:pk>/download/",
+            self.admin_site.admin_view(self.download_view),
+            name="app_requestprofile_download",
+        )
+        return [download, *super().get_urls()]
+
+    @admin.display(description="Profile")
+    def download_link(self, obj):
+        url = reverse("admin:app_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">⬇️ {}.prof</a>', url, obj.pk)
+
+    @admin.display(description="Top functions by cumulative time")
+    def summary_report(self, obj):
+        return format_html("<pre>{}</pre>", obj.summary)
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        return HttpResponse(
+            profile.stats_file,
+            content_type="application/octet-stream",
+            headers={
+                "Content-Disposition": f'attachment; filename="profile-{pk}.prof"'
+            },
+        )
@@ -7,4 +7,7 @@ class AppConfig(AppConfig):
 
 
     def ready(self):
-        import app.signals
\ No newline at end of file
+        import app.signals
+        from app import tracing
+
+        tracing.configure()
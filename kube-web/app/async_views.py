@@ -0,0 +1,89 @@
+"""Async versions of the views that spend most of their time waiting on a
+backend. They are routed instead of their sync counterparts in ``views``
+when ``settings.ASYNC_VIEWS`` is enabled and kube-web runs under ASGI.
+
+Apply and explain requests do not need one: they are handed to the
+background job workers (see ``jobs``) and return immediately. Streamed
+explanations do, so the relay does not pin a worker thread per reader."""
+
+import time
+
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest
+from django.shortcuts import redirect
+from django.views.decorators.csrf import csrf_exempt
+
+from . import deletions, listing_cache, overview, streaming
+from .views import (
+    explore_url,
+    listing_options,
+    render_listing,
+    render_delete_results,
+    render_listing_error,
+    render_overview,
+)
+
+
+@login_required
+async def explore_resources(request):
+    resource = request.GET.get("resource")
+    if not resource:
+        return HttpResponseBadRequest("Missing 'resource' parameter.")
+
+    filter_form, options = listing_options(request)
+    try:
+        listing = await listing_cache.aget_listing(resource, **options)
+    except Exception as e:
+        return render_listing_error(request, resource, filter_form, e)
+
+    return render_listing(
+        request, resource, filter_form, listing, await request.auser()
+    )
+
+
+@login_required
+async def cluster_overview(request):
+    namespace = request.GET.get("namespace", "")
+    started = time.monotonic()
+    summaries = await overview.acollect(namespace)
+    return render_overview(request, namespace, summaries, started)
+
+
+@login_required
+async def explain_stream_view(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Only POST is allowed")
+    return streaming.stream_response(
+        streaming.aexplanation_events(streaming.explain_payload(request), request.user)
+    )
+
+
+@csrf_exempt
+@login_required
+async def delete_resource(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Only POST is allowed")
+
+    resource = request.POST.get("resource")
+    name = request.POST.get("name")
+    namespace = request.POST.get("namespace", "default")
+
+    item = await deletions.adelete_one(resource, namespace, name)
+    await listing_cache.ainvalidate(resource)
+    if not item.ok:
+        return render_delete_results(request, resource, [item])
+
+    return redirect(explore_url(request, resource))
+
+
+@login_required
+async def bulk_delete_resources(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Only POST is allowed")
+
+    resource = request.POST.get("resource")
+    targets = deletions.parse_targets(request.POST.getlist("targets"))
+    if not resource or not targets:
+        return redirect(explore_url(request, resource or ""))
+    outcomes = await deletions.adelete_many(resource, targets)
+    return render_delete_results(request, resource, outcomes)
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import tracing
+from .metrics import BackendCall
+
+GENERATOR_ENGINE = "generator-engine"
+KUBE_MANAGER = "kube-manager"
+YAML_EXPLAINER = "yaml-explainer"
+
+# Methods that are safe to send again when the backend drops the connection
+# or answers with a transient gateway error.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+
+_local = threading.local()
+# One async client per event loop: an httpx pool cannot be shared across loops.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _build_session(retry=True):
+    """Creates a keep-alive session with a bounded connection pool."""
+    max_retries = 0
+    if retry:
+        max_retries = Retry(
+            total=settings.BACKEND_RETRIES,
+            backoff_factor=settings.BACKEND_RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+    adapter = HTTPAdapter(
+        pool_connections=settings.BACKEND_POOL_CONNECTIONS,
+        pool_maxsize=settings.BACKEND_POOL_MAXSIZE,
+        max_retries=max_retries,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(retry=True):
+    """Returns the pooled session owned by the current worker thread.
+
+    ``retry=False`` returns a second session that never retries, for calls
+    whose timeout is a hard per-call budget.
+    """
+    attr = "session" if retry else "session_no_retry"
+    session = getattr(_local, attr, None)
+    if session is None:
+        session = _build_session(retry)
+        setattr(_local, attr, session)
+    return session
+
+
+def close_session():
+    """Closes the current thread's sessions and releases their connections."""
+    for attr in ("session", "session_no_retry"):
+        session = getattr(_local, attr, None)
+        if session is not None:
+            session.close()
+            setattr(_local, attr, None)
+
+
+def backend_url(service, path):
+    """Builds the absolute URL of ``path`` on the given backend service."""
+    return settings.BACKEND_URLS[service].rstrip("/") + path
+
+
+def request(method, service, path, timeout=None, retry=True, **kwargs):
+    """Sends a request to a backend service through the pooled session."""
+    if timeout is None:
+        timeout = settings.BACKEND_TIMEOUT
+    with BackendCall(service, path) as call, tracing.backend_span(
+        method, service, path, kwargs
+    ) as span:
+        response = get_session(retry).request(
+            method, backend_url(service, path), timeout=timeout, **kwargs
+        )
+        call.status = response.status_code
+        tracing.set_http_status(span, response.status_code)
+    return response
+
+
+def get(service, path, **kwargs):
+    return request("GET", service, path, **kwargs)
+
+
+def post(service, path, **kwargs):
+    return request("POST", service, path, **kwargs)
+
+
+def delete(service, path, **kwargs):
+    return request("DELETE", service, path, **kwargs)
+
+
+def _build_async_client():
+    """Creates a keep-alive async client with a bounded connection pool."""
+    timeout = settings.BACKEND_TIMEOUT
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+        limits=httpx.Limits(
+            max_connections=settings.BACKEND_POOL_MAXSIZE
+            * settings.BACKEND_POOL_CONNECTIONS,
+            max_keepalive_connections=settings.BACKEND_POOL_MAXSIZE,
+        ),
+        # httpx only retries failed connection attempts, which is safe for
+        # every method since the request never reached the backend.
+        transport=httpx.AsyncHTTPTransport(retries=settings.BACKEND_RETRIES),
+    )
+
+
+def get_async_client():
+    """Returns the pooled async client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _build_async_client()
+        _async_clients[loop] = client
+    return client
+
+
+def _async_timeout(timeout):
+    """Converts a requests-style (connect, read) timeout for httpx."""
+    if timeout is None:
+        timeout = settings.BACKEND_TIMEOUT
+    if isinstance(timeout, tuple):
+        timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+    return timeout
+
+
+async def arequest(method, service, path, timeout=None, **kwargs):
+    """Async counterpart of request(), built on httpx."""
+    with BackendCall(service, path) as call, tracing.backend_span(
+        method, service, path, kwargs
+    ) as span:
+        response = await get_async_client().request(
+            method, backend_url(service, path), timeout=_async_timeout(timeout), **kwargs
+        )
+        call.status = response.status_code
+        tracing.set_http_status(span, response.status_code)
+    return response
+
+
+@asynccontextmanager
+async def astream(method, service, path, timeout=None, **kwargs):
+    """Streams a backend response; use as ``async with backends.astream(...)``.
+
+    Like ``request(..., stream=True)``, the call is timed and traced until
+    the response headers arrive.
+    """
+    async with AsyncExitStack() as stack:
+        with BackendCall(service, path) as call, tracing.backend_span(
+            method, service, path, kwargs
+        ) as span:
+            response = await stack.enter_async_context(
+                get_async_client().stream(
+                    method,
+                    backend_url(service, path),
+                    timeout=_async_timeout(timeout),
+                    **kwargs,
+                )
+            )
+            call.status = response.status_code
+            tracing.set_http_status(span, response.status_code)
+        yield response
+
+
+async def aget(service, path, **kwargs):
+    return await arequest("GET", service, path, **kwargs)
+
+
+async def apost(service, path, **kwargs):
+    return await arequest("POST", service, path, **kwargs)
+
+
+async def adelete(service, path, **kwargs):
+    return await arequest("DELETE", service, path, **kwargs)
@@ -0,0 +1,109 @@
+"""SQL query count and database time of each request.
+
+``middleware.QueryMetricsMiddleware`` opens a ``RequestQueries`` per request
+and every database connection gets ``record`` as an execute wrapper (see
+``signals``), so the queries of the request are added up wherever they run,
+including the sync code an async view hands to a worker thread.
+
+The totals are exported as metrics, and requests over their budget are
+logged with their most repeated statement, which is usually an N+1 lookup.
+Budgets come from ``QUERY_BUDGETS`` (per URL name), ``QUERY_BUDGET`` and
+``QUERY_TIME_BUDGET_MS``; ``testing.QueryBudgetMixin`` checks the same
+budgets in tests.
+"""
+
+import contextvars
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from . import metrics
+
+_current = contextvars.ContextVar("request_queries", default=None)
+
+
+class RequestQueries:
+    """Statements run while serving one request, with their durations."""
+
+    def __init__(self):
+        self.statements = []
+        self.duration = 0.0
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def add(self, sql, duration):
+        self.statements.append((sql, duration))
+        self.duration += duration
+
+    def most_repeated(self):
+        """Returns (statement, times) of the statement run most often."""
+        if not self.statements:
+            return None, 0
+        return Counter(sql for sql, _ in self.statements).most_common(1)[0]
+
+
+def record(execute, sql, params, many, context):
+    """Execute wrapper adding the statement to the current request, if any."""
+    queries = _current.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries.add(sql, time.perf_counter() - started)
+
+
+def install(connection):
+    if record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record)
+
+
+@contextmanager
+def track():
+    """Records the queries run inside the block into a new RequestQueries."""
+    queries = RequestQueries()
+    token = _current.set(queries)
+    try:
+        yield queries
+    finally:
+        _current.reset(token)
+
+
+def budget(view):
+    """Maximum number of queries for requests to the URL name ``view``."""
+    return settings.QUERY_BUDGETS.get(view, settings.QUERY_BUDGET)
+
+
+def exceeded(view, queries):
+    """Names of the budgets ("queries", "time") that ``queries`` went over."""
+    over = []
+    if queries.count > budget(view):
+        over.append("queries")
+    if queries.duration * 1000 > settings.QUERY_TIME_BUDGET_MS:
+        over.append("time")
+    return over
+
+
+def report(request, queries):
+    """Exports the totals of a request and logs it when it is over budget."""
+    view = metrics.view_label(request)
+    metrics.DB_QUERIES.labels(view).observe(queries.count)
+    metrics.DB_DURATION.labels(view).observe(queries.duration)
+
+    over = exceeded(view, queries)
+    if not over:
+        return
+    for name in over:
+        metrics.QUERY_BUDGET_EXCEEDED.labels(view, name).inc()
+    sql, times = queries.most_repeated()
+    print(
+        f"⚠️ {request.method} {request.path} ({view}) is over its query budget: "
+        f"{queries.count}/{budget(view)} queries, "
+        f"{queries.duration * 1000:.1f}/{settings.QUERY_TIME_BUDGET_MS:g} ms. "
+        f"Most repeated ({times}x): {sql}"
+    )
@@ -0,0 +1,143 @@
+"""Bulk deletion of resources through kube-manager ``/resource``.
+
+Deletes run concurrently on a pool of ``settings.BULK_DELETE_WORKERS``
+threads shared by every request, each bounded by its own timeout, and the
+listing cache of the kind is dropped once when they are all done. Failed
+deletes are logged and returned to the caller as outcomes.
+"""
+
+import asyncio
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import requests
+from django.conf import settings
+
+from . import backends, listing_cache, tracing
+
+logger = logging.getLogger(__name__)
+
+DeleteOutcome = namedtuple("DeleteOutcome", ["name", "namespace", "ok", "detail"])
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.BULK_DELETE_WORKERS, thread_name_prefix="bulk-delete"
+)
+
+
+def parse_targets(values):
+    """Turns "namespace/name" checkbox values into unique (namespace, name) pairs."""
+    targets = []
+    for value in values:
+        namespace, separator, name = value.partition("/")
+        # Object names cannot contain a slash; anything else is malformed
+        if separator and name and "/" not in name:
+            targets.append((namespace or "default", name))
+    return list(dict.fromkeys(targets))
+
+
+def delete_timeout():
+    return (settings.BACKEND_TIMEOUT[0], settings.BULK_DELETE_TIMEOUT)
+
+
+def delete_params(resource, namespace, name):
+    return {"type": resource, "name": name, "namespace": namespace}
+
+
+def outcome(namespace, name, status_code, text):
+    if status_code == 200:
+        return DeleteOutcome(name, namespace, True, "✅ Deleted.")
+    return DeleteOutcome(name, namespace, False, f"❌ {text.strip() or status_code}")
+
+
+def timed_out(namespace, name):
+    return DeleteOutcome(
+        name,
+        namespace,
+        False,
+        f"⏱️ Timed out after {settings.BULK_DELETE_TIMEOUT:g}s.",
+    )
+
+
+def unreachable(namespace, name, error):
+    return DeleteOutcome(
+        name, namespace, False, f"❌ Failed to connect to backend: {error}"
+    )
+
+
+def report(resource, item):
+    """Logs ``item`` if the delete failed, and returns it."""
+    if not item.ok:
+        logger.warning(
+            "Deleting %s %s/%s failed: %s",
+            resource,
+            item.namespace,
+            item.name,
+            item.detail,
+        )
+    return item
+
+
+def delete_one(resource, namespace, name):
+    """Deletes one resource; returns its DeleteOutcome."""
+    try:
+        response = backends.delete(
+            backends.KUBE_MANAGER,
+            "/resource",
+            params=delete_params(resource, namespace, name),
+            timeout=delete_timeout(),
+            # Retrying would stretch the per-item timeout.
+            retry=False,
+        )
+    except requests.Timeout:
+        item = timed_out(namespace, name)
+    except Exception as e:
+        item = unreachable(namespace, name, e)
+    else:
+        item = outcome(namespace, name, response.status_code, response.text)
+    return report(resource, item)
+
+
+async def adelete_one(resource, namespace, name):
+    """Async counterpart of delete_one(), built on httpx."""
+    try:
+        response = await backends.adelete(
+            backends.KUBE_MANAGER,
+            "/resource",
+            params=delete_params(resource, namespace, name),
+            timeout=delete_timeout(),
+        )
+    except httpx.TimeoutException:
+        item = timed_out(namespace, name)
+    except Exception as e:
+        item = unreachable(namespace, name, e)
+    else:
+        item = outcome(namespace, name, response.status_code, response.text)
+    return report(resource, item)
+
+
+def delete_many(resource, targets):
+    """Deletes every (namespace, name) target; returns outcomes in order."""
+    futures = [
+        executor.submit(tracing.bind(delete_one), resource, namespace, name)
+        for namespace, name in targets
+    ]
+    outcomes = [future.result() for future in futures]
+    listing_cache.invalidate(resource)
+    return outcomes
+
+
+async def adelete_many(resource, targets):
+    """Async counterpart of delete_many(), bounded by a semaphore."""
+    semaphore = asyncio.Semaphore(settings.BULK_DELETE_WORKERS)
+
+    async def delete(namespace, name):
+        async with semaphore:
+            return await adelete_one(resource, namespace, name)
+
+    outcomes = await asyncio.gather(
+        *(delete(namespace, name) for namespace, name in targets)
+    )
+    await listing_cache.ainvalidate(resource)
+    return outcomes
@@ -0,0 +1,167 @@
+"""Explanations of kube-manager errors, shared by every error with the same
+signature.
+
+Errors that only differ in resource names, UIDs or timestamps (the same
+missing namespace, the same immutable field...) get one yaml-explainer
+``/explain-error`` call per model. The answer is kept in the explanation
+store. Concurrent requests for the same signature, in any process, wait for
+a single upstream call instead of sending their own: the first one claims
+the signature with an ``ExplanationClaim`` row, the others poll the store
+until its answer shows up or the claim is released.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import backends, explanation_cache, metrics
+from .models import ExplanationClaim
+
+# Words that Kubernetes puts before the quoted name of an object: a kind
+# ("Deployment.apps"), a plural resource ("deployments.apps") or "namespace".
+# Other quoted tokens (field paths, values, reasons) are part of the error.
+_OBJECT = r"\b((?:namespace|[A-Z][A-Za-z0-9]*|[a-z][a-z0-9]{2,}s)(?:\.[a-z0-9-]+)*)"
+
+_NORMALIZERS = [
+    # Quotes escaped by an upstream JSON encoder
+    (re.compile(r'\\"'), '"'),
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I
+        ),
+        "<uid>",
+    ),
+    (
+        re.compile(
+            r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+        ),
+        "<time>",
+    ),
+    (re.compile(_OBJECT + r' "[^"\n]*"'), r'\1 "<name>"'),
+    (re.compile(_OBJECT + r" '[^'\n]*'"), r"\1 '<name>'"),
+    (re.compile(r"\s+"), " "),
+]
+
+# Seconds between two checks of a caller waiting for another one's answer
+POLL_INTERVAL = 0.25
+
+_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    metrics.CACHE_LOOKUPS.labels("error_explanation", name).inc()
+
+
+def stats():
+    """Returns the error explanation counters and hit ratio of this process."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
+
+
+def signature(error_text):
+    """Reduces an error to the part that does not depend on the object."""
+    for pattern, replacement in _NORMALIZERS:
+        error_text = pattern.sub(replacement, error_text)
+    return error_text.strip()
+
+
+def signature_digest(error_text):
+    raw = "error-signature\n" + signature(error_text)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def claim_timeout():
+    """Seconds an /explain-error call can take, with all of its retries."""
+    connect, read = settings.BACKEND_TIMEOUT
+    retries = settings.BACKEND_RETRIES
+    return (connect + read) * (retries + 1) + settings.BACKEND_RETRY_BACKOFF * 2**retries
+
+
+def _claim(digest, model):
+    """True if this caller now fetches the explanation of the signature."""
+    expired = timezone.now() - timedelta(seconds=claim_timeout())
+    # A claim this old belongs to a caller that died before releasing it
+    ExplanationClaim.objects.filter(
+        digest=digest, model=model, claimed_at__lt=expired
+    ).delete()
+    try:
+        with transaction.atomic():
+            ExplanationClaim.objects.create(digest=digest, model=model)
+    except IntegrityError:
+        return False
+    return True
+
+
+def _release(digest, model):
+    ExplanationClaim.objects.filter(digest=digest, model=model).delete()
+
+
+def _wait(digest, model):
+    """Waits for the answer of the caller that claimed the signature."""
+    deadline = time.monotonic() + claim_timeout()
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        explanation = explanation_cache.lookup_digest(digest, model)
+        if explanation is not None:
+            return explanation
+        if not ExplanationClaim.objects.filter(digest=digest, model=model).exists():
+            # Released without an answer: the explainer failed for it too
+            return explanation_cache.lookup_digest(digest, model)
+    return None
+
+
+def _coalesced(digest, model, fetch):
+    """Runs ``fetch`` once for every concurrent caller sharing the signature."""
+    if not _claim(digest, model):
+        _count("coalesced")
+        return _wait(digest, model)
+    try:
+        return fetch()
+    finally:
+        _release(digest, model)
+
+
+def _fetch(error_text, model, digest):
+    # Another caller may have stored it between the lookup and the claim.
+    explanation = explanation_cache.lookup_digest(digest, model)
+    if explanation is not None:
+        return explanation
+
+    response = backends.post(
+        backends.YAML_EXPLAINER,
+        "/explain-error",
+        json={
+            "error": error_text,
+            "model": model,
+        },
+    )
+    if response.status_code != 200:
+        return None
+    explanation = response.json().get("explanation", None)
+    explanation_cache.store_digest(digest, model, explanation)
+    return explanation
+
+
+def explain(error_text, model):
+    """Returns the explanation of ``error_text``, or None if none is available."""
+    model = model or ""
+    digest = signature_digest(error_text)
+    explanation = explanation_cache.lookup_digest(digest, model)
+    if explanation is not None:
+        _count("hits")
+        return explanation
+
+    _count("misses")
+    return _coalesced(digest, model, lambda: _fetch(error_text, model, digest))
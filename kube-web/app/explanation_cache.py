@@ -0,0 +1,117 @@
+import hashlib
+import json
+import threading
+from datetime import timedelta
+
+import yaml
+from django.conf import settings
+from django.utils import timezone
+
+from . import metrics
+from .models import Explanation
+
+# Reads only refresh ``last_used_at`` once it is older than this, so a popular
+# explanation does not cost a write on every page view.
+TOUCH_INTERVAL = timedelta(minutes=1)
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    metrics.CACHE_LOOKUPS.labels("explanation", name).inc()
+
+
+def stats():
+    """Returns the explanation cache counters and hit ratio of this process."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
+
+
+def canonical_digest(yaml_text):
+    """Hashes the parsed documents of a manifest.
+
+    Comments, indentation and key order do not change the digest, so a
+    manifest reopened from the history matches the one generated earlier.
+    """
+    try:
+        documents = [doc for doc in yaml.safe_load_all(yaml_text) if doc is not None]
+        canonical = json.dumps(
+            documents,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+    except yaml.YAMLError:
+        canonical = yaml_text.strip()
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _expiry():
+    return timezone.now() - timedelta(seconds=settings.EXPLANATION_CACHE_TTL)
+
+
+def lookup(yaml_text, model):
+    """Returns the stored explanation of ``yaml_text`` by ``model``, or None."""
+    if not yaml_text or not model:
+        return None
+    text = lookup_digest(canonical_digest(yaml_text), model)
+    _count("misses" if text is None else "hits")
+    return text
+
+
+def store(yaml_text, model, text):
+    """Saves a successful explanation and evicts old entries."""
+    if not yaml_text or not model:
+        return
+    store_digest(canonical_digest(yaml_text), model, text)
+
+
+def lookup_digest(digest, model):
+    """Returns the unexpired explanation stored under ``digest``, or None."""
+    entry = (
+        Explanation.objects.filter(
+            digest=digest, model=model, last_used_at__gte=_expiry()
+        )
+        .only("text", "last_used_at")
+        .first()
+    )
+    if entry is None:
+        return None
+    now = timezone.now()
+    if entry.last_used_at < now - TOUCH_INTERVAL:
+        Explanation.objects.filter(pk=entry.pk).update(last_used_at=now)
+    return entry.text
+
+
+def store_digest(digest, model, text):
+    if not text:
+        return
+    try:
+        Explanation.objects.update_or_create(
+            digest=digest,
+            model=model,
+            defaults={"text": text, "last_used_at": timezone.now()},
+        )
+        evict()
+    except Exception as e:
+        print(f"⚠️ Failed to store explanation: {e}")
+
+
+def evict():
+    """Drops expired entries, then the least recently used beyond the size cap."""
+    Explanation.objects.filter(last_used_at__lt=_expiry()).delete()
+    cap = settings.EXPLANATION_CACHE_MAX_ENTRIES
+    cutoff = list(
+        Explanation.objects.order_by("-last_used_at").values_list(
+            "last_used_at", flat=True
+        )[cap : cap + 1]
+    )
+    if cutoff:
+        Explanation.objects.filter(last_used_at__lte=cutoff[0]).delete()
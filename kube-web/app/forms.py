@@ -1,7 +1,9 @@
 # pylint: disable
 # flake8: noqa
 
-from app import utils
+from functools import lru_cache
+
+from app import tracing, utils
 from django import forms
 from django.forms import BaseFormSet, ValidationError, formset_factory
 from .widgets import (
@@ -12,9 +14,42 @@ from .widgets import (
     HelpButtonTextInput,
     HelpButtonTextarea,
 )
-from django.utils.safestring import mark_safe
+from django.utils.functional import lazy
+from django.utils.safestring import SafeString, mark_safe
 from django.utils.translation import gettext_lazy as _
 
+
+@lru_cache(maxsize=None)
+def _required_label(text):
+    return mark_safe(f"{text} <span style='color: black;'>* </span>")
+
+
+# Label of a required field followed by a "*" marker, built once per
+# translation and resolved when the label is rendered.
+required_label = lazy(lambda label: _required_label(str(label)), SafeString)
+
+
+class RequiredLabelForm(forms.Form):
+    """Form whose required fields show a "*" after their label.
+
+    Labels are decorated once, when the subclass is defined, so building a
+    form per request does not rewrite them. Validation is traced as a
+    ``validate <form class>`` span.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Runs before the metaclass merges inherited fields, so only the
+        # fields declared on ``cls`` itself are decorated.
+        for field in cls.declared_fields.values():
+            if field.required and field.label is not None:
+                field.label = required_label(field.label)
+
+    def full_clean(self):
+        with tracing.span(f"validate {type(self).__name__}"):
+            super().full_clean()
+
+
 # --- Auxiliary form for service ports ---
 
 
@@ -93,7 +128,7 @@ class ObjectTypeForm(forms.Form):
     )
 
 
-class DeploymentForm(forms.Form):
+class DeploymentForm(RequiredLabelForm):
     name = forms.CharField(
         label=_("Deployment Name"),
         max_length=100,
@@ -168,16 +203,8 @@ class DeploymentForm(forms.Form):
         initial="1",
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class PodTemplateForm(forms.Form):
+class PodTemplateForm(RequiredLabelForm):
     pod_name = forms.CharField(
         label=_("Pod Name"),
         max_length=100,
@@ -203,16 +230,8 @@ class PodTemplateForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
-
-class ContainerForm(forms.Form):
+class ContainerForm(RequiredLabelForm):
     init_container = forms.BooleanField(
         label=_("Is Init Container?"),
         required=False,
@@ -302,16 +321,8 @@ class ContainerForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class VolumeMountForm(forms.Form):
+class VolumeMountForm(RequiredLabelForm):
     volume_name = forms.CharField(
         label=_("Volume Name"),
         max_length=100,
@@ -332,16 +343,11 @@ class VolumeMountForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+VolumeMountFormSet = formset_factory(VolumeMountForm, extra=1)
 
 
-class VolumeForm(forms.Form):
+class VolumeForm(RequiredLabelForm):
     volume_name = forms.CharField(
         label=_("Volume Name"),
         max_length=100,
@@ -482,16 +488,11 @@ class VolumeForm(forms.Form):
                 "pvc_claim_name", _("This field is required for PersistentVolumeClaim.")
             )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+VolumeFormSet = formset_factory(VolumeForm, extra=1)
 
 
-class NamespaceForm(forms.Form):
+class NamespaceForm(RequiredLabelForm):
     namespace_name = forms.CharField(
         label=_("Namespace Name"),
         max_length=100,
@@ -522,16 +523,8 @@ class NamespaceForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class ServiceForm(forms.Form):
+class ServiceForm(RequiredLabelForm):
     service_name = forms.CharField(
         label=_("Service Name"),
         max_length=100,
@@ -585,16 +578,8 @@ class ServiceForm(forms.Form):
         cleaned_data = super().clean()
         return cleaned_data
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
-
-class HPAForm(forms.Form):
+class HPAForm(RequiredLabelForm):
     hpa_name = forms.CharField(
         label=_("HPA Name"),
         max_length=100,
@@ -656,16 +641,8 @@ class HPAForm(forms.Form):
                     _("Minimum Replicas cannot be greater than Maximum Replicas.")
                 )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class HPAMetricForm(forms.Form):
+class HPAMetricForm(RequiredLabelForm):
     resource_name = forms.ChoiceField(
         label=_("Resource Name"),
         choices=[
@@ -703,16 +680,11 @@ class HPAMetricForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for _, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+HPAMetricFormSet = formset_factory(HPAMetricForm, extra=1)
 
 
-class ConfigMapForm(forms.Form):
+class ConfigMapForm(RequiredLabelForm):
     configmap_name = forms.CharField(
         label=_("ConfigMap Name"),
         max_length=100,
@@ -736,16 +708,8 @@ class ConfigMapForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class ConfigMapKeyForm(forms.Form):
+class ConfigMapKeyForm(RequiredLabelForm):
     key_name = forms.CharField(
         label=_("Key"),
         max_length=200,
@@ -779,16 +743,11 @@ class ConfigMapKeyForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+ConfigMapKeyFormSet = formset_factory(ConfigMapKeyForm, extra=1)
 
 
-class SecretForm(forms.Form):
+class SecretForm(RequiredLabelForm):
     secret_name = forms.CharField(
         label=_("Secret Name"),
         max_length=100,
@@ -830,16 +789,8 @@ class SecretForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
-
-class OpaqueKeyForm(forms.Form):
+class OpaqueKeyForm(RequiredLabelForm):
     key_name = forms.CharField(
         label=_("Key"),
         max_length=200,
@@ -857,16 +808,11 @@ class OpaqueKeyForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
+OpaqueKeyFormSet = formset_factory(OpaqueKeyForm, extra=1)
 
-class TLSSecretForm(forms.Form):
+
+class TLSSecretForm(RequiredLabelForm):
     tls_crt = forms.CharField(
         label=_("TLS Certificate (tls.crt)"),
         widget=HelpButtonTextarea(
@@ -885,16 +831,8 @@ class TLSSecretForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class DockerConfigJSONForm(forms.Form):
+class DockerConfigJSONForm(RequiredLabelForm):
     dockerconfigjson = forms.CharField(
         label=_("Docker Config JSON (.dockerconfigjson)"),
         widget=HelpButtonTextarea(
@@ -905,16 +843,8 @@ class DockerConfigJSONForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class PersistentVolumeClaimForm(forms.Form):
+class PersistentVolumeClaimForm(RequiredLabelForm):
     pvc_name = forms.CharField(
         label=_("PVC Name"),
         max_length=100,
@@ -984,16 +914,8 @@ class PersistentVolumeClaimForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class IngressForm(forms.Form):
+class IngressForm(RequiredLabelForm):
     ingress_name = forms.CharField(
         label=_("Ingress Name"),
         max_length=100,
@@ -1030,16 +952,8 @@ class IngressForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
-
-class IngressPathForm(forms.Form):
+class IngressPathForm(RequiredLabelForm):
     path = forms.CharField(
         label=_("Path"),
         max_length=200,
@@ -1068,16 +982,11 @@ class IngressPathForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
+IngressPathFormSet = formset_factory(IngressPathForm, extra=1)
 
-class ServiceAccountForm(forms.Form):
+
+class ServiceAccountForm(RequiredLabelForm):
     service_account_name = forms.CharField(
         label=_("ServiceAccount Name"),
         max_length=100,
@@ -1101,16 +1010,8 @@ class ServiceAccountForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class ImagePullSecretForm(forms.Form):
+class ImagePullSecretForm(RequiredLabelForm):
     secret_name = forms.CharField(
         label=_("Image Pull Secret Name"),
         max_length=100,
@@ -1122,16 +1023,11 @@ class ImagePullSecretForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+ImagePullSecretFormSet = formset_factory(ImagePullSecretForm, extra=1)
 
 
-class RoleForm(forms.Form):
+class RoleForm(RequiredLabelForm):
     role_type = forms.ChoiceField(
         label=_("Role Type"),
         choices=[
@@ -1170,16 +1066,8 @@ class RoleForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class RuleForm(forms.Form):
+class RuleForm(RequiredLabelForm):
     api_groups = forms.CharField(
         label=_("API Groups (comma-separated, empty for core)"),
         required=False,
@@ -1213,16 +1101,11 @@ class RuleForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
 
+RuleFormSet = formset_factory(RuleForm, extra=1)
 
-class RoleBindingForm(forms.Form):
+
+class RoleBindingForm(RequiredLabelForm):
     binding_name = forms.CharField(
         label=_("Binding Name"),
         max_length=100,
@@ -1245,16 +1128,8 @@ class RoleBindingForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class SubjectForm(forms.Form):
+class SubjectForm(RequiredLabelForm):
     kind = forms.ChoiceField(
         label=_("Subject Kind"),
         choices=[
@@ -1292,16 +1167,11 @@ class SubjectForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+SubjectFormSet = formset_factory(SubjectForm, extra=1)
 
 
-class NetworkPolicyForm(forms.Form):
+class NetworkPolicyForm(RequiredLabelForm):
     name = forms.CharField(
         label=_("NetworkPolicy Name"),
         max_length=100,
@@ -1351,16 +1221,8 @@ class NetworkPolicyForm(forms.Form):
         required=True,
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
-
 
-class NetworkRuleForm(forms.Form):
+class NetworkRuleForm(RequiredLabelForm):
     direction = forms.ChoiceField(
         label=_("Direction"),
         choices=[("Ingress", _("Ingress")), ("Egress", _("Egress"))],
@@ -1425,13 +1287,8 @@ class NetworkRuleForm(forms.Form):
         ),
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.label = mark_safe(
-                    f"{field.label} <span style='color: black;'>* </span>"
-                )
+
+NetworkRuleFormSet = formset_factory(NetworkRuleForm, extra=1)
 
 
 class RequiredContainerFormSet(BaseFormSet):
@@ -1453,3 +1310,70 @@ class RequiredContainerFormSet(BaseFormSet):
 
         if not has_data:
             raise ValidationError(_("You must add at least one container."))
+
+
+ContainerFormSet = formset_factory(
+    ContainerForm, formset=RequiredContainerFormSet, extra=1
+)
+
+# --- Deployment history filters ---
+
+
+class DeploymentHistoryFilterForm(forms.Form):
+    resource_type = forms.CharField(label=_("Type"), max_length=50, required=False)
+    resource_name = forms.CharField(label=_("Name"), max_length=100, required=False)
+    username = forms.CharField(label=_("User"), max_length=150, required=False)
+    date_from = forms.DateField(
+        label=_("From"),
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    date_to = forms.DateField(
+        label=_("To"),
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+
+    def filter(self, queryset):
+        """
+        Narrows a DeploymentHistory queryset down to the submitted filters.
+        """
+        data = self.cleaned_data
+        if data.get("resource_type"):
+            queryset = queryset.filter(resource_type=data["resource_type"])
+        if data.get("resource_name"):
+            queryset = queryset.filter(resource_name__icontains=data["resource_name"])
+        if data.get("username"):
+            queryset = queryset.filter(user__username=data["username"])
+        if data.get("date_from"):
+            queryset = queryset.filter(created_at__date__gte=data["date_from"])
+        if data.get("date_to"):
+            queryset = queryset.filter(created_at__date__lte=data["date_to"])
+        return queryset
+
+
+class ResourceListingForm(forms.Form):
+    PAGE_SIZE_CHOICES = [(size, size) for size in (25, 50, 100, 200)]
+
+    namespace = forms.CharField(label=_("Namespace"), max_length=63, required=False)
+    prefix = forms.CharField(
+        label=_("Name starts with"), max_length=253, required=False
+    )
+    page_size = forms.TypedChoiceField(
+        label=_("Per page"),
+        choices=PAGE_SIZE_CHOICES,
+        coerce=int,
+        required=False,
+        empty_value=None,
+    )
+
+    def list_options(self, default_page_size):
+        """
+        Returns the kube-manager listing options of the submitted filters.
+        """
+        data = self.cleaned_data if self.is_valid() else {}
+        return {
+            "namespace": data.get("namespace", ""),
+            "prefix": data.get("prefix", ""),
+            "limit": data.get("page_size") or default_page_size,
+        }
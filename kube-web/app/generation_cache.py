@@ -0,0 +1,55 @@
+import hashlib
+import json
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import backends, metrics
+
+GeneratedYAML = namedtuple("GeneratedYAML", ["status_code", "text"])
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    metrics.CACHE_LOOKUPS.labels("generation", name).inc()
+
+
+def stats():
+    """Returns the generation cache counters and hit ratio of this process."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
+
+
+def payload_key(payload):
+    """Hashes the canonical JSON form of a generator-engine payload."""
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"generated:{digest}"
+
+
+def generate(payload):
+    """Returns the YAML for ``payload``, asking generator-engine only on a miss."""
+    cache = caches[settings.GENERATION_CACHE_ALIAS]
+    key = payload_key(payload)
+
+    yaml_text = cache.get(key)
+    if yaml_text is not None:
+        _count("hits")
+        return GeneratedYAML(200, yaml_text)
+
+    _count("misses")
+    response = backends.post(backends.GENERATOR_ENGINE, "/generate", json=payload)
+    if response.status_code == 200:
+        cache.set(key, response.text)
+    return GeneratedYAML(response.status_code, response.text)
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import metrics, tracing
+from .models import Job
+
+# Job kind -> dotted path of the handler, called as handler(payload, user)
+HANDLERS = {
+    "apply": "app.operations.run_apply",
+    "explain": "app.operations.run_explain",
+}
+
+
+def enqueue(kind, payload, user=None):
+    """Stores a new job; runs it right away when background jobs are disabled."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job.objects.create(
+        kind=kind, payload=payload, user=user, trace_context=tracing.carrier()
+    )
+    if not settings.BACKGROUND_JOBS:
+        if claim(job.pk):
+            # Mirrors the claim instead of reloading the job and its user
+            job.status = Job.RUNNING
+            job.started_at = job.heartbeat_at = timezone.now()
+            job.attempts += 1
+            run(job)
+    return job
+
+
+def claim(pk):
+    """Atomically moves a queued job to running; False if another worker won."""
+    now = timezone.now()
+    return bool(
+        Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+    )
+
+
+def claim_next():
+    """Claims the oldest queued job, or returns None when the queue is empty."""
+    while True:
+        pk = (
+            Job.objects.filter(status=Job.QUEUED)
+            .order_by("created_at")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        if claim(pk):
+            return Job.objects.select_related("user").get(pk=pk)
+
+
+def run(job):
+    """Runs a claimed job and stores its result or error."""
+    started = time.perf_counter()
+    with tracing.job_span(job) as span:
+        try:
+            handler = import_string(HANDLERS[job.kind])
+            job.result = handler(job.payload, job.user)
+            job.status = Job.SUCCEEDED
+        except Exception as e:
+            tracing.record_error(span, e)
+            job.error = str(e)
+            job.status = Job.FAILED
+        job.finished_at = timezone.now()
+        job.save(update_fields=["result", "status", "error", "finished_at"])
+    metrics.JOB_DURATION.labels(job.kind, job.status).observe(
+        time.perf_counter() - started
+    )
+    return job
+
+
+@contextmanager
+def heartbeat(job):
+    """Refreshes ``job.heartbeat_at`` from a thread while the block runs.
+
+    Long jobs keep beating, so only a job whose worker died or hung is
+    taken for abandoned by requeue_stale().
+    """
+    done = threading.Event()
+
+    def beat():
+        try:
+            while not done.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(
+                    heartbeat_at=timezone.now()
+                )
+        except Exception as e:
+            print(f"⚠️ Heartbeat of job {job.pk} stopped: {e}")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-heartbeat-{job.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def requeue_stale():
+    """Puts back jobs whose worker stopped beating, failing them after max retries."""
+    deadline = timezone.now() - timedelta(seconds=settings.JOB_TIMEOUT)
+    stale = Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=deadline)
+    stale.filter(attempts__gte=settings.JOB_MAX_ATTEMPTS).update(
+        status=Job.FAILED, error="Job timed out.", finished_at=timezone.now()
+    )
+    stale.update(status=Job.QUEUED, started_at=None, heartbeat_at=None)
+
+
+def work(stop_event):
+    """Worker loop: runs queued jobs until ``stop_event`` is set."""
+    print(f"👷 Job worker {os.getpid()} started")
+    metrics.JOB_WORKERS.inc()
+    while not stop_event.is_set():
+        close_old_connections()
+        job = claim_next()
+        if job is None:
+            stop_event.wait(settings.JOB_POLL_INTERVAL)
+            continue
+        metrics.JOB_QUEUE_WAIT.labels(job.kind).observe(
+            (job.started_at - job.created_at).total_seconds()
+        )
+        started = time.monotonic()
+        with metrics.JOB_WORKERS_BUSY.track_inprogress(), heartbeat(job):
+            run(job)
+        print(
+            f"👷 {job.kind} job {job.pk} {job.status} "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+    metrics.JOB_WORKERS.dec()
+    # Worker processes exit without running atexit hooks
+    tracing.flush()
+    close_old_connections()
@@ -0,0 +1,157 @@
+"""Short-lived cache of kube-manager ``/list`` answers for the explore page.
+
+Listings are kept for ``settings.LISTING_CACHE_TTL`` seconds per resource
+kind and namespace, so users refreshing the page do not each trigger a full
+list against the API server. Every kind has a generation counter in its
+keys: a delete bumps it, which drops all cached listings of that kind at
+once (the namespace's own and the all-namespaces one).
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import backends, metrics
+
+Listing = namedtuple(
+    "Listing", ["names", "continue_token", "remaining", "etag", "last_modified"]
+)
+
+# How long the etag and modification time of a listing are remembered, so a
+# refetch that returns the same objects keeps its Last-Modified date.
+SEEN_TIMEOUT = 24 * 60 * 60
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    metrics.CACHE_LOOKUPS.labels("listing", name).inc()
+
+
+def stats():
+    """Returns the listing cache counters and hit ratio of this process."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
+
+
+def _generation_key(resource):
+    return f"listing-generation:{resource}"
+
+
+def _params_digest(params):
+    raw = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _listing_key(resource, generation, params):
+    return f"listing:{resource}:{generation}:{_params_digest(params)}"
+
+
+def _seen_key(resource, params):
+    return f"listing-seen:{resource}:{_params_digest(params)}"
+
+
+def list_params(resource, namespace="", prefix="", limit=None, continue_token=""):
+    """Query parameters sent to kube-manager /list."""
+    params = {"resource": resource}
+    if namespace:
+        params["namespace"] = namespace
+    if prefix:
+        params["prefix"] = prefix
+    if limit:
+        params["limit"] = limit
+    if continue_token:
+        params["continue"] = continue_token
+    return params
+
+
+def _build(response, seen):
+    """Turns a /list response into a Listing; paging state comes in headers."""
+    names = response.json() or []
+    continue_token = response.headers.get("X-Continue", "")
+    remaining = response.headers.get("X-Remaining-Item-Count")
+    remaining = int(remaining) if remaining else None
+
+    raw = json.dumps(
+        [names, continue_token, remaining], sort_keys=True, separators=(",", ":")
+    )
+    etag = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    if seen and seen[0] == etag:
+        last_modified = seen[1]
+    else:
+        last_modified = int(time.time())
+    return Listing(names, continue_token, remaining, etag, last_modified)
+
+
+def get_listing(resource, timeout=None, retry=True, **options):
+    """Returns one page of ``resource``, asking kube-manager only on a miss.
+
+    ``options`` are the keyword arguments of list_params(); ``timeout`` and
+    ``retry`` are passed to the backend call. Raises the backend error when
+    the listing cannot be fetched.
+    """
+    params = list_params(resource, **options)
+    generation = cache.get_or_set(_generation_key(resource), 0, None)
+    key = _listing_key(resource, generation, params)
+    listing = cache.get(key)
+    if listing is not None:
+        _count("hits")
+        return listing
+
+    _count("misses")
+    response = backends.get(
+        backends.KUBE_MANAGER, "/list", params=params, timeout=timeout, retry=retry
+    )
+    response.raise_for_status()
+    seen_key = _seen_key(resource, params)
+    listing = _build(response, cache.get(seen_key))
+    cache.set(key, listing, settings.LISTING_CACHE_TTL)
+    cache.set(seen_key, (listing.etag, listing.last_modified), SEEN_TIMEOUT)
+    return listing
+
+
+async def aget_listing(resource, timeout=None, **options):
+    """Async counterpart of get_listing()."""
+    params = list_params(resource, **options)
+    generation = await cache.aget_or_set(_generation_key(resource), 0, None)
+    key = _listing_key(resource, generation, params)
+    listing = await cache.aget(key)
+    if listing is not None:
+        _count("hits")
+        return listing
+
+    _count("misses")
+    response = await backends.aget(
+        backends.KUBE_MANAGER, "/list", params=params, timeout=timeout
+    )
+    response.raise_for_status()
+    seen_key = _seen_key(resource, params)
+    listing = _build(response, await cache.aget(seen_key))
+    await cache.aset(key, listing, settings.LISTING_CACHE_TTL)
+    await cache.aset(seen_key, (listing.etag, listing.last_modified), SEEN_TIMEOUT)
+    return listing
+
+
+def invalidate(resource):
+    """Drops every cached listing of ``resource``."""
+    key = _generation_key(resource)
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+
+async def ainvalidate(resource):
+    """Async counterpart of invalidate()."""
+    key = _generation_key(resource)
+    await cache.aadd(key, 0, None)
+    await cache.aincr(key)
@@ -0,0 +1,67 @@
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app import jobs, metrics
+
+# Seconds between checks for dead workers and abandoned jobs
+MONITOR_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = "Runs the background job workers (apply and explain requests)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.JOB_WORKERS,
+            help="Number of worker processes to start.",
+        )
+
+    def handle(self, *args, **options):
+        jobs.requeue_stale()
+        # Children must not inherit the parent's database connection.
+        connections.close_all()
+
+        context = multiprocessing.get_context("fork")
+        stop_event = context.Event()
+        workers = [
+            context.Process(target=jobs.work, args=(stop_event,), daemon=True)
+            for _ in range(options["workers"])
+        ]
+
+        # Only flag the shutdown here: setting the shared event from inside a
+        # signal handler can deadlock with a pending stop_event.wait().
+        self.stopping = False
+
+        def stop(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"✅ Started {len(workers)} job workers.")
+
+        while not self.stopping:
+            time.sleep(MONITOR_INTERVAL)
+            jobs.requeue_stale()
+            connections.close_all()
+            for i, worker in enumerate(workers):
+                if not worker.is_alive() and not self.stopping:
+                    metrics.mark_process_dead(worker.pid)
+                    workers[i] = context.Process(
+                        target=jobs.work, args=(stop_event,), daemon=True
+                    )
+                    workers[i].start()
+
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+        self.stdout.write("👋 Job workers stopped.")
@@ -0,0 +1,29 @@
+import yaml
+
+
+def iter_documents(yaml_text):
+    """Yields (source_text, data) for each non-empty document of a manifest.
+
+    Works like ``yaml.safe_load_all`` but also slices out the source text of
+    every document, so each one can be applied and recorded on its own.
+    Raises ``yaml.YAMLError`` when the text is not valid YAML.
+    """
+    loader = yaml.SafeLoader(yaml_text)
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            data = loader.construct_document(node)
+            if data is None:
+                continue
+            source = yaml_text[node.start_mark.index : node.end_mark.index]
+            yield source.strip() + "\n", data
+    finally:
+        loader.dispose()
+
+
+def describe_document(data):
+    """Returns the (kind, name) of a parsed Kubernetes object."""
+    if not isinstance(data, dict):
+        return "unknown", "unknown"
+    metadata = data.get("metadata") or {}
+    return data.get("kind", "unknown"), metadata.get("name", "unknown")
@@ -0,0 +1,214 @@
+"""Prometheus metrics of kube-web, exported at ``/metrics``.
+
+Requests are timed by ``middleware.RequestMetricsMiddleware`` and their SQL
+queries counted by ``db_queries``, backend calls by ``backends``, applies
+and explanations by ``operations`` and ``streaming``, and background jobs by
+``jobs``. Under Gunicorn and the job runner several processes record
+samples; when ``PROMETHEUS_MULTIPROC_DIR`` is set (the Docker image sets it)
+each one writes them there and a scrape aggregates all of them, cache
+lookups included. The job queue depth is read from the database.
+
+The Grafana dashboard (``grafana/helm/dashboards/kube-web.json``) and the
+recording and alerting rules (``prometheus/helm/values.yaml``) are built on
+these names; keep them in sync when renaming a metric or label.
+"""
+
+import os
+import time
+
+from django.db.models import Count
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Explanations and streamed answers take tens of seconds, so the buckets go
+# further than the client's defaults.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_LATENCY = Histogram(
+    "kube_web_request_duration_seconds",
+    "Time until the response of a request is ready, by URL name.",
+    ["view", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "kube_web_requests_in_flight",
+    "Requests being served.",
+    multiprocess_mode="livesum",
+)
+BACKEND_LATENCY = Histogram(
+    "kube_web_backend_request_duration_seconds",
+    "Duration of calls to the backend services.",
+    ["service", "endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+BACKEND_ERRORS = Counter(
+    "kube_web_backend_errors_total",
+    "Backend calls that raised or answered with a 5xx status.",
+    ["service", "endpoint", "error"],
+)
+BACKEND_IN_FLIGHT = Gauge(
+    "kube_web_backend_requests_in_flight",
+    "Backend calls waiting for an answer.",
+    ["service"],
+    multiprocess_mode="livesum",
+)
+APPLIED_DOCUMENTS = Counter(
+    "kube_web_applied_documents_total",
+    "Manifest documents sent to kube-manager, by outcome.",
+    ["result"],
+)
+EXPLANATION_LATENCY = Histogram(
+    "kube_web_explanation_duration_seconds",
+    "Time for a model to produce a complete explanation, by model and mode.",
+    ["model", "mode"],
+    buckets=LATENCY_BUCKETS,
+)
+JOB_DURATION = Histogram(
+    "kube_web_job_duration_seconds",
+    "Run time of background jobs, by kind and final status.",
+    ["kind", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+JOB_QUEUE_WAIT = Histogram(
+    "kube_web_job_queue_wait_seconds",
+    "Time background jobs spent queued before a worker claimed them.",
+    ["kind"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "kube_web_request_db_queries",
+    "SQL queries run per request, by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+DB_DURATION = Histogram(
+    "kube_web_request_db_duration_seconds",
+    "Time spent in SQL queries per request, by URL name.",
+    ["view"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "kube_web_query_budget_exceeded_total",
+    "Requests over their query count or database time budget.",
+    ["view", "budget"],
+)
+CACHE_LOOKUPS = Counter(
+    "kube_web_cache_lookups",
+    "Lookups in kube-web's caches, by cache and result (the stats() counter).",
+    ["cache", "result"],
+)
+JOB_WORKERS = Gauge(
+    "kube_web_job_workers",
+    "Running job worker processes.",
+    multiprocess_mode="livesum",
+)
+JOB_WORKERS_BUSY = Gauge(
+    "kube_web_job_workers_busy",
+    "Job worker processes running a job.",
+    multiprocess_mode="livesum",
+)
+
+
+class BackendCall:
+    """Times one backend call; set ``status`` once the backend has answered."""
+
+    def __init__(self, service, endpoint):
+        self.service = service
+        self.endpoint = endpoint
+        self.status = None
+
+    def __enter__(self):
+        BACKEND_IN_FLIGHT.labels(self.service).inc()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        BACKEND_IN_FLIGHT.labels(self.service).dec()
+        BACKEND_LATENCY.labels(self.service, self.endpoint).observe(
+            time.perf_counter() - self.started
+        )
+        if exc_type is not None and issubclass(exc_type, Exception):
+            error = exc_type.__name__
+        elif self.status is not None and self.status >= 500:
+            error = str(self.status)
+        else:
+            return
+        BACKEND_ERRORS.labels(self.service, self.endpoint, error).inc()
+
+
+def view_label(request):
+    """URL name of the request, or "unmatched" for 404s."""
+    match = request.resolver_match
+    return match.url_name if match and match.url_name else "unmatched"
+
+
+def observe_request(request, response, started):
+    REQUEST_LATENCY.labels(
+        view_label(request), request.method, str(response.status_code)
+    ).observe(time.perf_counter() - started)
+
+
+class JobQueueCollector:
+    """Exports the number of queued and running jobs, read from the database."""
+
+    def family(self):
+        return GaugeMetricFamily(
+            "kube_web_jobs", "Background jobs waiting or running.", labels=["status"]
+        )
+
+    def describe(self):
+        # Keeps registration from querying the database at import time
+        yield self.family()
+
+    def collect(self):
+        from .models import Job
+
+        jobs = self.family()
+        counts = dict.fromkeys((Job.QUEUED, Job.RUNNING), 0)
+        rows = (
+            Job.objects.filter(status__in=counts)
+            .values_list("status")
+            .annotate(count=Count("pk"))
+        )
+        counts.update(rows)
+        for status, count in counts.items():
+            jobs.add_metric([status], count)
+        yield jobs
+
+
+def multiprocess_enabled():
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def registry():
+    """Registry to scrape: this process's metrics, or every process's ones."""
+    if not multiprocess_enabled():
+        return REGISTRY
+    scrape_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(scrape_registry)
+    scrape_registry.register(JobQueueCollector())
+    return scrape_registry
+
+
+def render():
+    """Returns the exposition body and its content type."""
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """Drops the live gauges of a finished worker process."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+if not multiprocess_enabled():
+    REGISTRY.register(JobQueueCollector())
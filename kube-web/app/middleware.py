@@ -0,0 +1,150 @@
+import time
+
+from asgiref.sync import (
+    async_to_sync,
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import db_queries, metrics, profiling, tracing
+
+
+class RequestMetricsMiddleware:
+    """Records the latency of every request and the number being served.
+
+    Streamed responses are timed until their headers are ready.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec()
+        metrics.observe_request(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec()
+        metrics.observe_request(request, response, started)
+        return response
+
+
+class QueryMetricsMiddleware:
+    """Counts the SQL queries of every request and checks them against its budget.
+
+    The totals are also kept on ``request.db_queries`` for the test helpers.
+    Queries run while a streamed response is being sent are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with db_queries.track() as queries:
+            request.db_queries = queries
+            response = self.get_response(request)
+        db_queries.report(request, queries)
+        return response
+
+    async def __acall__(self, request):
+        with db_queries.track() as queries:
+            request.db_queries = queries
+            response = await self.get_response(request)
+        db_queries.report(request, queries)
+        return response
+
+
+class TracingMiddleware:
+    """Opens the server span of every request.
+
+    Not installed when tracing is disabled. Streamed responses are traced
+    until their headers are ready.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not tracing.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with tracing.server_span(request) as span:
+            response = self.get_response(request)
+            tracing.end_request(span, request, response)
+        return response
+
+    async def __acall__(self, request):
+        with tracing.server_span(request) as span:
+            response = await self.get_response(request)
+            tracing.end_request(span, request, response)
+        return response
+
+
+class ProfilingMiddleware:
+    """Profiles the requests of superusers that ask for it (see ``profiling``).
+
+    Under ASGI a profiled request is handed to the thread that runs sync
+    code, where cProfile sees the sync views, their forms and backend calls;
+    the coroutines of async views run on the event loop and are left out.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if profiling.requested(request) and request.user.is_superuser:
+            return profiling.run(self.get_response, request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if profiling.requested(request) and (await request.auser()).is_superuser:
+            return await sync_to_async(profiling.run)(
+                async_to_sync(self.get_response), request
+            )
+        return await self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_userprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deploymenthistory',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='deploymenthistory',
+            index=models.Index(fields=['resource_type', '-created_at'], name='history_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deploymenthistory',
+            index=models.Index(fields=['user', '-created_at'], name='history_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_deploymenthistory_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManifestBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='deploymenthistory',
+            name='manifest',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='history', to='app.manifestblob'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import hashlib
+import zlib
+
+from django.db import migrations
+
+
+def move_yaml_to_blobs(apps, schema_editor):
+    DeploymentHistory = apps.get_model('app', 'DeploymentHistory')
+    ManifestBlob = apps.get_model('app', 'ManifestBlob')
+
+    rows = DeploymentHistory.objects.only('id', 'yaml_content')
+    for item in rows.iterator(chunk_size=500):
+        raw = item.yaml_content.encode('utf-8')
+        blob, _ = ManifestBlob.objects.get_or_create(
+            digest=hashlib.sha256(raw).hexdigest(),
+            defaults={'data': zlib.compress(raw, 9), 'size': len(raw)},
+        )
+        DeploymentHistory.objects.filter(pk=item.pk).update(manifest=blob)
+
+
+def restore_yaml_from_blobs(apps, schema_editor):
+    DeploymentHistory = apps.get_model('app', 'DeploymentHistory')
+
+    rows = DeploymentHistory.objects.select_related('manifest')
+    for item in rows.iterator(chunk_size=500):
+        text = zlib.decompress(item.manifest.data).decode('utf-8')
+        DeploymentHistory.objects.filter(pk=item.pk).update(yaml_content=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_manifestblob'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_yaml_to_blobs, restore_yaml_from_blobs),
+    ]
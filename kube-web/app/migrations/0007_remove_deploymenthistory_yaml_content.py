@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_move_yaml_content_to_blobs'),
+    ]
+
+    operations = [
+        # Gives the column a default so unapplying the removal can re-add it
+        # to existing rows before 0006 restores their content.
+        migrations.AlterField(
+            model_name='deploymenthistory',
+            name='yaml_content',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='deploymenthistory',
+            name='yaml_content',
+        ),
+        migrations.AlterField(
+            model_name='deploymenthistory',
+            name='manifest',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='history', to='app.manifestblob'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_explanation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='trace_context',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_job_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExplanationClaim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64)),
+                ('model', models.CharField(max_length=255)),
+                ('claimed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('digest', 'model'), name='explanation_claim_digest_model_uniq')],
+            },
+        ),
+    ]
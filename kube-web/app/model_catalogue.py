@@ -0,0 +1,109 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import backends, metrics
+
+CACHE_KEY = "model_catalogue"
+REFRESH_LOCK_KEY = "model_catalogue:refreshing"
+
+_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refresh_errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    metrics.CACHE_LOOKUPS.labels("model_catalogue", name).inc()
+
+
+def stats():
+    """Returns a snapshot of the catalogue cache counters of this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _fetch_models():
+    """Downloads the model list from yaml-explainer, or None on failure."""
+    try:
+        response = backends.get(backends.YAML_EXPLAINER, "/models")
+        if response.status_code == 200:
+            return response.json()
+    except Exception:
+        pass
+    return None
+
+
+def _store(models, timeout=None, failed=False):
+    entry = {"models": models, "fetched_at": time.time(), "failed": failed}
+    if timeout is None:
+        timeout = settings.MODEL_CATALOGUE_TTL + settings.MODEL_CATALOGUE_STALE_TTL
+    cache.set(CACHE_KEY, entry, timeout)
+    return entry
+
+
+def refresh():
+    """Fetches the catalogue and stores it; keeps the old entry on failure."""
+    models = _fetch_models()
+    if models is None:
+        _count("refresh_errors")
+        return None
+    _store(models)
+    return models
+
+
+def _refresh_in_background():
+    # Only one refresh per cache runs at a time: per process with the default
+    # locmem cache, across the deployment when CACHES["default"] is shared.
+    if not cache.add(REFRESH_LOCK_KEY, True, settings.BACKEND_TIMEOUT[1] * 2):
+        return
+
+    def run():
+        try:
+            refresh()
+        finally:
+            cache.delete(REFRESH_LOCK_KEY)
+
+    threading.Thread(target=run, name="model-catalogue-refresh", daemon=True).start()
+
+
+def get_models():
+    """Returns the cached model list, serving stale data while revalidating."""
+    entry = cache.get(CACHE_KEY)
+    if entry is not None:
+        age = time.time() - entry["fetched_at"]
+        if entry.get("failed"):
+            # A remembered failure, not a catalogue: keep it out of the hits
+            _count("refresh_errors")
+        elif age < settings.MODEL_CATALOGUE_TTL:
+            _count("hits")
+        else:
+            _count("stale_hits")
+            _refresh_in_background()
+        return entry["models"]
+
+    _count("misses")
+    models = refresh()
+    if models is None:
+        # Remember the failure briefly so pages stop waiting on a down explainer
+        _store([], settings.MODEL_CATALOGUE_ERROR_TTL, failed=True)
+        return []
+    return models
+
+
+def invalidate():
+    """Drops the cached catalogue so the next read fetches it again."""
+    cache.delete(CACHE_KEY)
+
+
+def resolve_default_model(models, user=None):
+    """Picks the user's preferred model if available, else the first free one."""
+    if user and user.is_authenticated:
+        profile = getattr(user, "profile", None)
+        if profile and profile.default_model:
+            if any(str(m["id"]) == str(profile.default_model) for m in models):
+                return profile.default_model
+
+    return next((m["id"] for m in models if m.get("free")), None)
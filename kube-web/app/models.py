@@ -1,21 +1,184 @@
+import hashlib
+import uuid
+import zlib
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
-class DeploymentHistory(models.Model):
+class ManifestBlobManager(models.Manager):
+    def build(self, yaml_text):
+        """Returns an unsaved blob for ``yaml_text``, keyed by its digest."""
+        raw = yaml_text.encode("utf-8")
+        return self.model(
+            digest=hashlib.sha256(raw).hexdigest(),
+            data=zlib.compress(raw, 9),
+            size=len(raw),
+        )
+
+    def store(self, yaml_text):
+        """Returns the blob holding ``yaml_text``, creating it only once."""
+        blob = self.build(yaml_text)
+        stored, _ = self.get_or_create(
+            digest=blob.digest, defaults={"data": blob.data, "size": blob.size}
+        )
+        return stored
+
+
+class ManifestBlob(models.Model):
+    """A distinct manifest body, stored once, compressed and keyed by SHA-256."""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ManifestBlobManager()
+
+    @property
+    def text(self):
+        return zlib.decompress(self.data).decode("utf-8")
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes)"
+
+
+class DeploymentHistory(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     resource_type = models.CharField(max_length=50)
     resource_name = models.CharField(max_length=100)
-    yaml_content = models.TextField()
+    manifest = models.ForeignKey(
+        ManifestBlob, on_delete=models.PROTECT, related_name="history"
+    )
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["resource_type", "-created_at"],
+                name="history_type_created_idx",
+            ),
+            models.Index(
+                fields=["user", "-created_at"], name="history_user_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.resource_type} - {self.resource_name} ({self.created_at})"
 
+    @property
+    def yaml_content(self):
+        """Decompressed manifest text; loads the blob on first access."""
+        return self.manifest.text
+
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     default_model = models.CharField(max_length=255, blank=True, null=True)
 
     def __str__(self):
-        return f"{self.user.username}'s Profile"
\ No newline at end of file
+        return f"{self.user.username}'s Profile"
+
+class Job(models.Model):
+    """A unit of slow backend work run by the ``runjobs`` worker processes."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    # W3C trace headers of the request that queued the job
+    trace_context = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the job runs, see jobs.requeue_stale()
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="job_status_created_idx"),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def __str__(self):
+        return f"{self.kind} {self.id} ({self.status})"
+
+
+class Explanation(models.Model):
+    """A stored yaml-explainer answer for one canonical manifest and model."""
+
+    digest = models.CharField(max_length=64)
+    model = models.CharField(max_length=255)
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["digest", "model"], name="explanation_digest_model_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.digest[:12]} / {self.model}"
+
+
+class ExplanationClaim(models.Model):
+    """An explanation being fetched; other processes wait for it to be stored."""
+
+    digest = models.CharField(max_length=64)
+    model = models.CharField(max_length=255)
+    claimed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["digest", "model"], name="explanation_claim_digest_model_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.digest[:12]} / {self.model} since {self.claimed_at}"
+
+
+class RequestProfile(models.Model):
+    """A cProfile capture of one request, triggered by a superuser."""
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    # zlib-compressed marshal dump of the stats, the format of a .prof file
+    data = models.BinaryField()
+    summary = models.TextField()
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    @property
+    def stats_file(self):
+        """Contents of the .prof file, readable by pstats and snakeviz."""
+        return zlib.decompress(self.data)
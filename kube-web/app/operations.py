@@ -0,0 +1,189 @@
+import time
+
+import yaml
+from django.conf import settings
+from django.db import transaction
+
+from . import (
+    backends,
+    error_explanations,
+    explanation_cache,
+    metrics,
+    model_catalogue,
+    tracing,
+)
+from .manifests import describe_document, iter_documents
+from .models import DeploymentHistory, ManifestBlob, UserProfile
+
+
+def explanation_message(response):
+    """Turns a yaml-explainer /explain response into the text shown to the user"""
+    if response.status_code == 200:
+        return response.json().get("explanation", "No explanation available.")
+    return explanation_error(response.status_code)
+
+
+def explanation_error(status_code):
+    """Message shown when yaml-explainer answers with a non-200 status"""
+    if status_code == 429:
+        return "⚠️ Model is currently unavailable. Please try again later."
+    elif status_code == 402:
+        return (
+            "💳 Insufficient credits. "
+            "You can add more at <a href='https://openrouter.ai/settings/credits' target='_blank'>OpenRouter</a> "
+            "or use a free model."
+        )
+    return f"❌ Error retrieving explanation: {status_code}"
+
+
+def observe_explanation(model, mode, started):
+    """Records how long ``model`` took to produce a complete explanation.
+
+    Models missing from the catalogue are counted as "other", so a crafted
+    model id cannot add series.
+    """
+    model_ids = {str(m["id"]) for m in model_catalogue.get_models()}
+    label = model if model in model_ids else "other"
+    metrics.EXPLANATION_LATENCY.labels(label, mode).observe(
+        time.perf_counter() - started
+    )
+
+
+def remember_default_model(user, selected_model):
+    """Stores ``selected_model`` as the user's default if it is a known model."""
+    model_ids = {str(m["id"]) for m in model_catalogue.get_models()}
+    if selected_model in model_ids:
+        # One UPDATE, skipped when the default is already the selected model
+        UserProfile.objects.filter(user=user).exclude(
+            default_model=selected_model
+        ).update(default_model=selected_model)
+
+
+def save_deployment_history(documents, user):
+    """Records one history row per applied (source_text, data) document.
+
+    Blobs and rows are written with one bulk insert each, in a single
+    transaction.
+    """
+    try:
+        blobs = {}
+        rows = []
+        for doc_text, data in documents:
+            blob = ManifestBlob.objects.build(doc_text)
+            blobs[blob.digest] = blob
+            resource_type, resource_name = describe_document(data)
+            rows.append(
+                DeploymentHistory(
+                    resource_type=resource_type,
+                    resource_name=resource_name,
+                    manifest_id=blob.digest,
+                    user=user,
+                )
+            )
+        with tracing.span("insert DeploymentHistory", {"history.rows": len(rows)}):
+            with transaction.atomic():
+                ManifestBlob.objects.bulk_create(
+                    blobs.values(), ignore_conflicts=True
+                )
+                DeploymentHistory.objects.bulk_create(rows)
+    except Exception as e:
+        print(f"⚠️ Failed to save deployment history: {e}")
+
+
+def apply_error_message(error_text, explanation=None):
+    error_msg = f"❌ Failed to apply YAML: {error_text}"
+    if explanation:
+        error_msg += f"\n🧠 {explanation}"
+    return error_msg
+
+
+def explain_apply_error(error_text, model):
+    try:
+        return error_explanations.explain(error_text, model)
+    except Exception as e:
+        print(f"⚠️ Failed to fetch error explanation: {e}")
+    return None
+
+
+def apply_result(data, ok, detail):
+    kind, name = describe_document(data)
+    return {"kind": kind, "name": name, "ok": ok, "detail": detail}
+
+
+def apply_document(doc_text, data, default_model):
+    """Sends one manifest document to kube-manager and describes the outcome."""
+    try:
+        response = backends.post(
+            backends.KUBE_MANAGER,
+            "/deploy",
+            data=doc_text.encode("utf-8"),
+            headers={"Content-Type": "application/x-yaml"},
+        )
+    except Exception as e:
+        metrics.APPLIED_DOCUMENTS.labels("error").inc()
+        return apply_result(data, False, f"❌ Failed to connect to backend: {e}")
+
+    if response.status_code == 200:
+        metrics.APPLIED_DOCUMENTS.labels("applied").inc()
+        return apply_result(data, True, "✅ Deployed to Kubernetes.")
+    metrics.APPLIED_DOCUMENTS.labels("rejected").inc()
+    explanation = explain_apply_error(response.text, default_model)
+    return apply_result(data, False, apply_error_message(response.text, explanation))
+
+
+def run_apply(payload, user):
+    """Job handler: applies every document of ``payload["yaml"]`` in order.
+
+    Later documents may depend on earlier ones, e.g. a RoleBinding on its
+    Role, so they are never applied out of order.
+    """
+    try:
+        with tracing.span("parse YAML"):
+            documents = list(iter_documents(payload["yaml"]))
+    except yaml.YAMLError as e:
+        return {"results": [], "error": f"❌ Invalid YAML: {e}"}
+    if not documents:
+        return {"results": [], "error": "❌ Failed to apply YAML: no resources found."}
+
+    results = []
+    applied = []
+    for doc_text, data in documents:
+        kind, name = describe_document(data)
+        with tracing.span(f"apply {kind}", {"k8s.kind": kind, "k8s.name": name}):
+            result = apply_document(doc_text, data, payload.get("model"))
+        results.append(result)
+        if result["ok"]:
+            applied.append((doc_text, data))
+    if applied:
+        save_deployment_history(applied, user)
+    return {"results": results, "error": None}
+
+
+def run_explain(payload, user):
+    """Job handler: asks yaml-explainer to explain ``payload["yaml"]``.
+
+    A stored explanation is reused unless ``payload["refresh"]`` is set.
+    """
+    if not payload.get("refresh"):
+        explanation = explanation_cache.lookup(payload["yaml"], payload["model"])
+        if explanation is not None:
+            return {"explanation": explanation, "status_code": 200, "cached": True}
+
+    started = time.perf_counter()
+    response = backends.post(
+        backends.YAML_EXPLAINER,
+        "/explain",
+        json={"yaml": payload["yaml"], "model": payload["model"]},
+        timeout=settings.EXPLAIN_TIMEOUT,
+    )
+    explanation = explanation_message(response)
+    if response.status_code == 200:
+        observe_explanation(payload["model"], "job", started)
+        explanation_cache.store(payload["yaml"], payload["model"], explanation)
+        if user is not None:
+            remember_default_model(user, payload["model"])
+    return {
+        "explanation": explanation,
+        "status_code": response.status_code,
+        "cached": False,
+    }
@@ -0,0 +1,139 @@
+"""Cluster overview: one small listing per resource kind, fetched
+concurrently, so the page takes about as long as the slowest kind instead of
+the sum of all of them. Kinds that fail or miss the deadline are reported on
+their own without holding back the rest."""
+
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+from . import backends, listing_cache, tracing
+
+# Kinds kube-manager can list, with the label shown on the page
+RESOURCE_KINDS = [
+    ("Deployment", "Deployments"),
+    ("Pod", "Pods"),
+    ("Service", "Services"),
+    ("Ingress", "Ingress"),
+    ("HorizontalPodAutoscaler", "Horizontal Pod Autoscalers"),
+    ("ConfigMap", "ConfigMaps"),
+    ("Secret", "Secrets"),
+    ("PersistentVolumeClaim", "Persistent Volume Claims"),
+    ("ServiceAccount", "Service Accounts"),
+    ("Role", "Role"),
+    ("RoleBinding", "Role Binding"),
+    ("NetworkPolicy", "Network Policies"),
+    ("Namespace", "Namespaces"),
+    ("ClusterRole", "Cluster Role"),
+    ("ClusterRoleBinding", "Cluster Role Binding"),
+]
+
+# Kinds that do not live in a namespace and ignore the namespace filter
+CLUSTER_SCOPED = frozenset({"Namespace", "ClusterRole", "ClusterRoleBinding"})
+
+KindSummary = namedtuple(
+    "KindSummary", ["kind", "label", "namespace", "count", "more", "names", "error"]
+)
+
+def kind_namespace(kind, namespace):
+    return "" if kind in CLUSTER_SCOPED else namespace
+
+
+def list_options(kind, namespace):
+    return {
+        "namespace": kind_namespace(kind, namespace),
+        "limit": settings.OVERVIEW_SAMPLE_SIZE,
+        # A call never outlives the page's deadline by more than a connect
+        "timeout": (settings.BACKEND_TIMEOUT[0], settings.OVERVIEW_TIMEOUT),
+    }
+
+
+def summarize(kind, label, namespace, listing):
+    """Counts a kind from its first page and the remaining item count."""
+    count = len(listing.names)
+    more = False
+    if listing.remaining is not None:
+        count += listing.remaining
+    elif listing.continue_token:
+        more = True
+    return KindSummary(
+        kind, label, kind_namespace(kind, namespace), count, more, listing.names, None
+    )
+
+
+def failed(kind, label, namespace, error):
+    return KindSummary(
+        kind, label, kind_namespace(kind, namespace), None, False, [], error
+    )
+
+
+def list_kind(kind, namespace):
+    """Lists one kind on a pool thread, then closes the thread's sessions."""
+    try:
+        return listing_cache.get_listing(
+            kind, retry=False, **list_options(kind, namespace)
+        )
+    finally:
+        backends.close_session()
+
+
+def collect(namespace=""):
+    """Returns a KindSummary per kind, listing them on a pool of their own.
+
+    Each page gets its own pool, so kinds of a page stuck on a slow
+    kube-manager never queue the kinds of other pages behind them.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=settings.OVERVIEW_WORKERS, thread_name_prefix="overview"
+    )
+    try:
+        futures = {
+            kind: executor.submit(tracing.bind(list_kind), kind, namespace)
+            for kind, _ in RESOURCE_KINDS
+        }
+        done, _ = wait(futures.values(), timeout=settings.OVERVIEW_TIMEOUT)
+    finally:
+        # Returns at the deadline: queued kinds are dropped, running calls end
+        # at their own timeout and their answers still land in the cache.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    summaries = []
+    for kind, label in RESOURCE_KINDS:
+        future = futures[kind]
+        if future not in done:
+            summaries.append(failed(kind, label, namespace, "⏱️ Timed out"))
+            continue
+        try:
+            summaries.append(summarize(kind, label, namespace, future.result()))
+        except Exception as e:
+            summaries.append(failed(kind, label, namespace, f"❌ {e}"))
+    return summaries
+
+
+async def acollect(namespace=""):
+    """Async counterpart of collect(), bounded by a semaphore."""
+    semaphore = asyncio.Semaphore(settings.OVERVIEW_WORKERS)
+
+    async def fetch(kind):
+        async with semaphore:
+            return await listing_cache.aget_listing(
+                kind, **list_options(kind, namespace)
+            )
+
+    tasks = {kind: asyncio.create_task(fetch(kind)) for kind, _ in RESOURCE_KINDS}
+    await asyncio.wait(tasks.values(), timeout=settings.OVERVIEW_TIMEOUT)
+
+    summaries = []
+    for kind, label in RESOURCE_KINDS:
+        task = tasks[kind]
+        if not task.done():
+            task.cancel()
+            summaries.append(failed(kind, label, namespace, "⏱️ Timed out"))
+        elif task.exception() is not None:
+            error = f"❌ {task.exception()}"
+            summaries.append(failed(kind, label, namespace, error))
+        else:
+            summaries.append(summarize(kind, label, namespace, task.result()))
+    return summaries
@@ -0,0 +1,112 @@
+"""Rendered-page cache for the empty configuration forms.
+
+A GET of a configuration page renders the same blank forms for every user
+of a given language, so the HTML is rendered once per view and language and
+then served from the cache. The only per-user part, the CSRF token, is
+rendered as ``CSRF_PLACEHOLDER`` and swapped for the request's token when
+the page is served.
+
+Keys include a digest of the form definitions, templates, translations and
+static files manifest, so a deploy that changes any of them (or only the
+CSS and JS the pages link by hashed name) starts from an empty cache even
+when the cache is shared between releases.
+"""
+
+import hashlib
+import threading
+from functools import lru_cache, wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.translation import get_language
+
+from . import metrics
+
+APP_DIR = Path(__file__).resolve().parent
+DEFINITION_SOURCES = (
+    APP_DIR / "forms.py",
+    APP_DIR / "widgets.py",
+    APP_DIR / "templates",
+    APP_DIR.parent / "locale",
+)
+
+CSRF_PLACEHOLDER = "__page_cache_csrf_token__"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    metrics.CACHE_LOOKUPS.labels("page", name).inc()
+
+
+def stats():
+    """Returns the page cache counters and hit ratio of this process."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
+
+
+@lru_cache(maxsize=None)
+def definition_version():
+    """Digest of the files a configuration page is rendered from."""
+    digest = hashlib.sha256()
+    for source in DEFINITION_SOURCES:
+        files = sorted(source.rglob("*")) if source.is_dir() else [source]
+        for path in files:
+            if path.is_file():
+                digest.update(str(path.relative_to(APP_DIR.parent)).encode())
+                digest.update(path.read_bytes())
+    # Pages link the hashed static names listed in the collectstatic manifest
+    manifest_name = getattr(staticfiles_storage, "manifest_name", None)
+    if manifest_name and staticfiles_storage.exists(manifest_name):
+        with staticfiles_storage.open(manifest_name) as manifest:
+            digest.update(manifest.read())
+    return digest.hexdigest()[:16]
+
+
+def page_key(view_name):
+    return f"page:{view_name}:{get_language()}:{definition_version()}"
+
+
+def csrf_placeholder(request):
+    """Context processor: renders the CSRF placeholder while a page is cached."""
+    if getattr(request, "page_cache_render", False):
+        return {"csrf_token": CSRF_PLACEHOLDER}
+    return {}
+
+
+def cache_empty_page(view):
+    """Serves plain GETs of ``view`` from the rendered-page cache."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or request.GET:
+            return view(request, *args, **kwargs)
+
+        key = page_key(view.__name__)
+        html = cache.get(key)
+        if html is None:
+            _count("misses")
+            request.page_cache_render = True
+            try:
+                response = view(request, *args, **kwargs)
+            finally:
+                request.page_cache_render = False
+            if response.status_code != 200:
+                return response
+            html = response.content.decode(response.charset)
+            cache.set(key, html, settings.PAGE_CACHE_TTL)
+        else:
+            _count("hits")
+        return HttpResponse(html.replace(CSRF_PLACEHOLDER, get_token(request)))
+
+    return wrapper
@@ -0,0 +1,67 @@
+import base64
+from collections import namedtuple
+from datetime import datetime
+
+from django.db.models import Q
+
+KeysetPage = namedtuple("KeysetPage", ["items", "next_cursor", "previous_cursor"])
+
+
+def encode_cursor(item):
+    """Encodes the (created_at, id) position of ``item`` as an opaque token."""
+    raw = f"{item.created_at.isoformat()}|{item.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns the (created_at, id) pair of a cursor, or None if it is invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, pk = raw.split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(queryset, page_size, after=None, before=None):
+    """Returns one page of ``queryset`` ordered by newest first.
+
+    ``after`` moves to older rows and ``before`` to newer ones; both are
+    cursors from a previous page. Rows are located through the
+    ``created_at`` index instead of an OFFSET scan.
+    """
+    position = decode_cursor(after) if after else None
+    backwards = False
+    if position is None and before:
+        position = decode_cursor(before)
+        backwards = position is not None
+
+    if position is None:
+        rows = list(queryset.order_by("-created_at", "-id")[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        return KeysetPage(rows, encode_cursor(rows[-1]) if has_more else None, None)
+
+    created_at, pk = position
+    if backwards:
+        rows = list(
+            queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            ).order_by("created_at", "id")[: page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        next_cursor = encode_cursor(rows[-1]) if rows else None
+        previous_cursor = encode_cursor(rows[0]) if rows and has_more else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    rows = list(
+        queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        ).order_by("-created_at", "-id")[: page_size + 1]
+    )
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1]) if rows and has_more else None
+    previous_cursor = encode_cursor(rows[0]) if rows else None
+    return KeysetPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,81 @@
+"""On-demand cProfile captures of single requests.
+
+A superuser adds ``?profile=1`` to a URL, or sends an ``X-Profile: 1``
+header, and ``middleware.ProfilingMiddleware`` runs that request under
+cProfile: the view with its form construction, rendering and backend calls.
+The capture is stored as a ``RequestProfile`` and listed in the admin, which
+serves it as a ``.prof`` file for ``python -m pstats`` or snakeviz.
+
+Other requests only pay for the check of the query string and headers.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import zlib
+
+from django.conf import settings
+from django.urls import reverse
+
+from .models import RequestProfile
+
+PARAM = "profile"
+HEADER = "HTTP_X_PROFILE"
+
+# Functions listed in the stored text summary, by cumulative time
+SUMMARY_LINES = 60
+
+
+def requested(request):
+    """True when the request asks to be profiled; the user is checked apart."""
+    return HEADER in request.META or PARAM in request.GET
+
+
+def run(get_response, request):
+    """Returns ``get_response(request)``, profiled and stored as a RequestProfile.
+
+    The response carries the id and admin URL of the capture in its
+    ``X-Profile-Id`` and ``X-Profile-URL`` headers.
+    """
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    response = profiler.runcall(get_response, request)
+    duration = time.perf_counter() - started
+
+    profile = save(request, response, profiler, duration)
+    response["X-Profile-Id"] = str(profile.pk)
+    response["X-Profile-URL"] = reverse(
+        "admin:app_requestprofile_change", args=[profile.pk]
+    )
+    return response
+
+
+def save(request, response, profiler, duration):
+    summary = io.StringIO()
+    # Takes the profiler's stats over: dump them from here on
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+
+    match = request.resolver_match
+    profile = RequestProfile.objects.create(
+        method=request.method,
+        path=request.get_full_path()[:2048],
+        view_name=match.view_name if match else "",
+        status_code=response.status_code,
+        duration_ms=duration * 1000,
+        user=request.user,
+        data=zlib.compress(marshal.dumps(stats.stats)),
+        summary=summary.getvalue(),
+    )
+    prune()
+    return profile
+
+
+def prune():
+    """Deletes the oldest captures beyond ``PROFILE_MAX_ENTRIES``."""
+    stale = RequestProfile.objects.order_by("-created_at").values_list(
+        "pk", flat=True
+    )[settings.PROFILE_MAX_ENTRIES :]
+    RequestProfile.objects.filter(pk__in=list(stale)).delete()
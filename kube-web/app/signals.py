@@ -1,6 +1,8 @@
+from django.db.backends.signals import connection_created
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from . import db_queries
 from .models import UserProfile
 
 @receiver(post_save, sender=User)
@@ -11,3 +13,7 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    db_queries.install(connection)
@@ -0,0 +1,162 @@
+"""Relays yaml-explainer's /explain-stream output to the browser as
+Server-Sent Events, so the explanation shows up while it is generated."""
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from . import backends, explanation_cache
+from .operations import (
+    explanation_error,
+    observe_explanation,
+    remember_default_model,
+)
+
+# yaml-explainer ends a complete explanation with this character; a body
+# without it was cut short and is not stored
+STREAM_END = "\x00"
+INCOMPLETE = "❌ The explanation was cut short, please try again."
+
+
+def sse_event(data, event=None):
+    """Formats one Server-Sent Event; every line of ``data`` gets its prefix."""
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in data.split("\n")]
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_response(events):
+    """Wraps an (async) iterator of events in an unbuffered SSE response."""
+    return StreamingHttpResponse(
+        events,
+        content_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stops nginx-style proxies from holding back the chunks.
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def explain_payload(request):
+    return {
+        "yaml": request.POST.get("yaml_generated", ""),
+        "model": request.POST.get("selected_model", ""),
+        "refresh": bool(request.POST.get("refresh")),
+    }
+
+
+def explainer_request(payload):
+    return {"yaml": payload["yaml"], "model": payload["model"]}
+
+
+def split_stream_end(chunk):
+    """Returns the text of a stream chunk and whether it ended the stream."""
+    if chunk.endswith(STREAM_END):
+        return chunk[: -len(STREAM_END)], True
+    return chunk, False
+
+
+def explanation_events(payload, user):
+    """Yields the explanation chunk by chunk, then a ``done`` or ``error`` event.
+
+    A stored explanation is sent as a single ``cached`` event instead, unless
+    ``payload["refresh"]`` is set.
+    """
+    if not payload["refresh"]:
+        explanation = explanation_cache.lookup(payload["yaml"], payload["model"])
+        if explanation is not None:
+            yield sse_event(explanation, "cached")
+            yield sse_event("", "done")
+            return
+
+    started = time.perf_counter()
+    try:
+        response = backends.post(
+            backends.YAML_EXPLAINER,
+            "/explain-stream",
+            json=explainer_request(payload),
+            timeout=settings.EXPLAIN_TIMEOUT,
+            stream=True,
+        )
+    except Exception as e:
+        yield sse_event(f"❌ Error retrieving explanation: {e}", "error")
+        return
+
+    with response:
+        if response.status_code != 200:
+            yield sse_event(explanation_error(response.status_code), "error")
+            return
+        response.encoding = "utf-8"
+        parts = []
+        complete = False
+        try:
+            for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                if not chunk:
+                    continue
+                chunk, complete = split_stream_end(chunk)
+                if chunk:
+                    parts.append(chunk)
+                    yield sse_event(chunk)
+        except Exception as e:
+            yield sse_event(f"❌ Error retrieving explanation: {e}", "error")
+            return
+
+    if not complete:
+        yield sse_event(INCOMPLETE, "error")
+        return
+    observe_explanation(payload["model"], "stream", started)
+    if parts:
+        explanation_cache.store(payload["yaml"], payload["model"], "".join(parts))
+    remember_default_model(user, payload["model"])
+    yield sse_event("", "done")
+
+
+async def aexplanation_events(payload, user):
+    """Async counterpart of explanation_events(), built on httpx."""
+    if not payload["refresh"]:
+        explanation = await sync_to_async(explanation_cache.lookup)(
+            payload["yaml"], payload["model"]
+        )
+        if explanation is not None:
+            yield sse_event(explanation, "cached")
+            yield sse_event("", "done")
+            return
+
+    parts = []
+    complete = False
+    started = time.perf_counter()
+    try:
+        async with backends.astream(
+            "POST",
+            backends.YAML_EXPLAINER,
+            "/explain-stream",
+            json=explainer_request(payload),
+            timeout=settings.EXPLAIN_TIMEOUT,
+        ) as response:
+            if response.status_code != 200:
+                yield sse_event(explanation_error(response.status_code), "error")
+                return
+            async for chunk in response.aiter_text():
+                if not chunk:
+                    continue
+                chunk, complete = split_stream_end(chunk)
+                if chunk:
+                    parts.append(chunk)
+                    yield sse_event(chunk)
+    except Exception as e:
+        yield sse_event(f"❌ Error retrieving explanation: {e}", "error")
+        return
+
+    if not complete:
+        yield sse_event(INCOMPLETE, "error")
+        return
+    await sync_to_async(observe_explanation)(payload["model"], "stream", started)
+    if parts:
+        await sync_to_async(explanation_cache.store)(
+            payload["yaml"], payload["model"], "".join(parts)
+        )
+    await sync_to_async(remember_default_model)(user, payload["model"])
+    yield sse_event("", "done")
@@ -0,0 +1,126 @@
+"""Helpers for kube-web's tests."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django import test
+from django.conf import settings
+from django.test import override_settings
+
+from . import backends, db_queries, metrics
+
+# Pages link static files under their own names, as with DEBUG on, so tests
+# pass without a collectstatic manifest whatever runner and DEBUG they use.
+TEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class TestCase(test.TestCase):
+    """django.test.TestCase without the collectstatic manifest."""
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class TransactionTestCase(test.TransactionTestCase):
+    """django.test.TransactionTestCase without the collectstatic manifest."""
+
+
+class QueryBudgetMixin:
+    """TestCase mixin holding views to their query budget (see ``db_queries``).
+
+        class HistoryTests(QueryBudgetMixin, TestCase):
+            def test_history_within_budget(self):
+                self.client.force_login(self.user)
+                response = self.client.get(reverse("deployment_history"))
+                self.assertWithinQueryBudget(response)
+
+    Only the query count is checked; database time depends on the machine.
+    """
+
+    def assertWithinQueryBudget(self, response, budget=None):
+        """Fails when the request of ``response`` ran more queries than ``budget``.
+
+        ``budget`` defaults to the one configured for the view.
+        """
+        request = getattr(response, "wsgi_request", None) or response.asgi_request
+        queries = request.db_queries
+        view = metrics.view_label(request)
+        if budget is None:
+            budget = db_queries.budget(view)
+        if queries.count > budget:
+            statements = "\n".join(
+                f"{number}. {sql}"
+                for number, (sql, _) in enumerate(queries.statements, start=1)
+            )
+            self.fail(
+                f"{view} ran {queries.count} queries, over its budget of "
+                f"{budget}:\n{statements}"
+            )
+
+
+class FakeExplainer:
+    """Local stand-in for yaml-explainer's ``/explain-stream``.
+
+    Answers every POST with ``status`` and, for a 200, sends each of
+    ``chunks`` as its own HTTP chunk. ``abort`` drops the connection instead
+    of ending the body, as yaml-explainer does when the model fails midway.
+    While the block runs, ``BACKEND_URLS`` points yaml-explainer at it:
+
+        with FakeExplainer(["Runs nginx", streaming.STREAM_END]) as explainer:
+            events = list(streaming.explanation_events(payload, user))
+        self.assertEqual(len(explainer.requests), 1)
+    """
+
+    def __init__(self, chunks=(), status=200, abort=False):
+        self.chunks = list(chunks)
+        self.status = status
+        self.abort = abort
+        self.requests = []
+
+    def handler(self):
+        explainer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                explainer.requests.append(json.loads(body or b"{}"))
+                self.send_response(explainer.status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                chunks = explainer.chunks if explainer.status == 200 else ["error"]
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+                if explainer.abort:
+                    self.close_connection = True
+                    return
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler())
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        url = f"http://127.0.0.1:{self.server.server_port}"
+        self.settings = override_settings(
+            BACKEND_URLS={**settings.BACKEND_URLS, backends.YAML_EXPLAINER: url}
+        )
+        self.settings.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.settings.disable()
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,3 +1,1195 @@
-from django.test import TestCase
+import marshal
+import re
+import threading
+import time
+import zlib
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import requests
+import yaml
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from . import (
+    backends,
+    deletions,
+    error_explanations,
+    explanation_cache,
+    generation_cache,
+    jobs,
+    listing_cache,
+    model_catalogue,
+    overview,
+    page_cache,
+    profiling,
+    streaming,
+    tracing,
+)
+from .manifests import iter_documents
+from .models import (
+    DeploymentHistory,
+    Explanation,
+    ExplanationClaim,
+    Job,
+    ManifestBlob,
+    RequestProfile,
+)
+from .operations import run_apply
+from .pagination import decode_cursor, encode_cursor, keyset_page
+from .testing import FakeExplainer, QueryBudgetMixin, TestCase, TransactionTestCase
+
+MODELS = [{"id": "model-a", "name": "Model A", "free": True}]
+
+MANIFEST = """apiVersion: v1
+kind: Namespace
+metadata:
+  name: team-a
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: settings
+  namespace: team-a
+data:
+  mode: fast
+"""
+
+
+def backend_response(status_code=200, json=None, text=""):
+    response = mock.Mock(status_code=status_code, text=text, headers={})
+    response.json.return_value = json
+    return response
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """The views listed in QUERY_BUDGETS stay within their budget."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("alice", password="secret")
+        self.client.force_login(self.user)
+        patcher = mock.patch("app.model_catalogue._fetch_models", return_value=MODELS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_history_does_not_query_per_row(self):
+        owners = [self.user] + [
+            User.objects.create_user(f"user-{i}", password="secret") for i in range(5)
+        ]
+        for i in range(30):
+            blob = ManifestBlob.objects.store(
+                f"kind: Namespace\nmetadata:\n  name: ns-{i}\n"
+            )
+            DeploymentHistory.objects.create(
+                resource_type="Namespace",
+                resource_name=f"ns-{i}",
+                manifest=blob,
+                user=owners[i % len(owners)],
+            )
+
+        response = self.client.get(reverse("deployment_history"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+
+    @override_settings(BACKGROUND_JOBS=True)
+    def test_explain_queues_a_job_within_budget(self):
+        response = self.client.post(
+            reverse("explain_yaml"),
+            {"yaml_generated": MANIFEST, "selected_model": "model-a"},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertWithinQueryBudget(response)
+
+    @override_settings(BACKGROUND_JOBS=True)
+    def test_apply_queues_a_job_within_budget(self):
+        response = self.client.post(reverse("apply_yaml"), {"yaml_generated": MANIFEST})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertWithinQueryBudget(response)
+
+    @override_settings(BACKGROUND_JOBS=False)
+    @mock.patch("app.backends.post", return_value=backend_response())
+    def test_inline_apply_within_budget(self, post):
+        response = self.client.post(reverse("apply_yaml"), {"yaml_generated": MANIFEST})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(DeploymentHistory.objects.count(), 2)
+        self.assertWithinQueryBudget(response)
+
+    def test_metrics_within_budget(self):
+        self.client.logout()
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+
+
+class KeysetPageTests(TestCase):
+    def setUp(self):
+        blob = ManifestBlob.objects.store("kind: Namespace\n")
+        now = timezone.now()
+        # Pairs of rows share a timestamp, so the id has to break the tie
+        for i in range(7):
+            item = DeploymentHistory.objects.create(
+                resource_type="Namespace", resource_name=f"ns-{i}", manifest=blob
+            )
+            DeploymentHistory.objects.filter(pk=item.pk).update(
+                created_at=now - timedelta(minutes=i // 2)
+            )
+        self.newest_first = list(
+            DeploymentHistory.objects.order_by("-created_at", "-id")
+        )
+
+    def names(self, page):
+        return [item.resource_name for item in page.items]
+
+    def expected(self, start, stop):
+        return [item.resource_name for item in self.newest_first[start:stop]]
+
+    def test_after_walks_every_row_once(self):
+        queryset = DeploymentHistory.objects.all()
+        first = keyset_page(queryset, 3)
+        second = keyset_page(queryset, 3, after=first.next_cursor)
+        third = keyset_page(queryset, 3, after=second.next_cursor)
+
+        self.assertEqual(self.names(first), self.expected(0, 3))
+        self.assertIsNone(first.previous_cursor)
+        self.assertEqual(self.names(second), self.expected(3, 6))
+        self.assertEqual(self.names(third), self.expected(6, 7))
+        self.assertIsNone(third.next_cursor)
+
+    def test_before_returns_to_the_previous_page(self):
+        queryset = DeploymentHistory.objects.all()
+        first = keyset_page(queryset, 3)
+        second = keyset_page(queryset, 3, after=first.next_cursor)
+        third = keyset_page(queryset, 3, after=second.next_cursor)
+
+        back = keyset_page(queryset, 3, before=third.previous_cursor)
+        self.assertEqual(self.names(back), self.names(second))
+        self.assertEqual(back.next_cursor, second.next_cursor)
+
+        start = keyset_page(queryset, 3, before=back.previous_cursor)
+        self.assertEqual(self.names(start), self.names(first))
+        self.assertIsNone(start.previous_cursor)
+
+    def test_cursor_round_trip(self):
+        item = self.newest_first[0]
+        self.assertEqual(decode_cursor(encode_cursor(item)), (item.created_at, item.pk))
+
+    def test_invalid_cursor_starts_from_the_newest(self):
+        page = keyset_page(DeploymentHistory.objects.all(), 3, after="not-a-cursor")
+        self.assertEqual(self.names(page), self.expected(0, 3))
+
+
+class ManifestBlobMigrationTests(TransactionTestCase):
+    """0006 moves each history row's YAML into a deduplicated blob and back."""
+
+    before = [("app", "0005_manifestblob")]
+    after = [("app", "0006_move_yaml_content_to_blobs")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_rows_point_at_shared_blobs(self):
+        apps = self.migrate(self.before)
+        History = apps.get_model("app", "DeploymentHistory")
+        shared = "kind: Namespace\nmetadata:\n  name: shared\n"
+        other = "kind: ConfigMap\nmetadata:\n  name: other\n"
+        for name, text in [("a", shared), ("b", shared), ("c", other)]:
+            History.objects.create(
+                resource_type="Namespace", resource_name=name, yaml_content=text
+            )
+
+        apps = self.migrate(self.after)
+        History = apps.get_model("app", "DeploymentHistory")
+        ManifestBlob = apps.get_model("app", "ManifestBlob")
+
+        self.assertEqual(ManifestBlob.objects.count(), 2)
+        rows = {row.resource_name: row for row in History.objects.all()}
+        self.assertEqual(rows["a"].manifest_id, rows["b"].manifest_id)
+        for name, text in [("a", shared), ("c", other)]:
+            blob = rows[name].manifest
+            self.assertEqual(zlib.decompress(blob.data).decode(), text)
+            self.assertEqual(blob.size, len(text.encode()))
+
+    def test_reverse_restores_yaml_content(self):
+        apps = self.migrate(self.before)
+        History = apps.get_model("app", "DeploymentHistory")
+        text = "kind: Namespace\nmetadata:\n  name: café\n"
+        History.objects.create(
+            resource_type="Namespace", resource_name="a", yaml_content=text
+        )
+        self.migrate(self.after)
+        History.objects.update(yaml_content="")
+
+        apps = self.migrate(self.before)
+        History = apps.get_model("app", "DeploymentHistory")
+        self.assertEqual(History.objects.get().yaml_content, text)
+
+
+class IterDocumentsTests(TestCase):
+    def test_yields_each_document_with_its_source(self):
+        text = "---\nkind: Namespace\n---\n---\nkind: Role\nrules: []\n...\n"
+
+        documents = list(iter_documents(text))
+
+        self.assertEqual(
+            [data for _, data in documents],
+            [{"kind": "Namespace"}, {"kind": "Role", "rules": []}],
+        )
+        for source, data in documents:
+            self.assertEqual(yaml.safe_load(source), data)
+
+    def test_invalid_yaml_raises(self):
+        with self.assertRaises(yaml.YAMLError):
+            list(iter_documents("kind: Namespace\n---\nkind: [unclosed\n"))
+
+
+class RunApplyTests(TestCase):
+    """Every document is applied in order and only applied ones reach the history."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("alice", password="secret")
+        self.deployed = []
+
+    def fake_post(self, service, path, **kwargs):
+        if service == backends.YAML_EXPLAINER:
+            return backend_response(json={"explanation": "Create the namespace first."})
+        source = kwargs["data"].decode()
+        self.deployed.append(yaml.safe_load(source)["kind"])
+        if "kind: ConfigMap" in source:
+            return backend_response(422, text='namespaces "team-a" not found')
+        return backend_response()
+
+    def apply(self, text):
+        with mock.patch("app.backends.post", side_effect=self.fake_post):
+            return run_apply({"yaml": text, "model": "model-a"}, self.user)
+
+    def test_records_only_applied_documents(self):
+        text = (
+            MANIFEST + "---\napiVersion: v1\nkind: Secret\nmetadata:\n  name: token\n"
+        )
+
+        result = self.apply(text)
+
+        self.assertIsNone(result["error"])
+        self.assertEqual(self.deployed, ["Namespace", "ConfigMap", "Secret"])
+        self.assertEqual(
+            [(r["kind"], r["name"], r["ok"]) for r in result["results"]],
+            [
+                ("Namespace", "team-a", True),
+                ("ConfigMap", "settings", False),
+                ("Secret", "token", True),
+            ],
+        )
+        self.assertIn('namespaces "team-a" not found', result["results"][1]["detail"])
+        self.assertIn("Create the namespace first.", result["results"][1]["detail"])
+
+        history = DeploymentHistory.objects.order_by("id")
+        self.assertEqual(
+            [(row.resource_type, row.resource_name, row.user) for row in history],
+            [("Namespace", "team-a", self.user), ("Secret", "token", self.user)],
+        )
+        self.assertTrue(
+            history[0].yaml_content.startswith("apiVersion: v1\nkind: Namespace")
+        )
+        self.assertNotIn("ConfigMap", history[0].yaml_content)
+
+    def test_identical_documents_share_a_blob(self):
+        document = "apiVersion: v1\nkind: Namespace\nmetadata:\n  name: same\n"
+
+        self.apply(document + "---\n" + document)
+        self.apply(document)
+
+        self.assertEqual(DeploymentHistory.objects.count(), 3)
+        self.assertEqual(ManifestBlob.objects.count(), 1)
+
+    def test_invalid_or_empty_yaml_applies_nothing(self):
+        for text in ["kind: [unclosed\n", "---\n---\n"]:
+            result = self.apply(text)
+            self.assertEqual(result["results"], [])
+            self.assertTrue(result["error"].startswith("❌"))
+        self.assertEqual(self.deployed, [])
+        self.assertFalse(DeploymentHistory.objects.exists())
+
+
+def failing_handler(payload, user):
+    raise RuntimeError("kube-manager is down")
+
+
+class JobQueueTests(TestCase):
+    def test_a_job_is_claimed_once(self):
+        job = Job.objects.create(kind="apply")
+
+        self.assertTrue(jobs.claim(job.pk))
+        self.assertFalse(jobs.claim(job.pk))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.heartbeat_at)
+
+    def test_claim_next_takes_the_oldest_queued_job(self):
+        older = Job.objects.create(kind="apply")
+        newer = Job.objects.create(kind="explain")
+        Job.objects.filter(pk=older.pk).update(
+            created_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertEqual(jobs.claim_next(), older)
+        self.assertEqual(jobs.claim_next(), newer)
+        self.assertIsNone(jobs.claim_next())
+
+    @override_settings(JOB_TIMEOUT=60, JOB_MAX_ATTEMPTS=2)
+    def test_requeue_stale_only_takes_jobs_without_heartbeat(self):
+        now = timezone.now()
+        long_ago = now - timedelta(minutes=10)
+        beating = Job.objects.create(
+            kind="apply",
+            status=Job.RUNNING,
+            attempts=1,
+            started_at=long_ago,
+            heartbeat_at=now,
+        )
+        abandoned = Job.objects.create(
+            kind="apply",
+            status=Job.RUNNING,
+            attempts=1,
+            started_at=long_ago,
+            heartbeat_at=long_ago,
+        )
+        exhausted = Job.objects.create(
+            kind="apply",
+            status=Job.RUNNING,
+            attempts=2,
+            started_at=long_ago,
+            heartbeat_at=long_ago,
+        )
+
+        jobs.requeue_stale()
+
+        for job in (beating, abandoned, exhausted):
+            job.refresh_from_db()
+        self.assertEqual(beating.status, Job.RUNNING)
+        self.assertEqual(abandoned.status, Job.QUEUED)
+        self.assertIsNone(abandoned.heartbeat_at)
+        self.assertEqual(exhausted.status, Job.FAILED)
+        self.assertEqual(exhausted.error, "Job timed out.")
+
+    @override_settings(BACKGROUND_JOBS=False)
+    def test_a_failing_handler_fails_the_job(self):
+        with mock.patch.dict(jobs.HANDLERS, {"apply": "app.tests.failing_handler"}):
+            job = jobs.enqueue("apply", {"yaml": ""})
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.error, "kube-manager is down")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_unknown_kinds_are_refused(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue("delete", {})
+        self.assertFalse(Job.objects.exists())
+
+
+class ListingCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.names = ["web-1", "web-2"]
+        self.user = User.objects.create_user("alice", password="secret")
+        self.client.force_login(self.user)
+
+    def listing_response(self, *args, **kwargs):
+        return backend_response(
+            json=[{"name": name, "namespace": "default"} for name in self.names]
+        )
+
+    def patch_backend(self):
+        """Patches the sync and async kube-manager calls; returns the sync mock."""
+        get = mock.patch("app.backends.get", side_effect=self.listing_response)
+        aget = mock.patch(
+            "app.backends.aget",
+            new=mock.AsyncMock(side_effect=self.listing_response),
+        )
+        aget.start()
+        self.addCleanup(aget.stop)
+        started = get.start()
+        self.addCleanup(get.stop)
+        return started
+
+    def test_invalidate_drops_only_that_kind(self):
+        get = self.patch_backend()
+
+        listing_cache.get_listing("Pod", namespace="default")
+        listing_cache.get_listing("Pod", namespace="default")
+        listing_cache.get_listing("Service", namespace="default")
+        self.assertEqual(get.call_count, 2)
+
+        self.names = ["web-3"]
+        listing_cache.invalidate("Pod")
+        pods = listing_cache.get_listing("Pod", namespace="default")
+        listing_cache.get_listing("Service", namespace="default")
+
+        self.assertEqual(pods.names, [{"name": "web-3", "namespace": "default"}])
+        self.assertEqual(get.call_count, 3)
+
+    def test_unchanged_listing_answers_304(self):
+        self.patch_backend()
+        url = reverse("explore_resources") + "?resource=Pod"
+
+        # The ETag covers the CSRF cookie, which the first visit sets
+        self.client.get(url)
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertContains(first, "web-2")
+
+        repeat = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(repeat.status_code, 304)
+
+        # Refetched but identical: still the same page for the browser
+        listing_cache.invalidate("Pod")
+        refetched = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(refetched.status_code, 304)
+
+        self.names = ["web-3"]
+        listing_cache.invalidate("Pod")
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+        self.assertContains(changed, "web-3")
+
+
+class PageCacheTests(TestCase):
+    url = reverse("configure_namespace")
+
+    def setUp(self):
+        cache.clear()
+
+    def visitor(self, username):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(User.objects.create_user(username, password="secret"))
+        return client
+
+    def csrf_token(self, response):
+        match = re.search(
+            rb'name="csrfmiddlewaretoken" value="([^"]+)"', response.content
+        )
+        self.assertIsNotNone(match)
+        return match.group(1).decode()
+
+    def test_cached_page_carries_each_visitors_token(self):
+        alice, bob = self.visitor("alice"), self.visitor("bob")
+        before = page_cache.stats()
+
+        first = alice.get(self.url)
+        second = bob.get(self.url)
+
+        after = page_cache.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        for response in (first, second):
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, page_cache.CSRF_PLACEHOLDER)
+
+        # Each token is accepted for its own session only
+        bob_token = self.csrf_token(second)
+        self.assertNotEqual(self.csrf_token(first), bob_token)
+        self.assertNotEqual(
+            bob.post(self.url, {"csrfmiddlewaretoken": bob_token}).status_code, 403
+        )
+        self.assertEqual(
+            alice.post(self.url, {"csrfmiddlewaretoken": bob_token}).status_code, 403
+        )
+
+    def test_query_string_bypasses_the_cache(self):
+        alice = self.visitor("alice")
+        before = page_cache.stats()
+
+        alice.get(self.url + "?name=team-a")
+        alice.get(self.url + "?name=team-a")
+
+        after = page_cache.stats()
+        self.assertEqual(after["hits"], before["hits"])
+        self.assertEqual(after["misses"], before["misses"])
+
+    def test_lookups_are_exported_as_counters(self):
+        def exported(result):
+            labels = {"cache": "page", "result": result}
+            return (
+                REGISTRY.get_sample_value("kube_web_cache_lookups_total", labels) or 0
+            )
+
+        alice = self.visitor("alice")
+        hits, misses = exported("hits"), exported("misses")
+
+        alice.get(self.url)
+        alice.get(self.url)
+
+        self.assertEqual(exported("misses") - misses, 1)
+        self.assertEqual(exported("hits") - hits, 1)
+
+
+class ModelCatalogueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch(
+            "app.model_catalogue._fetch_models", return_value=list(MODELS)
+        )
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def counted(self, before):
+        after = model_catalogue.stats()
+        return {name: after[name] - before[name] for name in after}
+
+    def make_stale(self):
+        entry = cache.get(model_catalogue.CACHE_KEY)
+        entry["fetched_at"] -= settings.MODEL_CATALOGUE_TTL + 1
+        cache.set(model_catalogue.CACHE_KEY, entry)
+
+    def wait_for_refresh(self):
+        deadline = time.monotonic() + 5
+        while cache.get(model_catalogue.REFRESH_LOCK_KEY):
+            self.assertLess(time.monotonic(), deadline, "refresh never finished")
+            time.sleep(0.01)
+
+    def test_miss_then_fresh_hit(self):
+        before = model_catalogue.stats()
+
+        self.assertEqual(model_catalogue.get_models(), MODELS)
+        self.assertEqual(model_catalogue.get_models(), MODELS)
+
+        self.assertEqual(self.fetch.call_count, 1)
+        counted = self.counted(before)
+        self.assertEqual((counted["misses"], counted["hits"]), (1, 1))
+
+    def test_stale_entry_is_served_while_it_refreshes(self):
+        model_catalogue.get_models()
+        self.make_stale()
+        newer = MODELS + [{"id": "model-b", "name": "Model B", "free": False}]
+        self.fetch.return_value = newer
+        before = model_catalogue.stats()
+
+        self.assertEqual(model_catalogue.get_models(), MODELS)
+        self.wait_for_refresh()
+
+        self.assertEqual(model_catalogue.get_models(), newer)
+        counted = self.counted(before)
+        self.assertEqual((counted["stale_hits"], counted["hits"]), (1, 1))
+
+    def test_one_background_refresh_at_a_time(self):
+        model_catalogue.get_models()
+        self.make_stale()
+        release = threading.Event()
+        self.fetch.side_effect = lambda: release.wait(5) and MODELS
+
+        for _ in range(5):
+            model_catalogue.get_models()
+        release.set()
+        self.wait_for_refresh()
+
+        # The first call filled the cache, the stale reads refreshed it once
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_failure_is_remembered_but_not_counted_as_hit(self):
+        self.fetch.return_value = None
+        before = model_catalogue.stats()
+
+        self.assertEqual(model_catalogue.get_models(), [])
+        self.assertEqual(model_catalogue.get_models(), [])
+
+        self.assertEqual(self.fetch.call_count, 1)
+        counted = self.counted(before)
+        self.assertEqual(counted["misses"], 1)
+        self.assertEqual(counted["hits"], 0)
+        self.assertEqual(counted["refresh_errors"], 2)
+
+
+class ExplanationStreamTests(TestCase):
+    """Both SSE paths, against a chunked stand-in for yaml-explainer."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("alice", password="secret")
+        patcher = mock.patch("app.model_catalogue._fetch_models", return_value=MODELS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sync_events(self, payload):
+        return list(streaming.explanation_events(payload, self.user))
+
+    def async_events(self, payload):
+        async def collect():
+            return [
+                event
+                async for event in streaming.aexplanation_events(payload, self.user)
+            ]
+
+        return async_to_sync(collect)()
+
+    def payload(self, run):
+        return {
+            "yaml": f"kind: Namespace\nmetadata:\n  name: {run.__name__}\n",
+            "model": "model-a",
+            "refresh": False,
+        }
+
+    def parse(self, events):
+        parsed = []
+        for event in events:
+            lines = event.strip("\n").split("\n")
+            name = lines[0][len("event: ") :] if lines[0].startswith("event:") else None
+            data = "\n".join(
+                line[len("data: ") :] for line in lines if line.startswith("data:")
+            )
+            parsed.append((name, data))
+        return parsed
+
+    def test_cached_explanation_is_replayed_without_the_backend(self):
+        for run in (self.sync_events, self.async_events):
+            with self.subTest(run.__name__):
+                payload = self.payload(run)
+                explanation_cache.store(payload["yaml"], payload["model"], "Stored")
+
+                with FakeExplainer(["Fresh", streaming.STREAM_END]) as explainer:
+                    events = self.parse(run(payload))
+
+                self.assertEqual(events, [("cached", "Stored"), ("done", "")])
+                self.assertEqual(explainer.requests, [])
+
+    def test_complete_stream_is_relayed_and_stored(self):
+        chunks = ["Creates the ", "team-a\nnamespace.", streaming.STREAM_END]
+        for run in (self.sync_events, self.async_events):
+            with self.subTest(run.__name__):
+                payload = self.payload(run)
+
+                with FakeExplainer(chunks) as explainer:
+                    events = self.parse(run(payload))
+
+                text = "".join(data for name, data in events if name is None)
+                self.assertEqual(text, "Creates the team-a\nnamespace.")
+                self.assertEqual(events[-1], ("done", ""))
+                self.assertEqual(
+                    explainer.requests, [{"yaml": payload["yaml"], "model": "model-a"}]
+                )
+                self.assertEqual(
+                    explanation_cache.lookup(payload["yaml"], payload["model"]), text
+                )
+
+    def test_stream_without_end_marker_is_not_stored(self):
+        for run in (self.sync_events, self.async_events):
+            with self.subTest(run.__name__):
+                payload = self.payload(run)
+
+                with FakeExplainer(["Creates the "]):
+                    events = self.parse(run(payload))
+
+                self.assertEqual(events[-1], ("error", streaming.INCOMPLETE))
+                self.assertIsNone(
+                    explanation_cache.lookup(payload["yaml"], payload["model"])
+                )
+
+    def test_aborted_stream_is_not_stored(self):
+        for run in (self.sync_events, self.async_events):
+            with self.subTest(run.__name__):
+                payload = self.payload(run)
+
+                with FakeExplainer(["Creates the "], abort=True):
+                    events = self.parse(run(payload))
+
+                self.assertEqual(events[-1][0], "error")
+                self.assertIsNone(
+                    explanation_cache.lookup(payload["yaml"], payload["model"])
+                )
+
+    def test_error_status_yields_an_error_event(self):
+        for run in (self.sync_events, self.async_events):
+            with self.subTest(run.__name__):
+                payload = self.payload(run)
+
+                with FakeExplainer(status=429) as explainer:
+                    events = self.parse(run(payload))
+
+                self.assertEqual(events, [("error", streaming.explanation_error(429))])
+                self.assertEqual(len(explainer.requests), 1)
+                self.assertIsNone(
+                    explanation_cache.lookup(payload["yaml"], payload["model"])
+                )
+
+
+@override_settings(EXPLANATION_CACHE_TTL=3600, EXPLANATION_CACHE_MAX_ENTRIES=3)
+class ExplanationEvictionTests(TestCase):
+    def add(self, name, age):
+        return Explanation.objects.create(
+            digest=name,
+            model="model-a",
+            text=f"About {name}",
+            last_used_at=timezone.now() - timedelta(seconds=age),
+        )
+
+    def surviving(self):
+        return set(Explanation.objects.values_list("digest", flat=True))
+
+    def test_expired_entries_are_removed(self):
+        self.add("fresh", 60)
+        self.add("expired", 3601)
+
+        explanation_cache.evict()
+
+        self.assertEqual(self.surviving(), {"fresh"})
+        self.assertIsNone(explanation_cache.lookup_digest("expired", "model-a"))
+
+    def test_only_the_most_recently_used_entries_survive_the_cap(self):
+        for age in range(5):
+            self.add(f"age-{age}", age * 60)
+
+        explanation_cache.evict()
+
+        self.assertEqual(self.surviving(), {"age-0", "age-1", "age-2"})
+
+    def test_storing_evicts_and_keeps_the_new_entry(self):
+        for age in range(1, 4):
+            self.add(f"age-{age}", age * 60)
+
+        explanation_cache.store_digest("new", "model-a", "About new")
+
+        self.assertEqual(self.surviving(), {"new", "age-1", "age-2"})
+
+
+class ErrorSignatureTests(TestCase):
+    def assertSameSignature(self, first, second):
+        self.assertEqual(
+            error_explanations.signature(first), error_explanations.signature(second)
+        )
+
+    def assertDistinctSignature(self, first, second):
+        self.assertNotEqual(
+            error_explanations.signature(first), error_explanations.signature(second)
+        )
+
+    def test_object_names_uids_and_times_collapse(self):
+        self.assertSameSignature(
+            'namespaces "team-a" not found', 'namespaces "team-b" not found'
+        )
+        self.assertSameSignature(
+            'Deployment.apps "web" is invalid: spec.replicas: Invalid value: -1',
+            'Deployment.apps "api" is invalid: spec.replicas: Invalid value: -1',
+        )
+        self.assertSameSignature(
+            'cannot create resource "deployments" in the namespace "team-a"',
+            'cannot create resource "deployments" in the namespace "team-b"',
+        )
+        self.assertSameSignature(
+            "uid 0f5a4c1e-9d7b-4a7e-8f3c-2b6d1e9a0c11 at 2024-05-01T10:00:00Z",
+            "uid 7c0e2d4b-1a3f-4b5c-9d8e-6f7a8b9c0d1e at 2024-06-12 08:30:15.5+02:00",
+        )
+        self.assertSameSignature(
+            'services \\"web\\"   already exists', 'services "api" already exists'
+        )
+
+    def test_fields_values_and_reasons_stay_distinct(self):
+        self.assertDistinctSignature(
+            'unknown field "spec.replicas"', 'unknown field "metadata.labels"'
+        )
+        self.assertDistinctSignature(
+            'Invalid value: "Always": supported values: "OnFailure"',
+            'Invalid value: "Sometimes": supported values: "OnFailure"',
+        )
+        self.assertDistinctSignature(
+            'cannot create resource "deployments" in API group "apps"',
+            'cannot create resource "secrets" in API group ""',
+        )
+        self.assertDistinctSignature(
+            'namespaces "team-a" not found', 'namespaces "team-a" already exists'
+        )
+
+
+class ErrorExplanationClaimTests(TestCase):
+    error = 'namespaces "team-a" not found'
+
+    def setUp(self):
+        self.digest = error_explanations.signature_digest(self.error)
+        patcher = mock.patch(
+            "app.backends.post",
+            return_value=backend_response(json={"explanation": "Create it first."}),
+        )
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def claim(self, age=0):
+        return ExplanationClaim.objects.create(
+            digest=self.digest,
+            model="model-a",
+            claimed_at=timezone.now() - timedelta(seconds=age),
+        )
+
+    def counted(self, before):
+        after = error_explanations.stats()
+        return after["coalesced"] - before["coalesced"]
+
+    def test_first_caller_fetches_and_releases(self):
+        explanation = error_explanations.explain(self.error, "model-a")
+
+        self.assertEqual(explanation, "Create it first.")
+        self.assertEqual(self.post.call_count, 1)
+        self.assertFalse(ExplanationClaim.objects.exists())
+        # Another object with the same error reuses it
+        self.assertEqual(
+            error_explanations.explain('namespaces "team-b" not found', "model-a"),
+            "Create it first.",
+        )
+        self.assertEqual(self.post.call_count, 1)
+
+    def test_second_caller_waits_for_the_first_answer(self):
+        claim = self.claim()
+        before = error_explanations.stats()
+
+        def first_caller_finishes(seconds):
+            explanation_cache.store_digest(self.digest, "model-a", "From the first.")
+            claim.delete()
+
+        with mock.patch(
+            "app.error_explanations.time.sleep", side_effect=first_caller_finishes
+        ):
+            explanation = error_explanations.explain(self.error, "model-a")
+
+        self.assertEqual(explanation, "From the first.")
+        self.post.assert_not_called()
+        self.assertEqual(self.counted(before), 1)
+
+    def test_released_claim_without_answer_gives_none(self):
+        claim = self.claim()
+
+        with mock.patch(
+            "app.error_explanations.time.sleep", side_effect=lambda s: claim.delete()
+        ):
+            self.assertIsNone(error_explanations.explain(self.error, "model-a"))
+        self.post.assert_not_called()
+
+    def test_stale_claim_is_taken_over(self):
+        self.claim(age=error_explanations.claim_timeout() + 1)
+        before = error_explanations.stats()
+
+        explanation = error_explanations.explain(self.error, "model-a")
+
+        self.assertEqual(explanation, "Create it first.")
+        self.assertEqual(self.post.call_count, 1)
+        self.assertEqual(self.counted(before), 0)
+        self.assertFalse(ExplanationClaim.objects.exists())
+
+
+@override_settings(OVERVIEW_WORKERS=len(overview.RESOURCE_KINDS), OVERVIEW_TIMEOUT=1)
+class OverviewTests(TestCase):
+    def listing(self, names=("web",)):
+        return listing_cache.Listing(list(names), "", 0, "etag", 0)
+
+    def patch_listing(self, side_effect):
+        patcher = mock.patch("app.listing_cache.get_listing", side_effect=side_effect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_kinds_are_listed_in_parallel(self):
+        # Passes only once every kind is being listed at the same time
+        barrier = threading.Barrier(len(overview.RESOURCE_KINDS), timeout=5)
+
+        def get_listing(kind, **options):
+            barrier.wait()
+            return self.listing()
+
+        self.patch_listing(get_listing)
+
+        summaries = overview.collect()
+
+        self.assertEqual([s.error for s in summaries], [None] * len(summaries))
+        self.assertEqual([s.count for s in summaries], [1] * len(summaries))
+
+    def test_failing_and_slow_kinds_do_not_fail_the_page(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def get_listing(kind, **options):
+            if kind == "Pod":
+                raise ConnectionError("kube-manager is down")
+            if kind == "Secret":
+                release.wait(5)
+            return self.listing()
+
+        self.patch_listing(get_listing)
+
+        started = time.monotonic()
+        summaries = {s.kind: s for s in overview.collect("team-a")}
+
+        self.assertLess(time.monotonic() - started, 3)
+        self.assertEqual(summaries["Pod"].error, "❌ kube-manager is down")
+        self.assertEqual(summaries["Secret"].error, "⏱️ Timed out")
+        self.assertIsNone(summaries["Service"].error)
+        self.assertEqual(summaries["Service"].namespace, "team-a")
+        self.assertEqual(summaries["Namespace"].namespace, "")
+
+    def test_a_stuck_page_does_not_delay_another(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def get_listing(kind, namespace="", **options):
+            if namespace == "stuck":
+                release.wait(5)
+            return self.listing()
+
+        self.patch_listing(get_listing)
+        stuck = threading.Thread(target=overview.collect, args=("stuck",))
+        stuck.start()
+        self.addCleanup(stuck.join)
+
+        summaries = overview.collect("team-a")
+
+        self.assertEqual([s.error for s in summaries], [None] * len(summaries))
+
+
+class DeletionTests(TestCase):
+    targets = [
+        ("team-a", "web"),
+        ("team-a", "gone"),
+        ("team-a", "down"),
+        ("team-a", "stuck"),
+    ]
+
+    def answer(self, name):
+        """The kube-manager answer to deleting ``name``, or what it raises."""
+        if name == "gone":
+            return backend_response(404, text='pods "gone" not found\n')
+        if name == "down":
+            raise ConnectionError("connection refused")
+        if name == "stuck":
+            raise self.timeout_error("read timed out")
+        return backend_response(200)
+
+    def assertMixedOutcomes(self, outcomes, logs):
+        self.assertEqual(
+            [(item.namespace, item.name) for item in outcomes], self.targets
+        )
+        self.assertEqual([item.ok for item in outcomes], [True, False, False, False])
+        self.assertEqual(outcomes[1].detail, '❌ pods "gone" not found')
+        self.assertIn("connection refused", outcomes[2].detail)
+        self.assertEqual(outcomes[3].detail, "⏱️ Timed out after 10s.")
+        self.assertEqual(len(logs.records), 3)
+
+    def test_parse_targets_drops_malformed_and_duplicates(self):
+        values = [
+            "team-a/web",
+            "team-a/web",
+            "/api",
+            "no-separator",
+            "team-a/",
+            "",
+            "team-a/web/extra",
+            "team-b/web",
+        ]
+
+        self.assertEqual(
+            deletions.parse_targets(values),
+            [("team-a", "web"), ("default", "api"), ("team-b", "web")],
+        )
+
+    @override_settings(BULK_DELETE_TIMEOUT=10)
+    def test_delete_many_reports_each_outcome(self):
+        self.timeout_error = requests.ReadTimeout
+        calls = []
+
+        def delete(service, path, params, **kwargs):
+            calls.append(kwargs)
+            return self.answer(params["name"])
+
+        with mock.patch("app.backends.delete", side_effect=delete), mock.patch(
+            "app.listing_cache.invalidate"
+        ) as invalidate, self.assertLogs("app.deletions", "WARNING") as logs:
+            outcomes = deletions.delete_many("Pod", self.targets)
+
+        self.assertMixedOutcomes(outcomes, logs)
+        invalidate.assert_called_once_with("Pod")
+        # Every delete has its own timeout and is never retried
+        for kwargs in calls:
+            self.assertEqual(kwargs["timeout"], (settings.BACKEND_TIMEOUT[0], 10))
+            self.assertIs(kwargs["retry"], False)
+
+    @override_settings(BULK_DELETE_TIMEOUT=10)
+    def test_adelete_many_reports_each_outcome(self):
+        self.timeout_error = httpx.ReadTimeout
+        calls = []
+
+        async def adelete(service, path, params, **kwargs):
+            calls.append(kwargs)
+            return self.answer(params["name"])
+
+        with mock.patch("app.backends.adelete", side_effect=adelete), mock.patch(
+            "app.listing_cache.ainvalidate"
+        ) as ainvalidate, self.assertLogs("app.deletions", "WARNING") as logs:
+            outcomes = async_to_sync(deletions.adelete_many)("Pod", self.targets)
+
+        self.assertMixedOutcomes(outcomes, logs)
+        ainvalidate.assert_called_once_with("Pod")
+        for kwargs in calls:
+            self.assertEqual(kwargs["timeout"], (settings.BACKEND_TIMEOUT[0], 10))
+
+    def post_delete(self, name):
+        """Deletes ``name`` through the view, on the sync or async backend."""
+        form = {"resource": "Pod", "name": name, "namespace": "team-a"}
+        answer = self.answer(name)
+        with mock.patch("app.backends.delete", return_value=answer), mock.patch(
+            "app.backends.adelete", new=mock.AsyncMock(return_value=answer)
+        ):
+            return self.client.post(reverse("delete_resource"), form)
+
+    def test_failed_single_delete_is_shown(self):
+        self.client.force_login(User.objects.create_user("alice", password="secret"))
+
+        with self.assertLogs("app.deletions", "WARNING"):
+            failed = self.post_delete("gone")
+        deleted = self.post_delete("web")
+
+        self.assertContains(failed, "pods &quot;gone&quot; not found")
+        self.assertRedirects(
+            deleted,
+            reverse("explore_resources") + "?resource=Pod",
+            fetch_redirect_response=False,
+        )
+
+
+class ProfilingTests(TestCase):
+    url = reverse("object_selector")
+
+    def test_superuser_request_is_profiled(self):
+        admin = User.objects.create_superuser("root", password="secret")
+        self.client.force_login(admin)
+
+        response = self.client.get(self.url, {"profile": "1"})
+
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response["X-Profile-Id"], str(profile.pk))
+        self.assertEqual(
+            (profile.method, profile.path, profile.view_name, profile.user),
+            ("GET", self.url + "?profile=1", "object_selector", admin),
+        )
+        self.assertTrue(marshal.loads(profile.stats_file))
+
+    def test_header_also_triggers_a_capture(self):
+        self.client.force_login(User.objects.create_superuser("root", password="x"))
+
+        self.client.get(self.url, HTTP_X_PROFILE="1")
+
+        self.assertEqual(RequestProfile.objects.count(), 1)
+
+    def test_other_users_are_not_profiled(self):
+        self.client.force_login(User.objects.create_user("alice", password="secret"))
+        regular = self.client.get(self.url, {"profile": "1"}, HTTP_X_PROFILE="1")
+        self.client.logout()
+        anonymous = self.client.get(reverse("login"), {"profile": "1"})
+
+        self.assertEqual(regular.status_code, 200)
+        self.assertEqual(anonymous.status_code, 200)
+        self.assertNotIn("X-Profile-Id", regular)
+        self.assertNotIn("X-Profile-Id", anonymous)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILE_MAX_ENTRIES=2)
+    def test_prune_keeps_the_newest_captures(self):
+        now = timezone.now()
+        for age in range(4):
+            profile = RequestProfile.objects.create(
+                method="GET",
+                path=f"/age-{age}/",
+                status_code=200,
+                duration_ms=1,
+                data=b"",
+                summary="",
+            )
+            # created_at is set on insert; age the rows afterwards
+            RequestProfile.objects.filter(pk=profile.pk).update(
+                created_at=now - timedelta(minutes=age)
+            )
+
+        profiling.prune()
+
+        self.assertEqual(
+            set(RequestProfile.objects.values_list("path", flat=True)),
+            {"/age-0/", "/age-1/"},
+        )
+
+
+class ConfigViewTracingTests(TestCase):
+    """Config views time their payload building in a "build payload" span."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("alice", password="secret"))
+        for target, kwargs in [
+            ("app.model_catalogue._fetch_models", {"return_value": MODELS}),
+            (
+                "app.generation_cache.generate",
+                {"return_value": generation_cache.GeneratedYAML(200, MANIFEST)},
+            ),
+            ("app.tracing.span", {"wraps": tracing.span}),
+        ]:
+            patcher = mock.patch(target, **kwargs)
+            setattr(self, target.rsplit(".", 1)[1], patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def spans(self):
+        return [call.args[0] for call in self.span.call_args_list]
+
+    def test_namespace_payload(self):
+        response = self.client.post(
+            reverse("configure_namespace"), {"namespace_name": "team-a"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("build payload", self.spans())
+        payload = self.generate.call_args.args[0]
+        self.assertEqual(payload["namespace"]["namespace_name"], "team-a")
+
+    def test_secret_payload_takes_the_form_of_its_type(self):
+        form = {
+            "secret_name": "tls",
+            "secret_type": "kubernetes.io/tls",
+            "tls-tls_crt": "CERT",
+            "tls-tls_key": "KEY",
+        }
+
+        self.client.post(reverse("configure_secret"), form)
+
+        self.assertIn("build payload", self.spans())
+        payload = self.generate.call_args.args[0]["secret"]
+        self.assertEqual(payload["data"], {"tls_crt": "CERT", "tls_key": "KEY"})
+
+    def test_invalid_secret_data_shows_the_form_again(self):
+        form = {
+            "secret_name": "tls",
+            "secret_type": "kubernetes.io/tls",
+            "tls-tls_crt": "CERT",
+        }
+
+        response = self.client.post(reverse("configure_secret"), form)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "secret_config.html")
+        self.assertNotIn("build payload", self.spans())
+        self.generate.assert_not_called()
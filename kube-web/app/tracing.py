@@ -0,0 +1,158 @@
+"""OpenTelemetry tracing of kube-web.
+
+``TRACING_EXPORTER`` picks where finished spans go: ``otlp`` sends them to
+the collector at ``OTEL_EXPORTER_OTLP_ENDPOINT`` (OTLP over HTTP) and
+``file`` appends them as JSON lines to ``TRACING_FILE``, to be read offline.
+When it is empty nothing is recorded: the spans below are no-ops and
+``middleware.TracingMiddleware`` is not installed.
+
+Backend calls send the W3C ``traceparent`` header, so the Go services can
+continue the trace, and jobs carry the context of the request that queued
+them into the ``runjobs`` workers.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+# Resolves to the configured provider once configure() has run
+tracer = trace.get_tracer("kube-web")
+
+
+def enabled():
+    return bool(settings.TRACING_EXPORTER)
+
+
+def build_exporter():
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+    if settings.TRACING_EXPORTER == "file":
+        # One line per span; every process appends to the same file
+        return ConsoleSpanExporter(
+            out=open(settings.TRACING_FILE, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    raise ImproperlyConfigured(
+        f"Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r}, "
+        "expected 'otlp' or 'file'."
+    )
+
+
+def configure():
+    """Installs the tracer provider; AppConfig.ready() calls it in each process."""
+    if not enabled():
+        return
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: "kube-web"}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(build_exporter()))
+    trace.set_tracer_provider(provider)
+
+
+def flush():
+    """Exports the buffered spans, for processes that exit without atexit hooks."""
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "force_flush"):
+        provider.force_flush()
+
+
+def span(name, attributes=None):
+    """Context manager timing ``name`` as a child of the current span."""
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def record_error(current, error):
+    current.record_exception(error)
+    current.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+def set_http_status(current, status_code, error_from=400):
+    current.set_attribute("http.response.status_code", status_code)
+    if status_code >= error_from:
+        current.set_status(Status(StatusCode.ERROR))
+
+
+def carrier():
+    """Returns the ``traceparent`` (and ``tracestate``) of the current span."""
+    headers = {}
+    propagate.inject(headers)
+    return headers
+
+
+def bind(fn):
+    """Wraps ``fn`` to run in the current context, e.g. on an executor thread."""
+    return partial(contextvars.copy_context().run, fn)
+
+
+@contextmanager
+def server_span(request):
+    """Span of one request, continuing a ``traceparent`` sent by the client.
+
+    It is named after the method only until end_request() knows the route.
+    """
+    attributes = {"http.request.method": request.method, "url.path": request.path}
+    with tracer.start_as_current_span(
+        request.method,
+        context=propagate.extract(request.headers),
+        kind=SpanKind.SERVER,
+        attributes=attributes,
+    ) as current:
+        yield current
+
+
+def end_request(current, request, response):
+    match = request.resolver_match
+    if match is not None:
+        current.update_name(f"{request.method} {match.route}")
+        current.set_attribute("http.route", match.route)
+    set_http_status(current, response.status_code, error_from=500)
+
+
+@contextmanager
+def backend_span(method, service, path, kwargs):
+    """Client span of one backend call.
+
+    Adds the span's ``traceparent`` to ``kwargs["headers"]``, the keyword
+    arguments of the HTTP call.
+    """
+    attributes = {
+        "http.request.method": method,
+        "peer.service": service,
+        "url.path": path,
+    }
+    with tracer.start_as_current_span(
+        f"{method} {service}{path}", kind=SpanKind.CLIENT, attributes=attributes
+    ) as current:
+        headers = dict(kwargs.get("headers") or {})
+        propagate.inject(headers)
+        kwargs["headers"] = headers
+        yield current
+
+
+def job_span(job):
+    """Span of a job run, a child of the span of the request that queued it."""
+    attributes = {
+        "job.id": str(job.pk),
+        "job.kind": job.kind,
+        "job.attempt": job.attempts,
+    }
+    return tracer.start_as_current_span(
+        f"job {job.kind}",
+        context=propagate.extract(job.trace_context),
+        kind=SpanKind.CONSUMER,
+        attributes=attributes,
+    )
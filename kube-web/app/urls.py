@@ -1,8 +1,15 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    from . import async_views as backend_views
+else:
+    backend_views = views
+
 
 urlpatterns = [
+    path("metrics", views.metrics_view, name="metrics"),
     path("set_language/<str:language>", views.set_language, name="set_language"),
     path("", views.redirect_to_configure, name="home"),
     path("login/", views.login_view, name="login"),
@@ -37,9 +44,20 @@ urlpatterns = [
         name="configure_network_policy",
     ),
     path("explain/", views.explain_yaml_view, name="explain_yaml"),
+    path(
+        "explain/stream/", backend_views.explain_stream_view, name="explain_stream"
+    ),
     path("apply/", views.apply_yaml, name="apply_yaml"),
-    path("explore/", views.explore_resources, name="explore_resources"),
-    path("delete-resource/", views.delete_resource, name="delete_resource"),
+    path("jobs/<uuid:pk>/", views.job_result_view, name="job_result"),
+    path("jobs/<uuid:pk>/status/", views.job_status_view, name="job_status"),
+    path("explore/", backend_views.explore_resources, name="explore_resources"),
+    path("overview/", backend_views.cluster_overview, name="cluster_overview"),
+    path("delete-resource/", backend_views.delete_resource, name="delete_resource"),
+    path(
+        "delete-resources/",
+        backend_views.bulk_delete_resources,
+        name="bulk_delete_resources",
+    ),
     path("history/", views.deployment_history_view, name="deployment_history"),
     path(
         "history/view/<int:pk>/",
@@ -1,47 +1,77 @@
+import hashlib
 import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
 from django.utils import translation
 import os
 from django.conf import settings
-import requests
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.forms import formset_factory
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404, render, redirect
-from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    QueryDict,
+)
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
-import yaml
-from .models import DeploymentHistory
+from . import (
+    deletions,
+    explanation_cache,
+    generation_cache,
+    jobs,
+    listing_cache,
+    metrics,
+    model_catalogue,
+    overview,
+    page_cache,
+    streaming,
+    tracing,
+)
+from .models import DeploymentHistory, Job
+from .pagination import keyset_page
 from .forms import (
     ConfigMapForm,
-    ConfigMapKeyForm,
+    ConfigMapKeyFormSet,
+    ContainerFormSet,
     DeploymentForm,
+    DeploymentHistoryFilterForm,
     DockerConfigJSONForm,
     HPAForm,
-    HPAMetricForm,
-    ImagePullSecretForm,
+    HPAMetricFormSet,
+    ImagePullSecretFormSet,
     IngressForm,
-    IngressPathForm,
+    IngressPathFormSet,
+    NamespaceForm,
     NetworkPolicyForm,
-    NetworkRuleForm,
-    OpaqueKeyForm,
+    NetworkRuleFormSet,
+    OpaqueKeyFormSet,
     PersistentVolumeClaimForm,
     PodTemplateForm,
-    ContainerForm,
+    ResourceListingForm,
     RoleBindingForm,
     RoleForm,
-    RuleForm,
+    RuleFormSet,
     SecretForm,
     ServiceAccountForm,
+    ServiceForm,
     ServicePortFormSet,
-    SubjectForm,
+    SubjectFormSet,
     TLSSecretForm,
-    VolumeMountForm,
-    VolumeForm,
-    NamespaceForm,
-    ServiceForm,
-    RequiredContainerFormSet,
+    VolumeFormSet,
+    VolumeMountFormSet,
+)
+
+# Runs the backend calls of the YAML result page concurrently with the
+# generator-engine request issued by the config views.
+result_executor = ThreadPoolExecutor(
+    max_workers=settings.BACKEND_POOL_MAXSIZE, thread_name_prefix="yaml-result"
 )
 
 
@@ -84,6 +114,12 @@ def register_user_view(request):
     return render(request, "register_user.html")
 
 
+def metrics_view(request):
+    """Prometheus scrape endpoint (see ``metrics``)."""
+    body, content_type = metrics.render()
+    return HttpResponse(body, content_type=content_type)
+
+
 def set_language(request, language):
     """Sets the current language in the cookie"""
 
@@ -123,14 +159,45 @@ def object_selector(request):
     return render(request, "object_selector.html", {"grafana_url": grafana_url})
 
 
-@login_required
-def deployment_config_view(request):
-    ContainerFormSet = formset_factory(
-        ContainerForm, formset=RequiredContainerFormSet, extra=1
+def render_yaml_result(request, payload):
+    """Generates the YAML for ``payload`` and renders it with the model options.
+
+    The model catalogue is fetched while generator-engine works, so the page
+    waits for the slower of both calls instead of their sum.
+    """
+    models_future = result_executor.submit(tracing.bind(model_catalogue.get_models))
+    response = generation_cache.generate(payload)
+    if response.status_code != 200:
+        return HttpResponse(
+            f"API error: {response.status_code}", status=response.status_code
+        )
+
+    models = models_future.result()
+    default_model = model_catalogue.resolve_default_model(models, request.user)
+    return render(
+        request,
+        "yaml_result.html",
+        result_context(response.text, models, default_model),
     )
-    VolumeFormSet = formset_factory(VolumeForm, extra=1)
-    VolumeMountFormSet = formset_factory(VolumeMountForm, extra=1)
 
+
+def result_context(yaml_text, models, default_model, model=None):
+    """Context of yaml_result.html, with the stored explanation when there is one."""
+    model = model or default_model
+    explanation = explanation_cache.lookup(yaml_text, model)
+    return {
+        "yaml_output": yaml_text,
+        "explanation": explanation,
+        "explanation_cached": explanation is not None,
+        "selected_model": model,
+        "models": models,
+        "default_model": default_model,
+    }
+
+
+@login_required
+@page_cache.cache_empty_page
+def deployment_config_view(request):
     if request.method == "POST":
         deployment_form = DeploymentForm(request.POST)
         pod_form = PodTemplateForm(request.POST)
@@ -147,61 +214,43 @@ def deployment_config_view(request):
                 volume_mount_formset.is_valid(),
             ]
         ):
-            deployment_data = deployment_form.cleaned_data
-            pod_data = pod_form.cleaned_data
-
-            containers_data = []
-            for idx, cform in enumerate(container_formset):
-                c = cform.cleaned_data.copy()
-
-                raw_command = c.get("command", "").strip()
-                if raw_command:
-                    try:
-                        c["command"] = shlex.split(raw_command)
-                    except ValueError as e:
+            with tracing.span("build payload"):
+                deployment_data = deployment_form.cleaned_data
+                pod_data = pod_form.cleaned_data
+
+                containers_data = []
+                for idx, cform in enumerate(container_formset):
+                    c = cform.cleaned_data.copy()
+
+                    raw_command = c.get("command", "").strip()
+                    if raw_command:
+                        try:
+                            c["command"] = shlex.split(raw_command)
+                        except ValueError as e:
+                            c["command"] = []
+                    else:
                         c["command"] = []
-                else:
-                    c["command"] = []
-                prefix = volume_mount_formset.prefix
-                names = request.POST.getlist(f"{prefix}-{idx}-volume_name")
-                paths = request.POST.getlist(f"{prefix}-{idx}-mount_path")
-                mounts = [
-                    {"volume_name": name, "mount_path": path}
-                    for name, path in zip(names, paths)
-                ]
-                c["volume_mounts"] = mounts
-                containers_data.append(c)
+                    prefix = volume_mount_formset.prefix
+                    names = request.POST.getlist(f"{prefix}-{idx}-volume_name")
+                    paths = request.POST.getlist(f"{prefix}-{idx}-mount_path")
+                    mounts = [
+                        {"volume_name": name, "mount_path": path}
+                        for name, path in zip(names, paths)
+                    ]
+                    c["volume_mounts"] = mounts
+                    containers_data.append(c)
 
-            volumes_data = [v.cleaned_data for v in volume_formset]
+                volumes_data = [v.cleaned_data for v in volume_formset]
 
-            user_input_data = {
-                "deployment": {
-                    "deployment": deployment_data,
-                    "pod_template": pod_data,
-                    "containers": containers_data,
-                    "volumes": volumes_data,
+                user_input_data = {
+                    "deployment": {
+                        "deployment": deployment_data,
+                        "pod_template": pod_data,
+                        "containers": containers_data,
+                        "volumes": volumes_data,
+                    }
                 }
-            }
-            response = requests.post(
-                "http://generator-engine/generate", json=user_input_data
-            )
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}", status=response.status_code
-                )
+            return render_yaml_result(request, user_input_data)
 
     else:
         deployment_form = DeploymentForm()
@@ -224,38 +273,21 @@ def deployment_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def service_config_view(request):
     if request.method == "POST":
         service_form = ServiceForm(request.POST)
         port_formset = ServicePortFormSet(request.POST, prefix="ports")
 
         if service_form.is_valid() and port_formset.is_valid():
-            service_data = service_form.cleaned_data
-            ports_data = [
-                form.cleaned_data for form in port_formset if form.cleaned_data
-            ]
-            service_data["ports"] = ports_data
-            user_input_data = {"service": service_data}
-            response = requests.post(
-                "http://generator-engine/generate", json=user_input_data
-            )
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}", status=response.status_code
-                )
+            with tracing.span("build payload"):
+                service_data = service_form.cleaned_data
+                ports_data = [
+                    form.cleaned_data for form in port_formset if form.cleaned_data
+                ]
+                service_data["ports"] = ports_data
+                user_input_data = {"service": service_data}
+            return render_yaml_result(request, user_input_data)
     else:
         service_form = ServiceForm()
         port_formset = ServicePortFormSet(prefix="ports")
@@ -271,31 +303,14 @@ def service_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def namespace_config_view(request):
     if request.method == "POST":
         namespace_form = NamespaceForm(request.POST)
         if namespace_form.is_valid():
-            user_input_data = {"namespace": namespace_form.cleaned_data}
-            response = requests.post(
-                "http://generator-engine/generate", json=user_input_data
-            )
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}", status=response.status_code
-                )
+            with tracing.span("build payload"):
+                user_input_data = {"namespace": namespace_form.cleaned_data}
+            return render_yaml_result(request, user_input_data)
     else:
         namespace_form = NamespaceForm()
 
@@ -303,39 +318,21 @@ def namespace_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def hpa_config_view(request):
-    HPAMetricFormSet = formset_factory(HPAMetricForm, extra=1)
     if request.method == "POST":
         hpa_form = HPAForm(request.POST)
         metric_formset = HPAMetricFormSet(request.POST, prefix="metrics")
 
         if hpa_form.is_valid() and metric_formset.is_valid():
-            metrics_data = [
-                form.cleaned_data for form in metric_formset if form.cleaned_data
-            ]
-            hpa_data = hpa_form.cleaned_data
-            hpa_data["metrics"] = metrics_data
-            user_input_data = {"hpa": hpa_data}
-            response = requests.post(
-                "http://generator-engine/generate", json=user_input_data
-            )
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}", status=response.status_code
-                )
+            with tracing.span("build payload"):
+                metrics_data = [
+                    form.cleaned_data for form in metric_formset if form.cleaned_data
+                ]
+                hpa_data = hpa_form.cleaned_data
+                hpa_data["metrics"] = metrics_data
+                user_input_data = {"hpa": hpa_data}
+            return render_yaml_result(request, user_input_data)
     else:
         hpa_form = HPAForm()
         metric_formset = HPAMetricFormSet(prefix="metrics")
@@ -351,41 +348,23 @@ def hpa_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def configmap_config_view(request):
-    ConfigMapKeyFormSet = formset_factory(ConfigMapKeyForm, extra=1)
     if request.method == "POST":
         configmap_form = ConfigMapForm(request.POST)
         configmap_key_formset = ConfigMapKeyFormSet(request.POST, prefix="properties")
 
         if configmap_form.is_valid() and configmap_key_formset.is_valid():
-            keys_data = [
-                form.cleaned_data for form in configmap_key_formset if form.cleaned_data
-            ]
-            configmap = configmap_form.cleaned_data
-            configmap["keys"] = keys_data
-            user_input_data = {"configmap": configmap}
-
-            response = requests.post(
-                "http://generator-engine/generate", json=user_input_data
-            )
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}",
-                    status=response.status_code,
-                )
+            with tracing.span("build payload"):
+                keys_data = [
+                    form.cleaned_data
+                    for form in configmap_key_formset
+                    if form.cleaned_data
+                ]
+                configmap = configmap_form.cleaned_data
+                configmap["keys"] = keys_data
+                user_input_data = {"configmap": configmap}
+            return render_yaml_result(request, user_input_data)
     else:
         configmap_form = ConfigMapForm()
         configmap_key_formset = ConfigMapKeyFormSet(prefix="properties")
@@ -401,8 +380,8 @@ def configmap_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def secret_config_view(request):
-    OpaqueKeyFormSet = formset_factory(OpaqueKeyForm, extra=1)
     if request.method == "POST":
         secret_form = SecretForm(request.POST)
         opaque_formset = OpaqueKeyFormSet(request.POST, prefix="opaque")
@@ -411,82 +390,26 @@ def secret_config_view(request):
 
         if secret_form.is_valid():
             secret_type = secret_form.cleaned_data["secret_type"]
-            data = secret_form.cleaned_data
-
-            if secret_type == "Opaque":
-                if opaque_formset.is_valid():
-                    keys_data = [
-                        form.cleaned_data
-                        for form in opaque_formset
-                        if form.cleaned_data
-                    ]
-                    data["data"] = keys_data
-                else:
-                    return render(
-                        request,
-                        "secret_config.html",
-                        {
-                            "secret_form": secret_form,
-                            "opaque_formset": opaque_formset,
-                            "tls_form": tls_form,
-                            "dockerconfigjson_form": dockerconfigjson_form,
-                        },
-                    )
-
-            elif secret_type == "kubernetes.io/tls":
-                if tls_form.is_valid():
-                    data["data"] = tls_form.cleaned_data
-                else:
-                    return render(
-                        request,
-                        "secret_config.html",
-                        {
-                            "secret_form": secret_form,
-                            "opaque_formset": opaque_formset,
-                            "tls_form": tls_form,
-                            "dockerconfigjson_form": dockerconfigjson_form,
-                        },
-                    )
-
-            elif secret_type == "kubernetes.io/dockerconfigjson":
-                if dockerconfigjson_form.is_valid():
-                    data["data"] = dockerconfigjson_form.cleaned_data
-                else:
-                    return render(
-                        request,
-                        "secret_config.html",
-                        {
-                            "secret_form": secret_form,
-                            "opaque_formset": opaque_formset,
-                            "tls_form": tls_form,
-                            "dockerconfigjson_form": dockerconfigjson_form,
-                        },
-                    )
-
-            user_input_data = {"secret": data}
-            response = requests.post(
-                "http://generator-engine/generate",
-                json=user_input_data,
-            )
-
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}",
-                    status=response.status_code,
-                )
+            # The form holding the data of the chosen type; invalid ones are
+            # shown again by the render below
+            data_form = {
+                "Opaque": opaque_formset,
+                "kubernetes.io/tls": tls_form,
+                "kubernetes.io/dockerconfigjson": dockerconfigjson_form,
+            }.get(secret_type)
+            if data_form is None or data_form.is_valid():
+                with tracing.span("build payload"):
+                    data = secret_form.cleaned_data
+                    if secret_type == "Opaque":
+                        data["data"] = [
+                            form.cleaned_data
+                            for form in opaque_formset
+                            if form.cleaned_data
+                        ]
+                    elif data_form is not None:
+                        data["data"] = data_form.cleaned_data
+                    user_input_data = {"secret": data}
+                return render_yaml_result(request, user_input_data)
 
     else:
         secret_form = SecretForm()
@@ -507,33 +430,15 @@ def secret_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def pvc_config_view(request):
     if request.method == "POST":
         pvc_form = PersistentVolumeClaimForm(request.POST)
 
         if pvc_form.is_valid():
-            user_input_data = {"pvc": pvc_form.cleaned_data}
-            response = requests.post(
-                "http://generator-engine/generate", json=user_input_data
-            )
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}",
-                    status=response.status_code,
-                )
+            with tracing.span("build payload"):
+                user_input_data = {"pvc": pvc_form.cleaned_data}
+            return render_yaml_result(request, user_input_data)
     else:
         pvc_form = PersistentVolumeClaimForm()
 
@@ -541,42 +446,21 @@ def pvc_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def ingress_config_view(request):
-    IngressPathFormSet = formset_factory(IngressPathForm, extra=1)
     if request.method == "POST":
         ingress_form = IngressForm(request.POST)
         path_formset = IngressPathFormSet(request.POST, prefix="paths")
 
         if ingress_form.is_valid() and path_formset.is_valid():
-            paths_data = [
-                form.cleaned_data for form in path_formset if form.cleaned_data
-            ]
-            ingress = ingress_form.cleaned_data
-            ingress["paths"] = paths_data
-            user_input_data = {"ingress": ingress}
-            response = requests.post(
-                "http://generator-engine/generate",
-                json=user_input_data,
-            )
-
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}",
-                    status=response.status_code,
-                )
+            with tracing.span("build payload"):
+                paths_data = [
+                    form.cleaned_data for form in path_formset if form.cleaned_data
+                ]
+                ingress = ingress_form.cleaned_data
+                ingress["paths"] = paths_data
+                user_input_data = {"ingress": ingress}
+            return render_yaml_result(request, user_input_data)
     else:
         ingress_form = IngressForm()
         path_formset = IngressPathFormSet(prefix="paths")
@@ -589,9 +473,8 @@ def ingress_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def service_account_config_view(request):
-    ImagePullSecretFormSet = formset_factory(ImagePullSecretForm, extra=1)
-
     if request.method == "POST":
         serviceaccount_form = ServiceAccountForm(request.POST)
         imagepullsecret_formset = ImagePullSecretFormSet(
@@ -599,37 +482,16 @@ def service_account_config_view(request):
         )
 
         if serviceaccount_form.is_valid() and imagepullsecret_formset.is_valid():
-            imagepullsecrets = [
-                form.cleaned_data["secret_name"]
-                for form in imagepullsecret_formset
-                if form.cleaned_data
-            ]
-            serviceaccount = serviceaccount_form.cleaned_data
-            serviceaccount["imagePullSecrets"] = imagepullsecrets
-            user_input_data = {"serviceaccount": serviceaccount}
-            response = requests.post(
-                "http://generator-engine/generate",
-                json=user_input_data,
-            )
-
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}",
-                    status=response.status_code,
-                )
+            with tracing.span("build payload"):
+                imagepullsecrets = [
+                    form.cleaned_data["secret_name"]
+                    for form in imagepullsecret_formset
+                    if form.cleaned_data
+                ]
+                serviceaccount = serviceaccount_form.cleaned_data
+                serviceaccount["imagePullSecrets"] = imagepullsecrets
+                user_input_data = {"serviceaccount": serviceaccount}
+            return render_yaml_result(request, user_input_data)
     else:
         serviceaccount_form = ServiceAccountForm()
         imagepullsecret_formset = ImagePullSecretFormSet(prefix="imagepullsecrets")
@@ -644,10 +506,8 @@ def service_account_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def rbac_config_view(request):
-    RuleFormSet = formset_factory(RuleForm, extra=1)
-    SubjectFormSet = formset_factory(SubjectForm, extra=1)
-
     if request.method == "POST":
         role_form = RoleForm(request.POST)
         rule_formset = RuleFormSet(request.POST, prefix="rules")
@@ -660,73 +520,57 @@ def rbac_config_view(request):
             and rolebinding_form.is_valid()
             and subject_formset.is_valid()
         ):
-            role_data = role_form.cleaned_data
-            rules = [
-                {
-                    "apiGroups": [
-                        g.strip()
-                        for g in f.cleaned_data["api_groups"].split(",")
-                        if g.strip()
-                    ],
-                    "resources": [
-                        r.strip()
-                        for r in f.cleaned_data["resources"].split(",")
-                        if r.strip()
-                    ],
-                    "verbs": [
-                        v.strip()
-                        for v in f.cleaned_data["verbs"].split(",")
-                        if v.strip()
-                    ],
-                }
-                for f in rule_formset
-                if f.cleaned_data
-            ]
+            with tracing.span("build payload"):
+                role_data = role_form.cleaned_data
+                rules = [
+                    {
+                        "apiGroups": [
+                            g.strip()
+                            for g in f.cleaned_data["api_groups"].split(",")
+                            if g.strip()
+                        ],
+                        "resources": [
+                            r.strip()
+                            for r in f.cleaned_data["resources"].split(",")
+                            if r.strip()
+                        ],
+                        "verbs": [
+                            v.strip()
+                            for v in f.cleaned_data["verbs"].split(",")
+                            if v.strip()
+                        ],
+                    }
+                    for f in rule_formset
+                    if f.cleaned_data
+                ]
 
-            binding_data = rolebinding_form.cleaned_data
-            subjects = []
-            for f in subject_formset:
-                if f.cleaned_data:
-                    subject = {
-                        "kind": f.cleaned_data["kind"],
-                        "name": f.cleaned_data["name"],
+                binding_data = rolebinding_form.cleaned_data
+                subjects = []
+                for f in subject_formset:
+                    if f.cleaned_data:
+                        subject = {
+                            "kind": f.cleaned_data["kind"],
+                            "name": f.cleaned_data["name"],
+                        }
+                        if f.cleaned_data["kind"] == "ServiceAccount":
+                            subject["namespace"] = f.cleaned_data.get("namespace", "")
+                        subjects.append(subject)
+
+                payload = {
+                    "role": {
+                        "type": role_data["role_type"],
+                        "name": role_data["role_name"],
+                        "namespace": role_data.get("namespace", ""),
+                        "rules": rules,
+                        "binding": {
+                            "name": binding_data["binding_name"],
+                            "namespace": binding_data.get("namespace", ""),
+                            "subjects": subjects,
+                        },
                     }
-                    if f.cleaned_data["kind"] == "ServiceAccount":
-                        subject["namespace"] = f.cleaned_data.get("namespace", "")
-                    subjects.append(subject)
-
-            payload = {
-                "role": {
-                    "type": role_data["role_type"],
-                    "name": role_data["role_name"],
-                    "namespace": role_data.get("namespace", ""),
-                    "rules": rules,
-                    "binding": {
-                        "name": binding_data["binding_name"],
-                        "namespace": binding_data.get("namespace", ""),
-                        "subjects": subjects,
-                    },
                 }
-            }
-
-            response = requests.post("http://generator-engine/generate", json=payload)
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}", status=response.status_code
-                )
+
+            return render_yaml_result(request, payload)
     else:
         role_form = RoleForm()
         rule_formset = RuleFormSet(prefix="rules")
@@ -746,72 +590,56 @@ def rbac_config_view(request):
 
 
 @login_required
+@page_cache.cache_empty_page
 def networkpolicy_config_view(request):
-    NetworkRuleFormSet = formset_factory(NetworkRuleForm, extra=1)
-
     if request.method == "POST":
         networkpolicy_form = NetworkPolicyForm(request.POST)
         rule_formset = NetworkRuleFormSet(request.POST, prefix="rules")
 
         if networkpolicy_form.is_valid() and rule_formset.is_valid():
-            rules = []
-            for f in rule_formset:
-                if not f.cleaned_data:
-                    continue
-                rule = {
-                    "direction": f.cleaned_data["direction"],
-                    "ports": [],
-                    "selectors": {},
-                }
-
-                ports_str = f.cleaned_data.get("ports", "")
-                if ports_str:
-                    rule["ports"] = [
-                        int(p.strip())
-                        for p in ports_str.split(",")
-                        if p.strip().isdigit()
-                    ]
-
-                if f.cleaned_data.get("pod_selector"):
-                    rule["selectors"]["podSelector"] = f.cleaned_data["pod_selector"]
-                if f.cleaned_data.get("namespace_selector"):
-                    rule["selectors"]["namespaceSelector"] = f.cleaned_data[
-                        "namespace_selector"
-                    ]
-                if f.cleaned_data.get("ip_block"):
-                    rule["selectors"]["ipBlock"] = {
-                        "cidr": f.cleaned_data["ip_block"],
-                        "except": [
-                            e.strip()
-                            for e in f.cleaned_data.get("except_ips", "").split(",")
-                            if e.strip()
-                        ],
+            with tracing.span("build payload"):
+                rules = []
+                for f in rule_formset:
+                    if not f.cleaned_data:
+                        continue
+                    rule = {
+                        "direction": f.cleaned_data["direction"],
+                        "ports": [],
+                        "selectors": {},
                     }
 
-                rules.append(rule)
-
-            network_policy_data = networkpolicy_form.cleaned_data
-            network_policy_data["rules"] = rules
-            payload = {"networkPolicy": network_policy_data}
-            response = requests.post("http://generator-engine/generate", json=payload)
-
-            if response.status_code == 200:
-                yaml_output = response.text
-                models, default_model = get_model_options(request.user)
-                return render(
-                    request,
-                    "yaml_result.html",
-                    {
-                        "yaml_output": yaml_output,
-                        "explanation": None,
-                        "models": models,
-                        "default_model": default_model,
-                    },
-                )
-            else:
-                return HttpResponse(
-                    f"API error: {response.status_code}", status=response.status_code
-                )
+                    ports_str = f.cleaned_data.get("ports", "")
+                    if ports_str:
+                        rule["ports"] = [
+                            int(p.strip())
+                            for p in ports_str.split(",")
+                            if p.strip().isdigit()
+                        ]
+
+                    if f.cleaned_data.get("pod_selector"):
+                        rule["selectors"]["podSelector"] = f.cleaned_data[
+                            "pod_selector"
+                        ]
+                    if f.cleaned_data.get("namespace_selector"):
+                        rule["selectors"]["namespaceSelector"] = f.cleaned_data[
+                            "namespace_selector"
+                        ]
+                    if f.cleaned_data.get("ip_block"):
+                        rule["selectors"]["ipBlock"] = {
+                            "cidr": f.cleaned_data["ip_block"],
+                            "except": [
+                                e.strip()
+                                for e in f.cleaned_data.get("except_ips", "").split(",")
+                                if e.strip()
+                            ],
+                        }
+
+                    rules.append(rule)
+
+                network_policy_data = networkpolicy_form.cleaned_data
+                network_policy_data["rules"] = rules
+                payload = {"networkPolicy": network_policy_data}
+            return render_yaml_result(request, payload)
     else:
         networkpolicy_form = NetworkPolicyForm()
         rule_formset = NetworkRuleFormSet(prefix="rules")
@@ -829,109 +657,51 @@ def networkpolicy_config_view(request):
 @login_required
 def explain_yaml_view(request):
     if request.method == "POST":
-        yaml_output = request.POST.get("yaml_generated", "")
-        selected_model = request.POST.get("selected_model", "")
-
-        payload = {"yaml": yaml_output, "model": selected_model}
+        payload = streaming.explain_payload(request)
+        if not payload["refresh"]:
+            models, default_model = get_model_options(request.user)
+            context = result_context(
+                payload["yaml"], models, default_model, payload["model"]
+            )
+            if context["explanation"] is not None:
+                return render(request, "yaml_result.html", context)
+        job = jobs.enqueue("explain", payload, request.user)
+        return redirect("job_result", pk=job.pk)
+    else:
+        return redirect("configure_deployment")
 
-        explanation_response = requests.post(
-            "http://yaml-explainer:8080/explain", json=payload
-        )
 
-        models, _ = get_model_options(request.user)
-        model_ids = {str(m["id"]) for m in models}
+@login_required
+def explain_stream_view(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Only POST is allowed")
+    return streaming.stream_response(
+        streaming.explanation_events(streaming.explain_payload(request), request.user)
+    )
 
-        if explanation_response.status_code == 200:
-            explanation = explanation_response.json().get(
-                "explanation", "No explanation available."
-            )
-            if selected_model in model_ids:
-                profile = request.user.profile
-                profile.default_model = selected_model
-                profile.save()
-        elif explanation_response.status_code == 429:
-            explanation = "⚠️ Model is currently unavailable. Please try again later."
-        elif explanation_response.status_code == 402:
-            explanation = (
-                "💳 Insufficient credits. "
-                "You can add more at <a href='https://openrouter.ai/settings/credits' target='_blank'>OpenRouter</a> "
-                "or use a free model."
-            )
-        else:
-            explanation = (
-                f"❌ Error retrieving explanation: {explanation_response.status_code}"
-            )
 
-        models, default_model = get_model_options(request.user)
-        return render(
+def report_apply_results(request, results):
+    failed = sum(1 for result in results if not result["ok"])
+    if not results:
+        return
+    if not failed:
+        messages.success(request, "✅ YAML successfully deployed to Kubernetes.")
+    else:
+        messages.error(
             request,
-            "yaml_result.html",
-            {
-                "yaml_output": yaml_output,
-                "explanation": explanation,
-                "models": models,
-                "selected_model": selected_model,
-                "default_model": default_model,
-            },
+            f"❌ {failed} of {len(results)} resources could not be deployed.",
         )
-    else:
-        return redirect("configure_deployment")
 
 
 @login_required
 def apply_yaml(request):
     models, default_model = get_model_options(request.user)
+    yaml_text = request.POST.get("yaml_generated", "")
     if request.method == "POST":
-        yaml_text = request.POST.get("yaml_generated", "")
-        try:
-            response = requests.post(
-                "http://kube-manager:8080/deploy",
-                data=yaml_text.encode("utf-8"),
-                headers={"Content-Type": "application/x-yaml"},
-                timeout=10,
-            )
-            if response.status_code == 200:
-                messages.success(
-                    request, "✅ YAML successfully deployed to Kubernetes."
-                )
-                try:
-                    parsed_yaml = yaml.safe_load(yaml_text)
-                    resource_type = parsed_yaml.get("kind", "unknown")
-                    resource_name = parsed_yaml.get("metadata", {}).get(
-                        "name", "unknown"
-                    )
-
-                    DeploymentHistory.objects.create(
-                        resource_type=resource_type,
-                        resource_name=resource_name,
-                        yaml_content=yaml_text,
-                        user=request.user,
-                    )
-                except Exception as e:
-                    print(f"⚠️ Failed to save deployment history: {e}")
-            else:
-                explanation = None
-                try:
-                    explain_response = requests.post(
-                        "http://yaml-explainer:8080/explain-error",
-                        json={
-                            "error": response.text,
-                            "model": default_model,
-                        },
-                        timeout=10,
-                    )
-                    if explain_response.status_code == 200:
-                        explanation_data = explain_response.json()
-                        explanation = explanation_data.get("explanation", None)
-                except Exception as e:
-                    print(f"⚠️ Failed to fetch error explanation: {e}")
-
-                error_msg = f"❌ Failed to apply YAML: {response.text}"
-                if explanation:
-                    error_msg += f"\n🧠 {explanation}"
-                messages.error(request, error_msg)
-        except Exception as e:
-            messages.error(request, f"❌ Failed to connect to backend: {e}")
+        job = jobs.enqueue(
+            "apply", {"yaml": yaml_text, "model": default_model}, request.user
+        )
+        return redirect("job_result", pk=job.pk)
     return render(
         request,
         "yaml_result.html",
@@ -944,31 +714,146 @@ def apply_yaml(request):
     )
 
 
+def get_user_job(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    if job.user_id != request.user.id and not request.user.is_superuser:
+        raise Http404("No job found.")
+    return job
+
+
+@login_required
+def job_result_view(request, pk):
+    job = get_user_job(request, pk)
+    models, default_model = get_model_options(request.user)
+    context = {
+        "yaml_output": job.payload.get("yaml", ""),
+        "explanation": None,
+        "models": models,
+        "default_model": default_model,
+        "job": job,
+    }
+    if job.kind == "explain":
+        context["selected_model"] = job.payload.get("model", "")
+
+    if job.status == Job.FAILED:
+        messages.error(request, f"❌ {job.kind.capitalize()} failed: {job.error}")
+    elif job.status == Job.SUCCEEDED and job.kind == "apply":
+        if job.result.get("error"):
+            messages.error(request, job.result["error"])
+        context["apply_results"] = job.result["results"]
+        report_apply_results(request, job.result["results"])
+    elif job.status == Job.SUCCEEDED and job.kind == "explain":
+        context["explanation"] = job.result["explanation"]
+        context["explanation_cached"] = job.result.get("cached", False)
+
+    return render(request, "yaml_result.html", context)
+
+
+@login_required
+def job_status_view(request, pk):
+    job = get_user_job(request, pk)
+    return JsonResponse({"status": job.status, "finished": job.is_finished})
+
+
 @login_required
 def explore_resources(request):
     resource = request.GET.get("resource")
     if not resource:
         return HttpResponseBadRequest("Missing 'resource' parameter.")
 
+    filter_form, options = listing_options(request)
     try:
-        response = requests.get(
-            "http://kube-manager:8080/list", params={"resource": resource}
-        )
-        response.raise_for_status()
-        names = response.json()
+        listing = listing_cache.get_listing(resource, **options)
     except Exception as e:
-        return render(
+        return render_listing_error(request, resource, filter_form, e)
+
+    return render_listing(request, resource, filter_form, listing, request.user)
+
+
+def listing_options(request):
+    """Reads the namespace, name prefix, page size and continue token of /explore/."""
+    filter_form = ResourceListingForm(request.GET)
+    options = filter_form.list_options(settings.EXPLORE_PAGE_SIZE)
+    options["continue_token"] = request.GET.get("continue", "")
+    return filter_form, options
+
+
+def listing_filters(request):
+    """Query string of the current listing filters, without the continue token."""
+    filters = request.GET.copy()
+    filters.pop("continue", None)
+    return filters.urlencode()
+
+
+def render_listing_error(request, resource, filter_form, error):
+    return render(
+        request,
+        "explore.html",
+        {
+            "resource": resource,
+            "filter_form": filter_form,
+            "filters": listing_filters(request),
+            "error": f"Error querying resources: {str(error)}",
+            "names": [],
+        },
+    )
+
+
+def render_listing(request, resource, filter_form, listing, user):
+    """Renders a resource listing, or answers 304 if the browser has it already.
+
+    The ETag also covers the user, language and CSRF cookie, which change the
+    rendered page without changing the listing.
+    """
+    raw = "|".join(
+        [
+            listing.etag,
+            str(user.pk),
+            translation.get_language() or "",
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        ]
+    )
+    etag = quote_etag(hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32])
+    response = get_conditional_response(
+        request, etag=etag, last_modified=listing.last_modified
+    )
+    if response is None:
+        response = render(
             request,
             "explore.html",
             {
                 "resource": resource,
-                "error": f"Error querying resources: {str(e)}",
-                "names": [],
+                "names": listing.names,
+                "remaining": listing.remaining,
+                "next_continue": listing.continue_token,
+                "filter_form": filter_form,
+                "filters": listing_filters(request),
+                "error": None,
             },
         )
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(listing.last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+def cluster_overview(request):
+    namespace = request.GET.get("namespace", "")
+    started = time.monotonic()
+    summaries = overview.collect(namespace)
+    return render_overview(request, namespace, summaries, started)
 
+
+def render_overview(request, namespace, summaries, started):
     return render(
-        request, "explore.html", {"resource": resource, "names": names, "error": None}
+        request,
+        "overview.html",
+        {
+            "namespace": namespace,
+            "summaries": summaries,
+            "elapsed": time.monotonic() - started,
+        },
     )
 
 
@@ -982,40 +867,87 @@ def delete_resource(request):
     name = request.POST.get("name")
     namespace = request.POST.get("namespace", "default")
 
-    try:
-        requests.delete(
-            "http://kube-manager:8080/resource",
-            params={
-                "type": resource,
-                "name": name,
-                "namespace": namespace,
-            },
-        )
-    except Exception as e:
-        print(f"Error deleting: {e}")
+    item = deletions.delete_one(resource, namespace, name)
+    listing_cache.invalidate(resource)
+    if not item.ok:
+        return render_delete_results(request, resource, [item])
+
+    return redirect(explore_url(request, resource))
+
+
+@login_required
+def bulk_delete_resources(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Only POST is allowed")
+
+    resource = request.POST.get("resource")
+    targets = deletions.parse_targets(request.POST.getlist("targets"))
+    if not resource or not targets:
+        return redirect(explore_url(request, resource or ""))
+    outcomes = deletions.delete_many(resource, targets)
+    return render_delete_results(request, resource, outcomes)
 
-    return redirect(f"/explore/?resource={resource}")
+
+def render_delete_results(request, resource, outcomes):
+    return render(
+        request,
+        "delete_results.html",
+        {
+            "resource": resource,
+            "outcomes": outcomes,
+            "failed": sum(1 for item in outcomes if not item.ok),
+            "back_url": explore_url(request, resource),
+        },
+    )
+
+
+def explore_url(request, resource):
+    """The explore page to go back to after a delete, keeping its filters."""
+    filters = QueryDict(request.POST.get("filters", ""), mutable=True)
+    filters["resource"] = resource
+    return f"{reverse('explore_resources')}?{filters.urlencode()}"
 
 
 @login_required
 def deployment_history_view(request):
-    history = DeploymentHistory.objects.order_by("-created_at")
-    return render(request, "history.html", {"history": history})
+    filter_form = DeploymentHistoryFilterForm(request.GET)
+    history = DeploymentHistory.objects.select_related("user")
+    if filter_form.is_valid():
+        history = filter_form.filter(history)
+
+    page = keyset_page(
+        history,
+        settings.HISTORY_PAGE_SIZE,
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
+
+    filters = request.GET.copy()
+    filters.pop("after", None)
+    filters.pop("before", None)
+    return render(
+        request,
+        "history.html",
+        {
+            "history": page.items,
+            "filter_form": filter_form,
+            "filters": filters.urlencode(),
+            "next_cursor": page.next_cursor,
+            "previous_cursor": page.previous_cursor,
+        },
+    )
 
 
 @login_required
 def view_deployment_yaml(request, pk):
-    history_item = get_object_or_404(DeploymentHistory, pk=pk)
+    history_item = get_object_or_404(
+        DeploymentHistory.objects.select_related("manifest"), pk=pk
+    )
     models, default_model = get_model_options(request.user)
     return render(
         request,
         "yaml_result.html",
-        {
-            "yaml_output": history_item.yaml_content,
-            "explanation": None,
-            "models": models,
-            "default_model": default_model,
-        },
+        result_context(history_item.yaml_content, models, default_model),
     )
 
 
@@ -1025,22 +957,5 @@ def redirect_to_configure(request):
 
 
 def get_model_options(user=None):
-    try:
-        response = requests.get("http://yaml-explainer:8080/models", timeout=5)
-        if response.status_code == 200:
-            models = response.json()
-            default_model = None
-
-            if user and user.is_authenticated:
-                profile = getattr(user, "profile", None)
-                if profile and profile.default_model:
-                    if any(str(m["id"]) == str(profile.default_model) for m in models):
-                        default_model = profile.default_model
-
-            if not default_model:
-                default_model = next((m["id"] for m in models if m.get("free")), None)
-
-            return models, default_model
-    except Exception:
-        pass
-    return [], None
+    models = model_catalogue.get_models()
+    return models, model_catalogue.resolve_default_model(models, user)
@@ -1,346 +1,81 @@
+from functools import lru_cache
+
 from django import forms
+from django.forms.renderers import get_default_renderer
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 
 
-class HelpButtonTextInput(forms.TextInput):
-    def __init__(self, *args, help_text=None, **kwargs):
-        self.help_text = help_text
-        super().__init__(*args, **kwargs)
-
-    def render(self, name, value, attrs=None, renderer=None):
-        input_html = super().render(name, value, attrs, renderer)
-        if self.help_text:
-            help_id = f"{name}_help"
-            button_id = f"{name}_toggle"
-
-            help_button = f"""
-                <button
-                    type="button"
-                    id="{button_id}"
-                    aria-expanded="false"
-                    aria-controls="{help_id}"
-                    onclick="toggleHelp('{help_id}', '{button_id}')"
-                    class="help-icon-button"
-                >
-                    ❔
-                    <span class="visually-hidden">Mostrar ayuda para {name}</span>
-                </button>
-            """
-
-            help_box = f"""
-                <div id="{help_id}" role="tooltip" class="help-tooltip" style="display: none; margin: 0;">
-                    {self.help_text}
-                </div>
-            """
-
-            script = """
-                <script>
-                    function toggleHelp(helpId, buttonId) {
-                        const help = document.getElementById(helpId);
-                        const button = document.getElementById(buttonId);
-                        const isVisible = help.style.display === 'inline-block';
-                        help.style.display = isVisible ? 'none' : 'inline-block';
-                        button.setAttribute('aria-expanded', !isVisible);
-                    }
-                </script>
-            """
-
-            return mark_safe(
-                f"""
-                <span class="help-wrapper" style="display: inline-flex; align-items: center; gap: 0.5rem;">
-                    {input_html}
-                    {help_button}
-                    {help_box}
-                </span>
-                {script}
-            """
-            )
-        return input_html
-
-
-class HelpButtonCheckboxSelectMultiple(forms.CheckboxSelectMultiple):
-    def __init__(self, *args, help_text=None, **kwargs):
-        self.help_text = help_text
-        super().__init__(*args, **kwargs)
-
-    def render(self, name, value, attrs=None, renderer=None):
-        checkboxes_html = super().render(name, value, attrs, renderer)
-        if self.help_text:
-            help_id = f"{name}_help"
-            button_id = f"{name}_toggle"
-
-            help_button = f"""
-                <button
-                    type="button"
-                    id="{button_id}"
-                    aria-expanded="false"
-                    aria-controls="{help_id}"
-                    onclick="toggleHelp('{help_id}', '{button_id}')"
-                    class="help-icon-button"
-                >
-                    ❔
-                    <span class="visually-hidden">Show help for {name}</span>
-                </button>
-            """
-
-            help_box = f"""
-                <div id="{help_id}" role="tooltip" class="help-tooltip" style="display: none; margin: 0;">
-                    {self.help_text}
-                </div>
-            """
-
-            script = """
-                <script>
-                    function toggleHelp(helpId, buttonId) {
-                        const help = document.getElementById(helpId);
-                        const button = document.getElementById(buttonId);
-                        const isVisible = help.style.display === 'inline-block';
-                        help.style.display = isVisible ? 'none' : 'inline-block';
-                        button.setAttribute('aria-expanded', !isVisible);
-                    }
-                </script>
-            """
-
-            return mark_safe(
-                f"""
-                <div class="help-wrapper" style="display: inline-flex; align-items: flex-start; gap: 0.5rem;">
-                    <div>{checkboxes_html}</div>
-                    {help_button}
-                    {help_box}
-                </div>
-                {script}
-            """
-            )
-        return checkboxes_html
+@lru_cache(maxsize=2048)
+def render_help_button(renderer, template_name, name, text, language):
+    """Renders the ❔ button and tooltip of field ``name``.
 
+    The markup only depends on the field name, the help text and the active
+    language, so it is rendered once per combination; ``language`` is part of
+    the key for the translated button label.
+    """
+    context = {"name": name, "text": text, "id": f"{name}_help"}
+    context["button_id"] = f"{name}_toggle"
+    return mark_safe(renderer.render(template_name, context))
 
-class HelpButtonSelect(forms.Select):
-    def __init__(self, *args, help_text=None, **kwargs):
-        self.help_text = help_text
-        super().__init__(*args, **kwargs)
-
-    def render(self, name, value, attrs=None, renderer=None):
-        select_html = super().render(name, value, attrs, renderer)
-        if self.help_text:
-            help_id = f"{name}_help"
-            button_id = f"{name}_toggle"
-
-            help_button = f"""
-                <button
-                    type="button"
-                    id="{button_id}"
-                    aria-expanded="false"
-                    aria-controls="{help_id}"
-                    onclick="toggleHelp('{help_id}', '{button_id}')"
-                    class="help-icon-button"
-                    style="margin-left: 0.5rem;"
-                >
-                    ❔
-                    <span class="visually-hidden">Show help for {name}</span>
-                </button>
-            """
 
-            help_box = f"""
-                <div id="{help_id}" role="tooltip" class="help-tooltip"
-                     style="display: none; margin-left: 0.5rem;">
-                    {self.help_text}
-                </div>
-            """
+class HelpButtonMixin:
+    """Renders the widget next to a ❔ button that toggles its ``help_text``.
 
-            script = """
-                <script>
-                    function toggleHelp(helpId, buttonId) {
-                        const help = document.getElementById(helpId);
-                        const button = document.getElementById(buttonId);
-                        const isVisible = help.style.display === 'inline-block';
-                        help.style.display = isVisible ? 'none' : 'inline-block';
-                        button.setAttribute('aria-expanded', !isVisible);
-                    }
-                </script>
-            """
+    The button markup comes from ``widgets/help_button.html``; ``toggleHelp``
+    lives in ``static/js/help.js``, included once by each configuration page.
+    """
 
-            return mark_safe(
-                f"""
-                <span class="help-wrapper" style="display: inline-flex; align-items: center;">
-                    {select_html}
-                    {help_button}
-                    {help_box}
-                </span>
-                {script}
-            """
-            )
-        return select_html
+    help_template_name = "widgets/help_button.html"
+    # Wrapper element and the extra class aligning the widget with its button
+    help_wrapper = "span"
+    help_wrapper_class = ""
 
-
-class HelpButtonCheckboxInput(forms.CheckboxInput):
     def __init__(self, *args, help_text=None, **kwargs):
         self.help_text = help_text
         super().__init__(*args, **kwargs)
 
     def render(self, name, value, attrs=None, renderer=None):
-        checkbox_html = super().render(name, value, attrs, renderer)
-        if self.help_text:
-            help_id = f"{name}_help"
-            button_id = f"{name}_toggle"
+        widget_html = super().render(name, value, attrs, renderer)
+        if not self.help_text:
+            return widget_html
+        help_html = render_help_button(
+            renderer or get_default_renderer(),
+            self.help_template_name,
+            name,
+            str(self.help_text),
+            get_language(),
+        )
+        return format_html(
+            '<{0} class="help-wrapper{1}">{2}{3}</{0}>',
+            self.help_wrapper,
+            self.help_wrapper_class,
+            widget_html,
+            help_html,
+        )
 
-            help_button = f"""
-                <button
-                    type="button"
-                    id="{button_id}"
-                    aria-expanded="false"
-                    aria-controls="{help_id}"
-                    onclick="toggleHelp('{help_id}', '{button_id}')"
-                    class="help-icon-button"
-                    style="margin-left: 0.5rem;"
-                >
-                    ❔
-                    <span class="visually-hidden">Show help for {name}</span>
-                </button>
-            """
 
-            help_box = f"""
-                <div id="{help_id}" role="tooltip" class="help-tooltip"
-                     style="display: none; margin-left: 0.5rem;">
-                    {self.help_text}
-                </div>
-            """
+class HelpButtonTextInput(HelpButtonMixin, forms.TextInput):
+    pass
 
-            script = """
-                <script>
-                    function toggleHelp(helpId, buttonId) {
-                        const help = document.getElementById(helpId);
-                        const button = document.getElementById(buttonId);
-                        const isVisible = help.style.display === 'inline-block';
-                        help.style.display = isVisible ? 'none' : 'inline-block';
-                        button.setAttribute('aria-expanded', !isVisible);
-                    }
-                </script>
-            """
 
-            return mark_safe(
-                f"""
-                <span class="help-wrapper" style="display: inline-flex; align-items: center;">
-                    {checkbox_html}
-                    {help_button}
-                    {help_box}
-                </span>
-                {script}
-            """
-            )
-        return checkbox_html
+class HelpButtonCheckboxSelectMultiple(HelpButtonMixin, forms.CheckboxSelectMultiple):
+    help_wrapper = "div"
+    help_wrapper_class = " help-wrapper-top"
 
 
-class HelpButtonTextarea(forms.Textarea):
-    def __init__(self, *args, help_text=None, **kwargs):
-        self.help_text = help_text
-        super().__init__(*args, **kwargs)
+class HelpButtonSelect(HelpButtonMixin, forms.Select):
+    pass
 
-    def render(self, name, value, attrs=None, renderer=None):
-        textarea_html = super().render(name, value, attrs, renderer)
-        if self.help_text:
-            help_id = f"{name}_help"
-            button_id = f"{name}_toggle"
 
-            help_button = f"""
-                <button
-                    type="button"
-                    id="{button_id}"
-                    aria-expanded="false"
-                    aria-controls="{help_id}"
-                    onclick="toggleHelp('{help_id}', '{button_id}')"
-                    class="help-icon-button"
-                    style="margin-left: 0.5rem;"
-                >
-                    ❔
-                    <span class="visually-hidden">Show help for {name}</span>
-                </button>
-            """
-
-            help_box = f"""
-                <div id="{help_id}" role="tooltip" class="help-tooltip"
-                     style="display: none; margin-left: 0.5rem;">
-                    {self.help_text}
-                </div>
-            """
-
-            script = """
-                <script>
-                    function toggleHelp(helpId, buttonId) {
-                        const help = document.getElementById(helpId);
-                        const button = document.getElementById(buttonId);
-                        const isVisible = help.style.display === 'inline-block';
-                        help.style.display = isVisible ? 'none' : 'inline-block';
-                        button.setAttribute('aria-expanded', !isVisible);
-                    }
-                </script>
-            """
-
-            return mark_safe(
-                f"""
-                <span class="help-wrapper" style="display: inline-flex; align-items: flex-start;">
-                    {textarea_html}
-                    {help_button}
-                    {help_box}
-                </span>
-                {script}
-            """
-            )
-        return textarea_html
-
-
-class HelpButtonNumberInput(forms.NumberInput):
-    def __init__(self, *args, help_text=None, **kwargs):
-        self.help_text = help_text
-        super().__init__(*args, **kwargs)
-
-    def render(self, name, value, attrs=None, renderer=None):
-        input_html = super().render(name, value, attrs, renderer)
-        if self.help_text:
-            help_id = f"{name}_help"
-            button_id = f"{name}_toggle"
+class HelpButtonCheckboxInput(HelpButtonMixin, forms.CheckboxInput):
+    pass
 
-            help_button = f"""
-                <button
-                    type="button"
-                    id="{button_id}"
-                    aria-expanded="false"
-                    aria-controls="{help_id}"
-                    onclick="toggleHelp('{help_id}', '{button_id}')"
-                    class="help-icon-button"
-                    style="margin-left: 0.5rem;"
-                >
-                    ❔
-                    <span class="visually-hidden">Show help for {name}</span>
-                </button>
-            """
 
-            help_box = f"""
-                <div id="{help_id}" role="tooltip" class="help-tooltip"
-                     style="display: none; margin-left: 0.5rem;">
-                    {self.help_text}
-                </div>
-            """
+class HelpButtonTextarea(HelpButtonMixin, forms.Textarea):
+    help_wrapper_class = " help-wrapper-top"
 
-            script = """
-                <script>
-                    function toggleHelp(helpId, buttonId) {
-                        const help = document.getElementById(helpId);
-                        const button = document.getElementById(buttonId);
-                        const isVisible = help.style.display === 'inline-block';
-                        help.style.display = isVisible ? 'none' : 'inline-block';
-                        button.setAttribute('aria-expanded', !isVisible);
-                    }
-                </script>
-            """
 
-            return mark_safe(
-                f"""
-                <span class="help-wrapper" style="display: inline-flex; align-items: center;">
-                    {input_html}
-                    {help_button}
-                    {help_box}
-                </span>
-                {script}
-            """
-            )
-        return input_html
+class HelpButtonNumberInput(HelpButtonMixin, forms.NumberInput):
+    pass
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Measures how many concurrent backend-bound requests kube-web can serve
+under sync (WSGI) workers versus async (ASGI/Uvicorn) workers.
+
+A local stand-in for kube-manager answers /list after a fixed delay, so
+every request to /explore/ spends its time waiting on the backend.
+
+    python benchmarks/concurrency.py --requests 64 --delay 1 --workers 2
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+KUBE_WEB_DIR = Path(__file__).resolve().parent.parent
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument("--requests", type=int, default=64, help="Concurrent requests")
+parser.add_argument("--delay", type=float, default=1.0, help="Backend delay (s)")
+parser.add_argument("--workers", type=int, default=2, help="Gunicorn workers")
+parser.add_argument("--port", type=int, default=8765, help="kube-web port")
+parser.add_argument("--backend-port", type=int, default=8766, help="Stub port")
+
+
+def start_stub_backend(port, delay):
+    """Starts a fake kube-manager whose /list answers after ``delay`` seconds."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = b'[{"name": "demo", "namespace": "default"}]'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_kube_web(args, asgi):
+    env = dict(
+        os.environ,
+        KUBE_MANAGER_URL=f"http://127.0.0.1:{args.backend_port}",
+        ASYNC_VIEWS="true" if asgi else "false",
+    )
+    command = [
+        "gunicorn",
+        "--bind",
+        f"127.0.0.1:{args.port}",
+        "--workers",
+        str(args.workers),
+        "--timeout",
+        "120",
+    ]
+    if asgi:
+        command += ["--worker-class", "uvicorn_worker.UvicornWorker"]
+        command += ["kube-web.asgi:application"]
+    else:
+        command += ["kube-web.wsgi:application"]
+    process = subprocess.Popen(
+        command, cwd=KUBE_WEB_DIR, env=env, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{base_url}/login/", timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.terminate()
+    sys.exit("❌ kube-web did not start")
+
+
+def login(base_url):
+    session = requests.Session()
+    session.get(f"{base_url}/login/")
+    session.post(
+        f"{base_url}/login/",
+        data={
+            "username": "admin",
+            "password": "admin",
+            "csrfmiddlewaretoken": session.cookies["csrftoken"],
+        },
+    )
+    return session.cookies.get_dict()
+
+
+def run(args, asgi):
+    process, base_url = start_kube_web(args, asgi)
+    try:
+        cookies = login(base_url)
+
+        def fetch(_):
+            response = requests.get(
+                f"{base_url}/explore/",
+                params={"resource": "Pod"},
+                cookies=cookies,
+                timeout=300,
+            )
+            return response.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.requests) as pool:
+            statuses = list(pool.map(fetch, range(args.requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+
+    ok = sum(1 for s in statuses if s == 200)
+    return ok, elapsed
+
+
+def main():
+    args = parser.parse_args()
+    subprocess.run(
+        [sys.executable, "manage.py", "migrate", "--verbosity", "0"],
+        cwd=KUBE_WEB_DIR,
+        check=True,
+    )
+    subprocess.run(
+        [sys.executable, "create_superuser.py"],
+        cwd=KUBE_WEB_DIR,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    stub = start_stub_backend(args.backend_port, args.delay)
+
+    print(
+        f"{args.requests} concurrent /explore/ requests, backend delay "
+        f"{args.delay}s, {args.workers} workers"
+    )
+    print(f"{'mode':<6} {'ok':>4} {'elapsed (s)':>12} {'req/s':>8}")
+    for mode, asgi in (("wsgi", False), ("asgi", True)):
+        ok, elapsed = run(args, asgi)
+        print(f"{mode:<6} {ok:>4} {elapsed:>12.2f} {ok / elapsed:>8.2f}")
+
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measures the HTML size and server-side render time of the configuration
+pages, rendered in-process with Django's test client.
+
+    python benchmarks/page_weight.py --repeat 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+KUBE_WEB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KUBE_WEB_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kube-web.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+PAGES = ("configure_deployment", "configure_network_policy")
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument("--repeat", type=int, default=200, help="Renders per page")
+parser.add_argument(
+    "--page", action="append", help="URL name to measure (repeatable)"
+)
+
+
+def main():
+    args = parser.parse_args()
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    call_command("migrate", verbosity=0)
+    user, _ = get_user_model().objects.get_or_create(username="admin")
+
+    client = Client()
+    client.force_login(user)
+
+    print(f"{args.repeat} renders per page")
+    print(f"{'page':<26} {'bytes':>8} {'scripts':>8} {'mean (ms)':>10} {'p95 (ms)':>9}")
+    for name in args.page or PAGES:
+        url = reverse(name)
+        body = client.get(url).content
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(
+            f"{name:<26} {len(body):>8} {body.count(b'<script'):>8} "
+            f"{statistics.mean(timings):>10.2f} {p95:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# Loaded by Gunicorn from the working directory.
+import os
+import subprocess
+import sys
+
+
+def child_exit(server, worker):
+    # Drops the live gauges (requests in flight) of a worker that exited
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def on_starting(server):
+    # The job workers run next to Gunicorn and are stopped by it, so they get
+    # the container's SIGTERM and finish their current job before exiting
+    if os.environ.get("RUN_JOB_WORKERS", "").lower() in ("1", "true", "yes"):
+        server.job_runner = subprocess.Popen(
+            [sys.executable, "manage.py", "runjobs"]
+        )
+
+
+def on_exit(server):
+    job_runner = getattr(server, "job_runner", None)
+    if job_runner is not None:
+        job_runner.terminate()
+        job_runner.wait()
@@ -24,9 +24,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = "django-insecure-z=p(41yn1$+fw#*hwi*@82ji)tsxc-vxt)yr85&@%_x=yi!yu%"
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DEBUG", "true").lower() in ("1", "true", "yes")
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
 
 
 # Application definition
@@ -43,6 +45,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "app.middleware.RequestMetricsMiddleware",
+    "app.middleware.TracingMiddleware",
+    "app.middleware.QueryMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -50,6 +55,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "app.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "kube-web.urls"
@@ -65,6 +71,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "app.page_cache.csrf_placeholder",
             ],
         },
     },
@@ -72,6 +79,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "kube-web.wsgi.application"
 
+# Serve the backend-bound views (explain, apply, explore, delete) as async
+# views. Only worth enabling when running under an ASGI server.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "false").lower() in ("1", "true", "yes")
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -145,6 +156,173 @@ STATICFILES_DIRS = [
 # Si usas whitenoise para servir estáticos en producción, agrégalo:
 INSTALLED_APPS += ["whitenoise.runserver_nostatic"]
 
+# collectstatic writes content-hashed copies of every asset plus gzip and
+# Brotli variants; WhiteNoise serves the hashed names with a one-year
+# immutable Cache-Control. The hashed names need a collectstatic manifest,
+# so development links the files under their own names (tests do the same,
+# see app.testing.TestCase).
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
+
 MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")
 
 LOGIN_URL = "/login/"
+
+# Backend services (generator-engine, kube-manager, yaml-explainer)
+BACKEND_URLS = {
+    "generator-engine": os.environ.get(
+        "GENERATOR_ENGINE_URL", "http://generator-engine"
+    ),
+    "kube-manager": os.environ.get("KUBE_MANAGER_URL", "http://kube-manager:8080"),
+    "yaml-explainer": os.environ.get(
+        "YAML_EXPLAINER_URL", "http://yaml-explainer:8080"
+    ),
+}
+# (connect, read) timeout in seconds applied to every backend call
+BACKEND_TIMEOUT = (
+    float(os.environ.get("BACKEND_CONNECT_TIMEOUT", "3")),
+    float(os.environ.get("BACKEND_READ_TIMEOUT", "10")),
+)
+# LLM explanations take much longer than the rest of the backend calls
+EXPLAIN_TIMEOUT = (
+    BACKEND_TIMEOUT[0],
+    float(os.environ.get("EXPLAIN_READ_TIMEOUT", "120")),
+)
+BACKEND_POOL_CONNECTIONS = int(os.environ.get("BACKEND_POOL_CONNECTIONS", "4"))
+BACKEND_POOL_MAXSIZE = int(os.environ.get("BACKEND_POOL_MAXSIZE", "10"))
+BACKEND_RETRIES = int(os.environ.get("BACKEND_RETRIES", "2"))
+BACKEND_RETRY_BACKOFF = float(os.environ.get("BACKEND_RETRY_BACKOFF", "0.3"))
+
+# Generated YAML cache backend: "locmem", "file" or "redis"
+GENERATION_CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+GENERATION_CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "generation",
+    "file": os.path.join(BASE_DIR, "cache", "generation"),
+    "redis": "redis://localhost:6379/0",
+}
+GENERATION_CACHE_BACKEND = os.environ.get("GENERATION_CACHE_BACKEND", "locmem")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "generation": {
+        "BACKEND": GENERATION_CACHE_BACKENDS[GENERATION_CACHE_BACKEND],
+        "LOCATION": os.environ.get(
+            "GENERATION_CACHE_LOCATION",
+            GENERATION_CACHE_DEFAULT_LOCATIONS[GENERATION_CACHE_BACKEND],
+        ),
+        "TIMEOUT": int(os.environ.get("GENERATION_CACHE_TTL", "86400")),
+        "KEY_PREFIX": "kube-web",
+        # Bumping the version discards YAML generated by an older engine
+        "VERSION": int(os.environ.get("GENERATION_CACHE_VERSION", "1")),
+    },
+}
+# Only the locmem and file backends take a size bound; RedisCache hands its
+# OPTIONS to the connection pool. Once full, a tenth of the entries is
+# culled: the least recently used ones with locmem, arbitrary files with file.
+if GENERATION_CACHE_BACKEND in ("locmem", "file"):
+    CACHES["generation"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.environ.get("GENERATION_CACHE_MAX_ENTRIES", "1000")),
+        "CULL_FREQUENCY": 10,
+    }
+GENERATION_CACHE_ALIAS = "generation"
+# Seconds the yaml-explainer model list is served fresh, then served stale
+# while a background refresh runs
+MODEL_CATALOGUE_TTL = int(os.environ.get("MODEL_CATALOGUE_TTL", "300"))
+MODEL_CATALOGUE_STALE_TTL = int(os.environ.get("MODEL_CATALOGUE_STALE_TTL", "3600"))
+# An unreachable explainer is remembered as an empty catalogue this long
+MODEL_CATALOGUE_ERROR_TTL = int(os.environ.get("MODEL_CATALOGUE_ERROR_TTL", "30"))
+
+# Seconds a kube-manager resource listing is reused by the explore page
+LISTING_CACHE_TTL = int(os.environ.get("LISTING_CACHE_TTL", "15"))
+
+# Names shown per page of the explore listing unless the user picks another size
+EXPLORE_PAGE_SIZE = int(os.environ.get("EXPLORE_PAGE_SIZE", "50"))
+
+# Cluster overview: kinds listed in parallel, names shown per kind, and the
+# seconds after which a kind that has not answered is reported as timed out
+OVERVIEW_WORKERS = int(os.environ.get("OVERVIEW_WORKERS", "8"))
+OVERVIEW_SAMPLE_SIZE = int(os.environ.get("OVERVIEW_SAMPLE_SIZE", "5"))
+OVERVIEW_TIMEOUT = float(os.environ.get("OVERVIEW_TIMEOUT", "5"))
+
+# Bulk delete: deletes sent to kube-manager at the same time, and the read
+# timeout (seconds) of each one
+BULK_DELETE_WORKERS = int(os.environ.get("BULK_DELETE_WORKERS", "8"))
+BULK_DELETE_TIMEOUT = float(os.environ.get("BULK_DELETE_TIMEOUT", "10"))
+
+# Seconds a rendered empty configuration page is served from the cache;
+# 0 disables the page cache
+PAGE_CACHE_TTL = int(os.environ.get("PAGE_CACHE_TTL", "3600"))
+
+# Rows shown per page of the deployment history
+HISTORY_PAGE_SIZE = int(os.environ.get("HISTORY_PAGE_SIZE", "50"))
+
+# Apply and explain requests run as jobs picked up by `manage.py runjobs`.
+# When disabled, jobs run inline in the web request instead.
+BACKGROUND_JOBS = os.environ.get("BACKGROUND_JOBS", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "0.5"))
+# Workers refresh the heartbeat of their running job every
+# JOB_HEARTBEAT_INTERVAL seconds; a job without one for JOB_TIMEOUT seconds
+# is considered abandoned by its worker, however long it has been running
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("JOB_HEARTBEAT_INTERVAL", "10"))
+JOB_TIMEOUT = int(os.environ.get("JOB_TIMEOUT", "60"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "2"))
+
+# Stored LLM explanations: dropped after this many seconds without being
+# read, and the least recently used ones are evicted beyond the size cap
+EXPLANATION_CACHE_TTL = int(os.environ.get("EXPLANATION_CACHE_TTL", "2592000"))
+EXPLANATION_CACHE_MAX_ENTRIES = int(
+    os.environ.get("EXPLANATION_CACHE_MAX_ENTRIES", "5000")
+)
+
+# OpenTelemetry tracing: "otlp" sends spans to OTEL_EXPORTER_OTLP_ENDPOINT,
+# "file" appends them as JSON lines to TRACING_FILE; empty disables tracing
+TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "")
+TRACING_FILE = os.environ.get("TRACING_FILE", os.path.join(BASE_DIR, "traces.jsonl"))
+# Share of new traces recorded; requests sent with a traceparent follow the caller
+TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", "1.0"))
+
+# Superusers can profile a request with ?profile=1 or an X-Profile header;
+# the newest PROFILE_MAX_ENTRIES captures are kept, listed in the admin
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PROFILE_MAX_ENTRIES = int(os.environ.get("PROFILE_MAX_ENTRIES", "100"))
+
+# Requests running more SQL queries than their budget, or spending more than
+# QUERY_TIME_BUDGET_MS in them, are logged and counted in the metrics.
+# QUERY_BUDGETS overrides QUERY_BUDGET per URL name; the test helpers in
+# app/testing.py hold the views to the same numbers.
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", "10"))
+QUERY_TIME_BUDGET_MS = float(os.environ.get("QUERY_TIME_BUDGET_MS", "100"))
+QUERY_BUDGETS = {
+    # Session, user and one page of history rows with their users joined
+    "deployment_history": 4,
+    # Queuing the job; with BACKGROUND_JOBS off the apply runs in the
+    # request and adds its claim, history insert and result
+    "apply_yaml": 10,
+    "explain_yaml": 5,
+    "metrics": 2,
+}
@@ -0,0 +1,8 @@
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('properties');
+
+    document.getElementById('add-property').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('properties');
+    });
+});
@@ -0,0 +1,215 @@
+function updateFormIndices(prefix) {
+  const container = document.getElementById(prefix + '-form-container');
+  const formItems = container.querySelectorAll('li.form-item');
+  formItems.forEach((li, index) => {
+    const regex = new RegExp(prefix + '-(\\d+)-', 'g');
+    li.querySelectorAll('input, select, textarea').forEach(input => {
+      if (input.name) input.name = input.name.replace(regex, `${prefix}-${index}-`);
+      if (input.id) input.id = input.id.replace(regex, `id_${prefix}-${index}-`);
+    });
+  });
+  const totalForms = document.getElementById(`id_${prefix}-TOTAL_FORMS`);
+  totalForms.value = formItems.length;
+}
+
+let volumeMountsCounter = 0;
+
+function addForm(prefix, container, finalCount) {
+  if (!container) {
+    container = document.getElementById(`${prefix}-form-container`);
+  }
+
+
+  const totalFormsInput = document.querySelector(`input[name="${prefix}-TOTAL_FORMS"]`);
+  let currentCount;
+
+  if (!finalCount) {
+    if (prefix === 'volume_mounts') {
+      currentCount = volumeMountsCounter;
+    } else {
+      const formsetWrapper = container.closest('.tree-item') || container.parentElement;
+      const input = formsetWrapper.querySelector(`input[name="${prefix}-TOTAL_FORMS"]`);
+      currentCount = parseInt(input.value, 10);
+    }
+  } else {
+    currentCount = finalCount;
+  }
+
+  emptyFormHtml = document
+    .getElementById(`${prefix}-empty-form`)
+    .innerHTML
+    .replace(/__prefix__/g, currentCount);
+
+  if (prefix === 'containers') {
+    emptyFormHtml = emptyFormHtml
+      .replace(/name="volume_mounts-\d+-/g, `name="volume_mounts-${currentCount}-`)
+      .replace(/id="id_volume_mounts-\d+-/g, `id="id_volume_mounts-${currentCount}-`)
+      .replace(/for="id_volume_mounts-\d+-/g, `for="id_volume_mounts-${currentCount}-`);
+  }
+
+
+  const tempDiv = document.createElement('div');
+  tempDiv.innerHTML = emptyFormHtml;
+  const newFormLi = tempDiv.firstElementChild;
+  container.insertBefore(newFormLi, container.lastElementChild);
+
+  if (prefix === 'volume_mounts') {
+    volumeMountsCounter += 1;
+    totalFormsInput.value = volumeMountsCounter;
+  } else {
+    totalFormsInput.value = currentCount + 1;
+  }
+
+  if (prefix === 'volumes') {
+    const select = newFormLi.querySelector("select[id$='_volume_type']");
+    if (select) {
+      toggleVolumeFields(select);
+      updateRequiredFields(select);
+      select.addEventListener('change', function () {
+        toggleVolumeFields(this);
+        updateRequiredFields(this);
+      });
+    }
+  }
+}
+
+function setupRemoveButtons(prefix) {
+  const container = document.getElementById(`${prefix}-form-container`);
+  container.addEventListener('click', function (e) {
+    if (e.target.classList.contains('remove-form')) {
+      e.preventDefault();
+      const li = e.target.closest('li');
+      if (li) {
+        li.remove();
+        updateFormIndices(prefix);
+      }
+    }
+  });
+}
+
+function toggleRollingUpdateFields() {
+  const strategySelect = document.getElementById("id_strategy");
+  if (!strategySelect) return;
+  const maxUnavailableField = document.getElementById("id_max_unavailable").closest("p");
+  const maxSurgeField = document.getElementById("id_max_surge").closest("p");
+  const isRollingUpdate = strategySelect.value === "RollingUpdate";
+  maxUnavailableField.style.display = isRollingUpdate ? "block" : "none";
+  maxSurgeField.style.display = isRollingUpdate ? "block" : "none";
+
+  strategySelect.addEventListener("change", function () {
+    const isRollingUpdate = this.value === "RollingUpdate";
+    maxUnavailableField.style.display = isRollingUpdate ? "block" : "none";
+    maxSurgeField.style.display = isRollingUpdate ? "block" : "none";
+  });
+}
+
+function toggleVolumeFields(volumeTypeSelect) {
+  const selectedType = volumeTypeSelect.value;
+  const formItem = volumeTypeSelect.closest(".tree-item");
+
+  const fields = {
+    emptyDir: ["id_medium", "id_size_limit"],
+    hostPath: ["id_path", "id_hostpath_type"],
+    configMap: ["id_config_map_name"],
+    secret: ["id_secret_name"],
+    persistentVolumeClaim: ["id_pvc_claim_name"],
+  };
+
+  for (const fieldList of Object.values(fields)) {
+    for (const id of fieldList) {
+      const input = formItem.querySelector(`#${id}`);
+      if (input) input.closest("p").style.display = "none";
+    }
+  }
+
+  const toShow = fields[selectedType] || [];
+  for (const id of toShow) {
+    const input = formItem.querySelector(`#${id}`);
+    if (input) input.closest("p").style.display = "block";
+  }
+}
+
+function updateRequiredFields(volumeTypeSelect) {
+  const selectedType = volumeTypeSelect.value;
+  const formItem = volumeTypeSelect.closest(".tree-item");
+
+  const allRequiredFields = [
+    "id_path",
+    "id_config_map_name",
+    "id_secret_name",
+    "id_pvc_claim_name"
+  ];
+
+  allRequiredFields.forEach(id => {
+    const input = formItem.querySelector(`#${id}`);
+    if (input) input.removeAttribute("required");
+  });
+
+  const requiredMap = {
+    hostPath: ["id_path"],
+    configMap: ["id_config_map_name"],
+    secret: ["id_secret_name"],
+    persistentVolumeClaim: ["id_pvc_claim_name"]
+  };
+
+  const requiredForType = requiredMap[selectedType] || [];
+  requiredForType.forEach(id => {
+    const input = formItem.querySelector(`#${id}`);
+    if (input) input.setAttribute("required", "required");
+  });
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+  setupRemoveButtons('containers');
+  setupRemoveButtons('volumes');
+
+  document.getElementById('add-container').addEventListener('click', e => {
+    e.preventDefault();
+    addForm('containers');
+  });
+
+  document.getElementById('add-volume').addEventListener('click', e => {
+    e.preventDefault();
+    addForm('volumes');
+  });
+
+  document
+    .getElementById('containers-form-container')
+    .addEventListener('click', function (e) {
+      if (e.target.matches('button.add-volume_mount')) {
+        e.preventDefault();
+        const mountsUl = e.target
+          .closest('.tree-item')
+          .querySelector('ul.volume_mounts-form-container');
+        container = document.getElementById(`containers-form-container`);
+        const formsetWrapper = container.closest('.tree-item') || container.parentElement;
+        const input = formsetWrapper.querySelector(`input[name="containers-TOTAL_FORMS"]`);
+        currentCount = parseInt(input.value, 10) - 1;
+        console.log(currentCount)
+        addForm('volume_mounts', mountsUl, currentCount);
+      }
+    });
+
+  toggleRollingUpdateFields();
+
+  document.querySelectorAll("select[id$='-volume_type']").forEach(select => {
+    toggleVolumeFields(select);
+    updateRequiredFields(select);
+
+    select.addEventListener("change", function () {
+      toggleVolumeFields(this);
+      updateRequiredFields(this);
+    });
+  });
+
+  const baseVolumeSelect = document.getElementById("id_volume_type");
+  if (baseVolumeSelect) {
+    toggleVolumeFields(baseVolumeSelect);
+    updateRequiredFields(baseVolumeSelect);
+
+    baseVolumeSelect.addEventListener("change", function () {
+      toggleVolumeFields(this);
+      updateRequiredFields(this);
+    });
+  }
+});
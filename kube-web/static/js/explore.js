@@ -0,0 +1,83 @@
+const modal = document.getElementById('confirmModal');
+const itemName = document.getElementById('itemToDelete');
+const nameInput = document.getElementById('nameInput');
+const namespaceInput = document.getElementById('namespaceInput');
+
+document.querySelectorAll('.delete-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        const name = btn.getAttribute('data-name');
+        const namespace = btn.getAttribute('data-namespace');
+        itemName.textContent = `${name} (${namespace})`;
+        nameInput.value = name;
+        namespaceInput.value = namespace;
+        modal.style.display = 'flex';
+    });
+});
+
+const bulkModal = document.getElementById('bulkConfirmModal');
+const bulkDeleteBtn = document.getElementById('bulkDeleteBtn');
+const selectAll = document.getElementById('selectAll');
+const selectItems = document.querySelectorAll('.select-item');
+
+function updateSelection() {
+    const selected = document.querySelectorAll('.select-item:checked').length;
+    document.getElementById('selectedCount').textContent = selected;
+    bulkDeleteBtn.disabled = selected === 0;
+    selectAll.checked = selected > 0 && selected === selectItems.length;
+}
+
+if (selectAll) {
+    selectAll.addEventListener('change', () => {
+        selectItems.forEach(item => item.checked = selectAll.checked);
+        updateSelection();
+    });
+    selectItems.forEach(item => item.addEventListener('change', updateSelection));
+    bulkDeleteBtn.addEventListener('click', () => {
+        document.getElementById('bulkCount').textContent =
+            `(${document.querySelectorAll('.select-item:checked').length})`;
+        bulkModal.style.display = 'flex';
+    });
+}
+
+function closeModal() {
+    modal.style.display = 'none';
+    bulkModal.style.display = 'none';
+}
+
+// Close modal if clicking outside the content
+window.onclick = function (event) {
+    if (event.target == modal || event.target == bulkModal) {
+        closeModal();
+    }
+}
+
+const metricsButtons = document.querySelectorAll('.metrics-btn');
+
+metricsButtons.forEach(btn => {
+    btn.addEventListener('click', () => {
+        const name = btn.getAttribute('data-name');
+        const namespace = btn.getAttribute('data-namespace');
+        const iframeContainer = btn.parentElement.querySelector('.metrics-iframe-container');
+
+        if (iframeContainer.innerHTML.trim() !== '') {
+            iframeContainer.innerHTML = '';
+            return;
+        }
+
+        const panels = [41, 39, 40, 50, 30, 29, 51];
+        const baseTimeFrom = 1748893362962;
+        const step = 70000;
+
+        let iframesHTML = '';
+        panels.forEach((panelId, index) => {
+            const from = baseTimeFrom + (index * step);
+            const to = from + 3600000;
+
+            const src = `http://localhost:30090/d-solo/k8s_views_pods/kubernetes-views-pods?orgId=1&from=${from}&to=${to}&timezone=browser&var-datasource=PBFA97CFB590B2093&var-cluster=&var-namespace=${namespace}&var-pod=${name}&var-resolution=30s&var-job=kubernetes-service-endpoints&refresh=30s&panelId=${panelId}&__feature.dashboardSceneSolo`;
+
+            iframesHTML += `<iframe src="${src}" width="100%" height="230" frameborder="0" style="margin: 10px 0;"></iframe>`;
+        });
+
+        iframeContainer.innerHTML = iframesHTML;
+    });
+});
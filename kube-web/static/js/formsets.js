@@ -0,0 +1,39 @@
+// Adds and removes rows of the Django formsets on the configuration pages.
+function updateFormIndices(prefix) {
+    const container = document.getElementById(prefix + '-form-container');
+    const formItems = container.querySelectorAll('li.form-item');
+    formItems.forEach((li, index) => {
+        const regex = new RegExp(prefix + '-(\\d+)-', 'g');
+        li.querySelectorAll('input, select, textarea').forEach(input => {
+            if (input.name) input.name = input.name.replace(regex, `${prefix}-${index}-`);
+            if (input.id) input.id = input.id.replace(regex, `id_${prefix}-${index}-`);
+        });
+    });
+    const totalForms = document.getElementById(`id_${prefix}-TOTAL_FORMS`);
+    totalForms.value = formItems.length;
+}
+
+function addForm(prefix) {
+    const totalForms = document.getElementById(`id_${prefix}-TOTAL_FORMS`);
+    const currentCount = parseInt(totalForms.value);
+    const emptyForm = document.getElementById(`${prefix}-empty-form`).innerHTML.replace(/__prefix__/g, currentCount);
+    const container = document.getElementById(`${prefix}-form-container`);
+    const temp = document.createElement('div');
+    temp.innerHTML = emptyForm;
+    container.insertBefore(temp.firstElementChild, container.lastElementChild);
+    totalForms.value = currentCount + 1;
+}
+
+function setupRemoveButtons(prefix) {
+    const container = document.getElementById(`${prefix}-form-container`);
+    container.addEventListener('click', function (e) {
+        if (e.target.classList.contains('remove-form')) {
+            e.preventDefault();
+            const li = e.target.closest('li');
+            if (li) {
+                li.remove();
+                updateFormIndices(prefix);
+            }
+        }
+    });
+}
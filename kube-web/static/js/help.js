@@ -0,0 +1,17 @@
+// Shows or hides the help text next to a form field (see app/widgets.py).
+function toggleHelp(helpId, buttonId) {
+  const help = document.getElementById(helpId);
+  const button = document.getElementById(buttonId);
+  const isVisible = help.style.display === "inline-block";
+  help.style.display = isVisible ? "none" : "inline-block";
+  button.setAttribute("aria-expanded", !isVisible);
+}
+
+// One listener for every help button, including those in formset rows
+// cloned from an empty form after the page has loaded.
+document.addEventListener("click", (event) => {
+  const button = event.target.closest(".help-icon-button[aria-controls]");
+  if (button) {
+    toggleHelp(button.getAttribute("aria-controls"), button.id);
+  }
+});
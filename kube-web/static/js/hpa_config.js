@@ -0,0 +1,43 @@
+function validateReplicas() {
+    const minReplicasInput = document.getElementById('id_min_replicas');
+    const maxReplicasInput = document.getElementById('id_max_replicas');
+
+    if (minReplicasInput && maxReplicasInput) {
+        const minReplicas = parseInt(minReplicasInput.value, 10);
+        const maxReplicas = parseInt(maxReplicasInput.value, 10);
+
+        if (!isNaN(minReplicas) && !isNaN(maxReplicas)) {
+            if (minReplicas > maxReplicas) {
+                minReplicasInput.setCustomValidity("Minimum Replicas cannot be greater than Maximum Replicas.");
+                maxReplicasInput.setCustomValidity("Maximum Replicas must be greater than or equal to Minimum Replicas.");
+                return false;
+            }
+        }
+    }
+    // If valid, clear previous messages
+    minReplicasInput.setCustomValidity("");
+    maxReplicasInput.setCustomValidity("");
+    return true;
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('metrics');
+
+    document.getElementById('add-metric').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('metrics');
+    });
+
+    const form = document.querySelector('form');
+    form.addEventListener('submit', function (e) {
+        validateReplicas(); // Run validation before submit
+    });
+
+    // Real-time validation while typing
+    const minInput = document.getElementById('id_min_replicas');
+    const maxInput = document.getElementById('id_max_replicas');
+    if (minInput && maxInput) {
+        minInput.addEventListener('input', validateReplicas);
+        maxInput.addEventListener('input', validateReplicas);
+    }
+});
@@ -0,0 +1,8 @@
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('paths');
+
+    document.getElementById('add-path').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('paths');
+    });
+});
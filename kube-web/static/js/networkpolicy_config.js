@@ -0,0 +1,8 @@
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('rules');
+
+    document.getElementById('add-rule').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('rules');
+    });
+});
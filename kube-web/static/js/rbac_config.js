@@ -0,0 +1,53 @@
+function toggleNamespaceFields() {
+    const roleType = document.getElementById("id_role_type").value;
+    const roleNamespace = document.querySelector("#id_namespace");
+    const bindingNamespace = document.querySelector("#id_binding_name").closest("form").querySelector("#id_namespace");
+
+    if (roleType === "ClusterRole") {
+        if (roleNamespace) roleNamespace.parentElement.style.display = "none";
+        if (bindingNamespace) bindingNamespace.parentElement.style.display = "none";
+    } else {
+        if (roleNamespace) roleNamespace.parentElement.style.display = "block";
+        if (bindingNamespace) bindingNamespace.parentElement.style.display = "block";
+    }
+}
+
+function setupSubjectKindListeners() {
+    const subjectContainers = document.querySelectorAll("#subjects-form-container .form-item");
+
+    subjectContainers.forEach(container => {
+        const kindSelect = container.querySelector("select[name$='-kind']");
+        const namespaceInput = container.querySelector("input[name$='-namespace']");
+
+        if (kindSelect && namespaceInput) {
+            function toggleNamespace() {
+                const parent = namespaceInput.closest("p") || namespaceInput.closest("div");
+                parent.style.display = kindSelect.value === "ServiceAccount" ? "block" : "none";
+            }
+
+            kindSelect.addEventListener("change", toggleNamespace);
+            toggleNamespace();
+        }
+    });
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('rules');
+    setupRemoveButtons('subjects');
+
+    document.getElementById('add-rule').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('rules');
+    });
+
+    document.getElementById('add-subject').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('subjects');
+        setupSubjectKindListeners();
+    });
+
+    toggleNamespaceFields();
+
+    document.getElementById("id_role_type").addEventListener("change", toggleNamespaceFields);
+    setupSubjectKindListeners();
+});
@@ -0,0 +1,40 @@
+function toggleSecretTypeSections() {
+    const secretType = document.getElementById('id_secret_type').value;
+
+    const opaqueSection = document.getElementById('opaque-section');
+    const tlsSection = document.getElementById('tls-section');
+    const dockerSection = document.getElementById('dockerconfigjson-section');
+
+    opaqueSection.style.display = (secretType === 'Opaque') ? 'block' : 'none';
+    tlsSection.style.display = (secretType === 'kubernetes.io/tls') ? 'block' : 'none';
+    dockerSection.style.display = (secretType === 'kubernetes.io/dockerconfigjson') ? 'block' : 'none';
+
+    toggleInputsInSection(opaqueSection, secretType === 'Opaque');
+    toggleInputsInSection(tlsSection, secretType === 'kubernetes.io/tls');
+    toggleInputsInSection(dockerSection, secretType === 'kubernetes.io/dockerconfigjson');
+}
+
+function toggleInputsInSection(section, enable) {
+    if (section) {
+        const inputs = section.querySelectorAll('input, select, textarea');
+        inputs.forEach(input => {
+            input.disabled = !enable;
+        });
+    }
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('opaque');
+
+    document.getElementById('add-opaque').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('opaque');
+    });
+
+    const secretTypeField = document.getElementById('id_secret_type');
+    if (secretTypeField) {
+        secretTypeField.addEventListener('change', toggleSecretTypeSections);
+    }
+
+    toggleSecretTypeSections();
+});
@@ -0,0 +1,8 @@
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('imagepullsecrets');
+
+    document.getElementById('add-imagepullsecret').addEventListener('click', function (e) {
+        e.preventDefault();
+        addForm('imagepullsecrets');
+    });
+});
@@ -0,0 +1,69 @@
+function updateFormIndices(prefix) {
+    const container = document.getElementById(prefix + '-form-container');
+    const formItems = container.querySelectorAll('li.form-item');
+    formItems.forEach((li, index) => {
+        const regex = new RegExp(prefix + '-(\\d+)-', 'g');
+        li.querySelectorAll('input, select, textarea').forEach(input => {
+            if (input.name) input.name = input.name.replace(regex, `${prefix}-${index}-`);
+            if (input.id) input.id = input.id.replace(regex, `id_${prefix}-${index}-`);
+        });
+    });
+    const totalForms = document.getElementById(`id_${prefix}-TOTAL_FORMS`);
+    totalForms.value = formItems.length;
+}
+
+function addForm(prefix) {
+    const totalForms = document.getElementById(`id_${prefix}-TOTAL_FORMS`);
+    const currentCount = parseInt(totalForms.value);
+    const emptyForm = document.getElementById(`${prefix}-empty-form`).innerHTML.replace(/__prefix__/g, currentCount);
+    const container = document.getElementById(`${prefix}-form-container`);
+    const temp = document.createElement('div');
+    temp.innerHTML = emptyForm;
+    container.insertBefore(temp.firstElementChild, container.lastElementChild);
+    totalForms.value = currentCount + 1;
+    toggleNodePortVisibility();
+}
+
+function setupRemoveButtons(prefix) {
+    const container = document.getElementById(`${prefix}-form-container`);
+    container.addEventListener('click', function (e) {
+        if (e.target.classList.contains('remove-form')) {
+            e.preventDefault();
+            const li = e.target.closest('li');
+            if (li) {
+                li.remove();
+                updateFormIndices(prefix);
+            }
+        }
+    });
+}
+
+function toggleNodePortVisibility() {
+    const serviceTypeSelect = document.querySelector('#id_service_type');
+    const isNodePort = serviceTypeSelect && serviceTypeSelect.value === 'NodePort';
+    const nodePortFields = document.querySelectorAll('.node-port-field');
+
+    nodePortFields.forEach(field => {
+        const parent = field.closest('p') || field.closest('div');
+        if (parent) {
+            parent.style.display = isNodePort ? 'block' : 'none';
+        }
+        field.required = isNodePort;
+    });
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+    setupRemoveButtons('ports');
+
+    document.getElementById('add-port').addEventListener('click', e => {
+        e.preventDefault();
+        addForm('ports');
+    });
+
+    const serviceTypeField = document.querySelector('#id_service_type');
+    if (serviceTypeField) {
+        serviceTypeField.addEventListener('change', toggleNodePortVisibility);
+    }
+
+    toggleNodePortVisibility();
+});
@@ -0,0 +1,111 @@
+function downloadYAML() {
+  const yamlText = document.getElementById("yamlContent").innerText;
+
+  try {
+    const parsedYAML = jsyaml.load(yamlText);
+    const kind = parsedYAML.kind || 'file';
+    const name = parsedYAML.metadata?.name || 'unnamed';
+    const fileName = `${kind.toLowerCase()}-${name.toLowerCase()}.yaml`;
+
+    const blob = new Blob([yamlText], {
+      type: "text/yaml;charset=utf-8;"
+    });
+    const url = URL.createObjectURL(blob);
+
+    const link = document.createElement("a");
+    link.setAttribute("href", url);
+    link.setAttribute("download", fileName);
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+  } catch (e) {
+    alert("Failed to parse YAML: " + e.message);
+  }
+}
+
+// Reloads the page once the pending apply or explain job has finished
+const jobStatusUrl = document.body.dataset.jobStatusUrl;
+if (jobStatusUrl) (function pollJob() {
+  fetch(jobStatusUrl, { credentials: "same-origin" })
+    .then((response) => response.json())
+    .then((job) => {
+      if (job.finished) {
+        window.location.reload();
+      } else {
+        setTimeout(pollJob, 1500);
+      }
+    })
+    .catch(() => setTimeout(pollJob, 3000));
+})();
+
+function showLoader() {
+  document.getElementById("explainBtn").style.display = "none";
+  document.getElementById("loader").style.display = "inline-block";
+}
+
+function hideLoader() {
+  document.getElementById("explainBtn").style.display = "";
+  document.getElementById("loader").style.display = "none";
+}
+
+// Streams the explanation over Server-Sent Events while the model writes
+// it. Browsers without fetch streams fall back to the background job.
+async function streamExplanation(form, submitter) {
+  const section = document.getElementById("explanationSection");
+  const output = document.getElementById("explanation");
+  const cachedNote = document.getElementById("explanationCached");
+  const body = new FormData(form);
+  if (submitter && submitter.name) body.append(submitter.name, submitter.value);
+  const response = await fetch(form.dataset.streamUrl, {
+    method: "POST",
+    body: body,
+    credentials: "same-origin",
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(response.status);
+  }
+
+  output.textContent = "";
+  cachedNote.style.display = "none";
+  section.style.display = "";
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = "message";
+      const data = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data.push(line.slice(6));
+      }
+      if (event === "error") {
+        output.innerHTML = data.join("\n");
+        return;
+      }
+      if (event === "done") return;
+      if (event === "cached") cachedNote.style.display = "";
+      output.textContent += data.join("\n");
+      hideLoader();
+    }
+  }
+}
+
+let streamFailed = false;
+document.getElementById("yamlForm").addEventListener("submit", (e) => {
+  const submitter = e.submitter;
+  if (submitter && !["explainBtn", "refreshBtn"].includes(submitter.id)) return;
+  if (streamFailed || !window.ReadableStream || !window.TextDecoderStream) return;
+  e.preventDefault();
+  streamExplanation(e.target, submitter)
+    .catch(() => {
+      streamFailed = true;
+      e.target.requestSubmit(submitter);
+    })
+    .finally(hideLoader);
+});
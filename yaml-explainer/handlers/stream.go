@@ -0,0 +1,71 @@
+package handlers
+
+import (
+	"encoding/json"
+	"io"
+	"log"
+	"net/http"
+	"yaml-explainer/models"
+	"yaml-explainer/openai"
+	"yaml-explainer/utils"
+)
+
+// streamEnd follows the last chunk of a complete explanation. A body that
+// ends without it was cut short and must not be kept as an explanation.
+const streamEnd = "\x00"
+
+// ExplainStreamHandler relays the explanation as a chunked plain-text body,
+// flushing every piece of text as soon as the model produces it.
+func ExplainStreamHandler(w http.ResponseWriter, r *http.Request) {
+	log.Println("New request received at /explain-stream")
+
+	if r.Method != http.MethodPost {
+		http.Error(w, "Method not allowed", http.StatusMethodNotAllowed)
+		return
+	}
+
+	var payload models.RequestPayload
+	if err := json.NewDecoder(r.Body).Decode(&payload); err != nil {
+		http.Error(w, "Error reading request body", http.StatusBadRequest)
+		return
+	}
+
+	if !utils.IsValidYAML(payload.YAML) {
+		http.Error(w, "Invalid YAML", http.StatusBadRequest)
+		return
+	}
+
+	flusher, _ := w.(http.Flusher)
+	started := false
+	write := func(text string) error {
+		if !started {
+			w.Header().Set("Content-Type", "text/plain; charset=utf-8")
+			w.Header().Set("X-Content-Type-Options", "nosniff")
+			w.WriteHeader(http.StatusOK)
+			started = true
+		}
+		if _, err := io.WriteString(w, text); err != nil {
+			return err
+		}
+		if flusher != nil {
+			flusher.Flush()
+		}
+		return nil
+	}
+
+	statusCode, err := openai.StreamExplainYAML(payload.YAML, payload.Model, write)
+	if err != nil {
+		log.Printf("Error (%d): %v\n", statusCode, err)
+		if !started {
+			http.Error(w, err.Error(), statusCode)
+			return
+		}
+		// Once the body has started the status can no longer change: break
+		// the chunked body instead, so the client sees a failed read rather
+		// than a short explanation.
+		panic(http.ErrAbortHandler)
+	}
+	if err := write(streamEnd); err != nil {
+		log.Printf("Error writing the end of the stream: %v\n", err)
+	}
+}
@@ -10,6 +10,7 @@ import (
 
 func main() {
 	http.HandleFunc("/explain", handlers.ExplainHandler)
+	http.HandleFunc("/explain-stream", handlers.ExplainStreamHandler)
 	fmt.Println("✅ Microservicio escuchando en http://localhost:8080")
 	http.HandleFunc("/models", handlers.GetAvailableModels)
 	http.HandleFunc("/explain-error", handlers.ExplainErrorHandler)
@@ -17,6 +17,7 @@ type OpenAIMessage struct {
 type OpenAIRequest struct {
 	Model    string          `json:"model"`
 	Messages []OpenAIMessage `json:"messages"`
+	Stream   bool            `json:"stream,omitempty"`
 }
 
 type OpenAIResponse struct {
@@ -25,6 +26,18 @@ type OpenAIResponse struct {
 	} `json:"choices"`
 }
 
+type OpenAIStreamChunk struct {
+	Choices []struct {
+		Delta struct {
+			Content string `json:"content"`
+		} `json:"delta"`
+	} `json:"choices"`
+	Error *struct {
+		Code    int    `json:"code"`
+		Message string `json:"message"`
+	} `json:"error,omitempty"`
+}
+
 type ErrorRequestPayload struct {
 	ErrorMessage string `json:"error"`
 	Model        string `json:"model"`
@@ -14,6 +14,8 @@ import (
 const endpoint = "https://openrouter.ai/api/v1/chat/completions"
 const model = "open-r1/olympiccoder-7b:free" // You can replace this with another free one
 
+const explainSystemPrompt = "Eres un experto en DevOps. Explica directamente y con precisión qué hace este manifiesto YAML de Kubernetes, sin introducir, resumir ni aplicar estilo. No utilices formatos especiales como listas, markdown, emojis ni encabezados. Tu salida debe ser exclusivamente una explicación directa y neutral."
+
 func ExplainYAMLWithModel(yaml string, model string) (string, int, error) {
 	if model == "" {
 		model = "openchat/openchat-7b:free"
@@ -22,10 +24,7 @@ func ExplainYAMLWithModel(yaml string, model string) (string, int, error) {
 	payload := models.OpenAIRequest{
 		Model: model,
 		Messages: []models.OpenAIMessage{
-			{
-				Role:    "system",
-				Content: "Eres un experto en DevOps. Explica directamente y con precisión qué hace este manifiesto YAML de Kubernetes, sin introducir, resumir ni aplicar estilo. No utilices formatos especiales como listas, markdown, emojis ni encabezados. Tu salida debe ser exclusivamente una explicación directa y neutral.",
-			},
+			{Role: "system", Content: explainSystemPrompt},
 			{Role: "user", Content: yaml},
 		},
 	}
@@ -0,0 +1,104 @@
+package openai
+
+import (
+	"bufio"
+	"bytes"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"net/http"
+	"os"
+	"strings"
+	"yaml-explainer/models"
+)
+
+// StreamExplainYAML asks OpenRouter for a streamed explanation of the manifest
+// and calls onChunk with every piece of text as soon as it arrives.
+func StreamExplainYAML(yaml string, model string, onChunk func(string) error) (int, error) {
+	if model == "" {
+		model = "openchat/openchat-7b:free"
+	}
+
+	payload := models.OpenAIRequest{
+		Model: model,
+		Messages: []models.OpenAIMessage{
+			{Role: "system", Content: explainSystemPrompt},
+			{Role: "user", Content: yaml},
+		},
+		Stream: true,
+	}
+
+	body, _ := json.Marshal(payload)
+
+	apiKey := os.Getenv("OPENROUTER_API_KEY")
+	if apiKey == "" {
+		return http.StatusInternalServerError, errors.New("environment variable OPENROUTER_API_KEY is not defined")
+	}
+
+	req, err := http.NewRequest("POST", endpoint, bytes.NewBuffer(body))
+	if err != nil {
+		return http.StatusInternalServerError, err
+	}
+
+	req.Header.Set("Authorization", "Bearer "+apiKey)
+	req.Header.Set("Content-Type", "application/json")
+	req.Header.Set("Accept", "text/event-stream")
+	req.Header.Set("HTTP-Referer", "https://your-project.com")
+	req.Header.Set("X-Title", "yaml-explainer")
+
+	client := &http.Client{}
+	resp, err := client.Do(req)
+	if err != nil {
+		return http.StatusBadGateway, err
+	}
+	defer resp.Body.Close()
+
+	if resp.StatusCode != http.StatusOK {
+		respBody, _ := io.ReadAll(resp.Body)
+		return resp.StatusCode, fmt.Errorf("OpenRouter error %d: %s", resp.StatusCode, string(respBody))
+	}
+
+	// OpenRouter answers with server-sent events: "data: {...}" lines, comment
+	// lines starting with ":" while the model warms up, and "data: [DONE]".
+	scanner := bufio.NewScanner(resp.Body)
+	scanner.Buffer(make([]byte, 64*1024), 1024*1024)
+	done := false
+	for scanner.Scan() {
+		line := scanner.Text()
+		if !strings.HasPrefix(line, "data:") {
+			continue
+		}
+		data := strings.TrimSpace(strings.TrimPrefix(line, "data:"))
+		if data == "[DONE]" {
+			done = true
+			break
+		}
+
+		var chunk models.OpenAIStreamChunk
+		if err := json.Unmarshal([]byte(data), &chunk); err != nil {
+			continue
+		}
+		if chunk.Error != nil {
+			code := chunk.Error.Code
+			if code == 0 {
+				code = http.StatusBadGateway
+			}
+			return code, fmt.Errorf("OpenRouter error %d: %s", code, chunk.Error.Message)
+		}
+		if len(chunk.Choices) == 0 || chunk.Choices[0].Delta.Content == "" {
+			continue
+		}
+		if err := onChunk(chunk.Choices[0].Delta.Content); err != nil {
+			return http.StatusInternalServerError, err
+		}
+	}
+	if err := scanner.Err(); err != nil {
+		return http.StatusBadGateway, fmt.Errorf("error reading OpenRouter stream: %w", err)
+	}
+	if !done {
+		return http.StatusBadGateway, errors.New("OpenRouter stream ended before [DONE]")
+	}
+
+	return http.StatusOK, nil
+}